@@ -1,6 +1,9 @@
 """Agent definitions for the research paper to slide deck pipeline."""
 from crewai import Agent, LLM
 import config
+import llm_cache
+import llm_replay
+import llm_transport
 
 # Initialize LLMs - Multi-Model Support
 print(f"[AGENTS] Multi-Model Configuration:")
@@ -12,7 +15,7 @@ if config.LLM_PROVIDER == 'ollama':
     # Primary LLM for text processing (summarization, structuring, verification)
     primary_llm = LLM(
         model=f"ollama_chat/{config.PRIMARY_MODEL}",
-        api_base="http://localhost:11434",
+        api_base=config.OLLAMA_API_BASE,
         temperature=0.3
     )
     print(f"[AGENTS] Primary LLM: {config.PRIMARY_MODEL}")
@@ -20,10 +23,18 @@ if config.LLM_PROVIDER == 'ollama':
     # Secondary LLM for PPTX generation (compilation, formatting)
     secondary_llm = LLM(
         model=f"ollama_chat/{config.SECONDARY_MODEL}",
-        api_base="http://localhost:11434",
+        api_base=config.OLLAMA_API_BASE,
         temperature=0.5  # Slightly higher for creative formatting
     )
     print(f"[AGENTS] Secondary LLM: {config.SECONDARY_MODEL}")
+
+    # Pooled, concurrency-limited HTTP transport shared by every pipeline in the process
+    if config.LLM_TRANSPORT_ENABLED:
+        llm_transport.bind_llm(primary_llm)
+        llm_transport.bind_llm(secondary_llm)
+        endpoints = [e.url for e in llm_transport.get_transport().endpoints.endpoints]
+        print(f"[AGENTS] LLM transport: {', '.join(endpoints)} "
+              f"(max {config.LLM_MAX_CONCURRENCY} in flight per model per endpoint, timeout {config.LLM_TIMEOUT:.0f}s)")
 else:
     # Groq fallback (uses same model for both)
     primary_llm = LLM(
@@ -34,6 +45,20 @@ else:
     secondary_llm = primary_llm
     print(f"[AGENTS] Using Groq model: {config.GROQ_MODEL}")
 
+# Request-level response cache shared by all agents (bypassed when recording or replaying,
+# so recordings hold real responses and latencies)
+if not config.LLM_REPLAY_MODE:
+    primary_llm = llm_cache.wrap_llm(primary_llm)
+    if secondary_llm is not primary_llm:
+        secondary_llm = llm_cache.wrap_llm(secondary_llm)
+
+# Record real responses, or replay them offline at synthetic latency
+if config.LLM_REPLAY_MODE:
+    primary_llm = llm_replay.install(primary_llm)
+    if secondary_llm is not primary_llm:
+        secondary_llm = llm_replay.install(secondary_llm)
+    print(f"[AGENTS] LLM {config.LLM_REPLAY_MODE} mode: {config.LLM_REPLAY_PATH}")
+
 # Legacy support
 llm = primary_llm
 
@@ -0,0 +1,332 @@
+"""Ingest arXiv papers from their LaTeX source (e-print) instead of the PDF.
+
+The e-print tarball gives exact sections, figure/table numbering, captions and
+the original image files, without reconstructing any of it from PDF layout.
+Callers fall back to the PDF when a paper has no usable source.
+
+    source = parse_source_archive("papers/2301.07041.tar.gz", "extracted_images")
+    source['sections'], source['figures'], source['tables'], source['images']
+"""
+import gzip
+import io
+import os
+import re
+import tarfile
+from rich.console import Console
+
+console = Console()
+
+GRAPHICS_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.pdf', '.eps')
+MAX_INPUT_DEPTH = 10
+
+
+class SourceUnavailableError(Exception):
+    """The e-print has no LaTeX source (PDF-only submission or unreadable archive)."""
+
+
+def download_arxiv_source(arxiv_id: str, download_dir: str = "papers") -> str:
+    """Download a paper's e-print source archive with the arXiv client."""
+    import arxiv
+    os.makedirs(download_dir, exist_ok=True)
+    paper = next(arxiv.Search(id_list=[arxiv_id]).results())
+    filename = f"{arxiv_id.replace('/', '_')}.tar.gz"
+    if hasattr(paper, 'download_source'):
+        return paper.download_source(dirpath=download_dir, filename=filename)
+    # Newer arxiv releases only expose the URL
+    import urllib.request
+    path = os.path.join(download_dir, filename)
+    urllib.request.urlretrieve(paper.source_url(), path)
+    return path
+
+
+def is_source_archive(path: str) -> bool:
+    return path.endswith(('.tar.gz', '.tgz', '.tar'))
+
+
+# ---------------------------------------------------------------------------
+# Archive handling
+
+def _extract_archive(archive_path: str, extract_dir: str) -> str:
+    """Unpack the e-print and return the main .tex file."""
+    with open(archive_path, 'rb') as f:
+        data = f.read()
+    if data[:4] == b'%PDF':
+        raise SourceUnavailableError("arXiv only provides a PDF for this paper")
+    os.makedirs(extract_dir, exist_ok=True)
+
+    try:
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            root = os.path.realpath(extract_dir)
+            for member in tar.getmembers():
+                target = os.path.realpath(os.path.join(extract_dir, member.name))
+                # Only plain files and directories that stay inside extract_dir
+                if (member.isfile() or member.isdir()) and target.startswith(root + os.sep):
+                    tar.extract(member, extract_dir)
+    except tarfile.TarError:
+        # Single-file submissions are a gzipped .tex without a tar wrapper
+        try:
+            tex = gzip.decompress(data) if data[:2] == b'\x1f\x8b' else data
+        except OSError as e:
+            raise SourceUnavailableError(f"Unreadable source archive: {e}")
+        with open(os.path.join(extract_dir, 'main.tex'), 'wb') as f:
+            f.write(tex)
+
+    candidates = []
+    for dirpath, _, filenames in os.walk(extract_dir):
+        for name in filenames:
+            if name.endswith('.tex'):
+                path = os.path.join(dirpath, name)
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    if '\\documentclass' in f.read():
+                        candidates.append(path)
+    if not candidates:
+        raise SourceUnavailableError("No LaTeX file with \\documentclass in the archive")
+    # Prefer the conventional names, then the largest file
+    candidates.sort(key=lambda p: (os.path.basename(p) not in ('main.tex', 'paper.tex', 'ms.tex'),
+                                   -os.path.getsize(p)))
+    return candidates[0]
+
+
+def _strip_comments(tex: str) -> str:
+    return re.sub(r'(?<!\\)%.*', '', tex)
+
+
+def _resolve_inputs(tex: str, base_dir: str, depth: int = 0) -> str:
+    r"""Inline \input{} and \include{} files."""
+    if depth > MAX_INPUT_DEPTH:
+        return tex
+
+    def inline(match):
+        name = match.group(2).strip()
+        path = os.path.join(base_dir, name if name.endswith('.tex') else name + '.tex')
+        if not os.path.exists(path):
+            return ''
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return _resolve_inputs(_strip_comments(f.read()), base_dir, depth + 1)
+
+    return re.sub(r'\\(input|include)\s*\{([^}]+)\}', inline, tex)
+
+
+# ---------------------------------------------------------------------------
+# LaTeX parsing
+
+def _braced(tex: str, start: int):
+    """Content of the brace group opening at tex[start] and the index after it."""
+    depth = 0
+    for i in range(start, len(tex)):
+        ch = tex[i]
+        if ch == '{' and (i == 0 or tex[i - 1] != '\\'):
+            depth += 1
+        elif ch == '}' and tex[i - 1] != '\\':
+            depth -= 1
+            if depth == 0:
+                return tex[start + 1:i], i + 1
+    return tex[start + 1:], len(tex)
+
+
+def _command_argument(tex: str, command: str, start: int = 0):
+    r"""Argument of the first \command[opt]{arg} at or after start."""
+    match = re.compile(r'\\' + command + r'\*?\s*(\[[^\]]*\])?\s*\{').search(tex, start)
+    if not match:
+        return None
+    return _braced(tex, match.end() - 1)[0]
+
+
+_FORMATTING = re.compile(r'\\(?:textbf|textit|textsc|texttt|emph|underline|mathrm|mathbf|mathit|text|mbox|'
+                         r'url|footnote|textrm|textsf)\s*\{([^{}]*)\}')
+
+def latex_to_text(tex: str, refs: dict = None) -> str:
+    """Plain text from a LaTeX fragment; \\ref{} is resolved through refs."""
+    refs = refs or {}
+    text = re.sub(r'\\(?:auto|c|C)ref\s*\{([^}]+)\}',
+                  lambda m: ', '.join(refs.get(k.strip(), '?') for k in m.group(1).split(',')), tex)
+    text = re.sub(r'\\(?:eq)?ref\s*\{([^}]+)\}', lambda m: refs.get(m.group(1).strip(), '?').split()[-1], text)
+    text = re.sub(r'\\(?:cite[a-z]*|citep|citet|label|bibliographystyle|bibliography)\*?\s*(\[[^\]]*\])*\{[^}]*\}',
+                  '', text)
+    text = re.sub(r'\\item\s*(\[[^\]]*\])?', '\n- ', text)
+    text = re.sub(r'\\(?:begin|end)\s*\{[^}]*\}(\{[^}]*\}|\[[^\]]*\])*', '\n', text)
+    previous = None
+    while previous != text:  # Nested formatting unwraps from the inside out
+        previous = text
+        text = _FORMATTING.sub(r'\1', text)
+    text = text.replace('\\\\', '\n').replace('~', ' ')
+    text = re.sub(r'\\([%&_#$])', r'\1', text)
+    text = re.sub(r'\\[a-zA-Z]+\*?(\[[^\]]*\])?', '', text)
+    text = text.replace('{', '').replace('}', '').replace('$', '')
+    text = re.sub(r'[ \t]+', ' ', text)
+    return re.sub(r'\n\s*\n+', '\n\n', text).strip()
+
+
+def _parse_tabular(block: str) -> list:
+    """Rows of cell strings from the first tabular environment in a table float."""
+    start = re.search(r'\\begin\s*\{tabular[x*]?\}', block)
+    end = re.search(r'\\end\s*\{tabular[x*]?\}', block)
+    if not start or not end:
+        return []
+    body = block[start.end():end.start()]
+    # Skip the column spec (and the width argument of tabular*/tabularx)
+    while body.lstrip().startswith('{'):
+        body = body[body.index('{'):]
+        body = body[_braced(body, 0)[1]:]
+    rows = []
+    for row in re.split(r'\\\\', body):
+        row = re.sub(r'\\(?:hline|toprule|midrule|bottomrule|cline\{[^}]*\}|cmidrule(\([^)]*\))?\{[^}]*\})', '', row)
+        cells = [latex_to_text(c) for c in re.split(r'(?<!\\)&', row)]
+        if any(cells):
+            rows.append(cells)
+    return rows
+
+
+def _resolve_graphic(name: str, base_dir: str, graphics_dirs: list):
+    for directory in [base_dir] + [os.path.join(base_dir, d) for d in graphics_dirs]:
+        path = os.path.join(directory, name)
+        for candidate in [path] + [path + ext for ext in GRAPHICS_EXTENSIONS]:
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+def _to_slide_image(path: str, output_dir: str, stem: str):
+    """PowerPoint cannot embed PDF/EPS figures: rasterise PDF, skip EPS."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.png', '.jpg', '.jpeg'):
+        return path
+    if ext == '.pdf':
+        import fitz
+        os.makedirs(output_dir, exist_ok=True)
+        with fitz.open(path) as doc:
+            pix = doc.load_page(0).get_pixmap(matrix=fitz.Matrix(2, 2))
+        png_path = os.path.join(output_dir, f"{stem}.png")
+        pix.save(png_path)
+        return png_path
+    return None
+
+
+def parse_source(main_tex_path: str, image_dir: str = "extracted_images") -> dict:
+    """Sections, figures, tables and figure images from a main .tex file."""
+    base_dir = os.path.dirname(main_tex_path)
+    with open(main_tex_path, 'r', encoding='utf-8', errors='ignore') as f:
+        tex = _resolve_inputs(_strip_comments(f.read()), base_dir)
+
+    title = latex_to_text(_command_argument(tex, 'title') or '')
+    graphics_dirs = re.findall(r'\{([^{}]+)\}', _command_argument(tex, 'graphicspath') or '')
+    body_match = re.search(r'\\begin\{document\}(.*?)(\\end\{document\}|$)', tex, re.DOTALL)
+    body = body_match.group(1) if body_match else tex
+    body = re.split(r'\\begin\{thebibliography\}|\\bibliography\{|\\appendix\b', body)[0]
+
+    # Floats: number them in document order, like LaTeX does
+    figures, tables, images, refs = [], [], [], {}
+    counters = {'figure': 0, 'table': 0}
+    float_re = re.compile(r'\\begin\{(figure|table)(\*?)\}(.*?)\\end\{\1\2\}', re.DOTALL)
+    for match in float_re.finditer(body):
+        kind, block = match.group(1), match.group(3)
+        counters[kind] += 1
+        number = str(counters[kind])
+        caption = latex_to_text(_command_argument(block, 'caption') or '')
+        for label in re.findall(r'\\label\{([^}]+)\}', block):
+            refs[label.strip()] = f"{kind.capitalize()} {number}"
+        entry = {'type': kind, 'number': number, 'caption': caption, 'offset': match.start()}
+        if kind == 'figure':
+            entry['images'] = []
+            for i, name in enumerate(re.findall(r'\\includegraphics\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}', block)):
+                source_path = _resolve_graphic(name.strip(), base_dir, graphics_dirs)
+                image_path = source_path and _to_slide_image(source_path, image_dir, f"figure{number}_{i + 1}")
+                if image_path:
+                    entry['images'].append(image_path)
+            figures.append(entry)
+        else:
+            entry['rows'] = _parse_tabular(block)
+            tables.append(entry)
+
+    # Floats become plain "Figure N: caption" lines in the running text
+    counters = {'figure': 0, 'table': 0}
+    def float_line(match):
+        kind = match.group(1)
+        counters[kind] += 1
+        items = figures if kind == 'figure' else tables
+        return f"\n{kind.capitalize()} {counters[kind]}: {items[counters[kind] - 1]['caption']}\n"
+    body = float_re.sub(float_line, body)
+
+    abstract = re.search(r'\\begin\{abstract\}(.*?)\\end\{abstract\}', body, re.DOTALL)
+    sections = {}
+    if abstract:
+        sections['abstract'] = latex_to_text(abstract.group(1), refs)
+        body = body[:abstract.start()] + body[abstract.end():]
+    headers = list(re.finditer(r'\\section\*?\s*(?:\[[^\]]*\])?\s*\{', body))
+    for i, header in enumerate(headers):
+        name, content_start = _braced(body, header.end() - 1)
+        content_end = headers[i + 1].start() if i + 1 < len(headers) else len(body)
+        key = latex_to_text(name).lower()
+        sections[key] = (sections.get(key, '') + '\n' + latex_to_text(body[content_start:content_end], refs)).strip()
+
+    from PIL import Image
+    for figure in figures:
+        for i, path in enumerate(figure['images']):
+            try:
+                with Image.open(path) as img:
+                    size = img.size
+            except Exception:
+                continue
+            images.append({'path': path, 'page': None, 'size': size, 'index': i,
+                           'figure_number': figure['number'], 'caption': figure['caption']})
+
+    text = (title + '\n\n' if title else '') + '\n\n'.join(
+        f"{name.title()}\n{content}" for name, content in sections.items())
+    return {
+        'title': title,
+        'text': text,
+        'sections': sections,
+        'figures': figures,
+        'tables': tables,
+        'images': images,
+        'main_tex': main_tex_path,
+    }
+
+
+def parse_source_archive(archive_path: str, image_dir: str = "extracted_images", extract_dir: str = None) -> dict:
+    """Parse a local e-print archive (.tar.gz, .tar or gzipped .tex)."""
+    extract_dir = extract_dir or os.path.splitext(archive_path.replace('.tar.gz', '.tgz'))[0] + '_source'
+    main_tex = _extract_archive(archive_path, extract_dir)
+    return parse_source(main_tex, image_dir)
+
+
+if __name__ == '__main__':
+    # Test with a local sample archive
+    import sys
+    import tempfile
+    if len(sys.argv) > 1:
+        archive = sys.argv[1]
+    else:
+        workdir = tempfile.mkdtemp()
+        archive = os.path.join(workdir, 'sample.tar.gz')
+        sample = r"""\documentclass{article}
+\title{A \textbf{Sample} Paper}
+\begin{document}
+\maketitle
+\begin{abstract}We reach 85.2\% accuracy (see Figure~\ref{fig:arch}).\end{abstract}
+\section{Introduction}
+Transformers \cite{vaswani} changed NLP. % a comment
+\section{Method}
+\begin{figure}[t]\centering\includegraphics[width=\linewidth]{arch}
+\caption{Model architecture.}\label{fig:arch}\end{figure}
+Our model is shown in Figure~\ref{fig:arch} and results in Table~\ref{tab:res}.
+\begin{table}\caption{Results.}\label{tab:res}
+\begin{tabular}{lc}\toprule Model & Acc \\ \midrule Ours & 85.2 \\ \bottomrule\end{tabular}\end{table}
+\end{document}
+"""
+        from PIL import Image
+        Image.new('RGB', (640, 360), 'white').save(os.path.join(workdir, 'arch.png'))
+        with open(os.path.join(workdir, 'main.tex'), 'w') as f:
+            f.write(sample)
+        with tarfile.open(archive, 'w:gz') as tar:
+            tar.add(os.path.join(workdir, 'main.tex'), 'main.tex')
+            tar.add(os.path.join(workdir, 'arch.png'), 'arch.png')
+
+    source = parse_source_archive(archive, image_dir=os.path.join(os.path.dirname(archive), 'images'))
+    print(f"Title: {source['title']}")
+    for name, content in source['sections'].items():
+        print(f"  [{name}] {content[:80]}")
+    for figure in source['figures']:
+        print(f"  Figure {figure['number']}: {figure['caption']} -> {figure['images']}")
+    for table in source['tables']:
+        print(f"  Table {table['number']}: {table['caption']} rows={table['rows']}")
@@ -0,0 +1,391 @@
+"""Benchmark suite for the non-LLM pipeline stages.
+
+Generates a deterministic corpus of synthetic papers (PDFs with two-column
+text, figures, captions and numeric tables) and slide blueprints, times each
+stage with the LLM out of the picture, and compares against a stored baseline.
+
+With --e2e it instead drives full ResearchPaperPipeline runs against recorded
+LLM responses (llm_replay) to measure pipeline-overhead throughput, scaling
+with concurrency and tail latency - no Ollama or network needed.
+
+Usage:
+    python benchmark.py                          # small + typical corpus
+    python benchmark.py --sizes small,typical,large --repeat 5
+    python benchmark.py --save-baseline          # store results as the new baseline
+    python benchmark.py --e2e --concurrency 1,2,4 --jobs 8 --latency const:0.5
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import shutil
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentation import Tracer
+
+CORPUS_DIR = '.bench_corpus'
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+
+# name: (pages, slides)
+CORPUS_SIZES = {
+    'small': (4, 8),
+    'typical': (14, 15),
+    'large': (300, 200),
+}
+
+_WORDS = ("model network training dataset accuracy attention layer baseline results "
+          "method approach performance evaluation experiment transformer encoder decoder "
+          "benchmark parameters optimization gradient loss convergence architecture "
+          "representation feature embedding inference latency throughput robust").split()
+_SECTIONS = ['Abstract', 'Introduction', 'Related Work', 'Method', 'Experiments',
+             'Results', 'Discussion', 'Conclusion']
+_SLIDE_TITLES = ['Introduction', 'Background', 'Model Architecture', 'Training Setup',
+                 'Experimental Results', 'Comparison with Baselines', 'Discussion', 'Conclusion']
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 18))]
+    if rng.random() < 0.3:
+        words.insert(rng.randint(0, len(words)), f"{rng.randint(50, 99)}.{rng.randint(0, 9)}%")
+    if rng.random() < 0.15:
+        words.insert(rng.randint(0, len(words)), f"ResNet-{rng.choice([18, 34, 50, 101])}")
+    return ' '.join(words).capitalize() + '.'
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    return ' '.join(_sentence(rng) for _ in range(sentences))
+
+
+def _figure_png(rng: random.Random, width: int = 480, height: int = 320) -> bytes:
+    from PIL import Image, ImageDraw
+    img = Image.new('RGB', (width, height), 'white')
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x0, y0 = rng.randint(0, width - 60), rng.randint(0, height - 60)
+        draw.rectangle([x0, y0, x0 + rng.randint(20, 120), y0 + rng.randint(20, 90)],
+                       outline=(0, 0, 0), fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    buf = io.BytesIO()
+    img.save(buf, format='PNG')
+    return buf.getvalue()
+
+
+def generate_pdf(path: str, pages: int, seed: int = 0) -> str:
+    """Write a synthetic two-column paper with figures, captions and tables."""
+    import fitz
+    rng = random.Random(seed)
+    doc = fitz.open()
+    figure_no = table_no = 0
+    for page_no in range(pages):
+        page = doc.new_page(width=612, height=792)
+        section = _SECTIONS[min(page_no * len(_SECTIONS) // max(pages, 1), len(_SECTIONS) - 1)]
+        page.insert_textbox(fitz.Rect(50, 40, 562, 60), section, fontsize=12)
+        left = fitz.Rect(50, 70, 296, 740)
+        right = fitz.Rect(316, 70, 562, 740)
+        if page_no % 2 == 0:
+            figure_no += 1
+            page.insert_image(fitz.Rect(50, 70, 296, 234), stream=_figure_png(rng))
+            page.insert_textbox(fitz.Rect(50, 238, 296, 270),
+                                f"Figure {figure_no}: {_sentence(rng)}", fontsize=8)
+            left = fitz.Rect(50, 275, 296, 740)
+        if page_no % 3 == 1:
+            # Column-aligned results table with booktabs-style rules, caption above
+            table_no += 1
+            page.insert_text((316, 78), f"Table {table_no}: {' '.join(_sentence(rng).split()[:5])}", fontsize=8)
+            rows = [["Method", "Acc", "F1", "Params"]]
+            rows += [[f"Model{r}", f"{rng.uniform(60, 95):.1f}", f"{rng.uniform(0.5, 0.9):.3f}",
+                      f"{rng.randint(5, 300)}M"] for r in range(6)]
+            for r, row in enumerate(rows):
+                for x, cell in zip((320, 400, 460, 515), row):
+                    page.insert_text((x, 98 + 14 * r), cell, fontsize=8)
+            for y in (87, 102, 98 + 14 * len(rows) - 8):
+                page.draw_line((316, y), (562, y), width=0.5)
+            right = fitz.Rect(316, 205, 562, 740)
+        page.insert_textbox(left, _paragraph(rng, 14), fontsize=9)
+        page.insert_textbox(right, _paragraph(rng, 14), fontsize=9)
+        page.insert_textbox(fitz.Rect(296, 750, 316, 770), str(page_no + 1), fontsize=8)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def generate_slides(count: int, seed: int = 0) -> list:
+    """Synthetic slide list with repeated titles so merging has work to do."""
+    rng = random.Random(seed)
+    return [{
+        'title': f"{rng.choice(_SLIDE_TITLES)}{'' if rng.random() < 0.5 else ' ' + rng.choice(_WORDS).title()}",
+        'bullets': [_sentence(rng) for _ in range(rng.randint(3, 5))],
+    } for _ in range(count)]
+
+
+def slides_to_blueprint(slides: list) -> str:
+    lines = []
+    for i, slide in enumerate(slides, 1):
+        lines.append(f"\n{i}. **{slide['title']}**")
+        lines.extend(f"- {b}" for b in slide['bullets'])
+    return '\n'.join(lines)
+
+
+def build_corpus(sizes: list, corpus_dir: str = CORPUS_DIR) -> dict:
+    """Create (or reuse) the PDFs and blueprints for the requested sizes."""
+    os.makedirs(corpus_dir, exist_ok=True)
+    corpus = {}
+    for name in sizes:
+        pages, slide_count = CORPUS_SIZES[name]
+        pdf_path = os.path.join(corpus_dir, f"{name}.pdf")
+        if not os.path.exists(pdf_path):
+            print(f"Generating {name} corpus ({pages} pages)...")
+            generate_pdf(pdf_path, pages, seed=pages)
+        slides = generate_slides(slide_count, seed=slide_count)
+        corpus[name] = {'pdf': pdf_path, 'pages': pages, 'slides': slides,
+                        'blueprint': slides_to_blueprint(slides)}
+    return corpus
+
+
+def _stages(entry: dict, workdir: str) -> list:
+    """(name, unit, units, callable) for every benchmarked stage."""
+    from utils import extract_text_from_pdf, clean_text, identify_sections
+    from pdf_image_extractor import extract_images_from_pdf
+    from smart_figure_matcher import smart_match_figures
+    from caption_index import CaptionIndex
+    from hallucination_filter import detect_hallucinations
+    from verification_report import build_report
+    from slide_organizer import organize_presentation
+    from pptx_generator import generate_pptx_from_blueprint, plan_deck
+    from slide_renderers import render_previews
+
+    state = {}
+    image_dir = os.path.join(workdir, 'images')
+    pages, slides = entry['pages'], entry['slides']
+
+    def extract_text():
+        state['text'] = extract_text_from_pdf(entry['pdf'])
+
+    def sections():
+        identify_sections(clean_text(state['text']))
+
+    def images():
+        shutil.rmtree(image_dir, ignore_errors=True)
+        state['images'] = extract_images_from_pdf(entry['pdf'], image_dir)
+
+    def captions():
+        state['captions'] = CaptionIndex.from_pdf(entry['pdf'])
+        state['captions'].link_images(state['images'])
+
+    def figures():
+        smart_match_figures(slides, image_dir, entry['blueprint'], state['captions'])
+
+    def hallucinations():
+        detect_hallucinations(slides, state['text'])
+
+    def verification():
+        build_report(slides, state['text'])
+
+    def organize():
+        organize_presentation([dict(s, bullets=list(s['bullets'])) for s in slides])
+
+    def pptx():
+        generate_pptx_from_blueprint(entry['blueprint'], os.path.join(workdir, 'bench.pptx'),
+                                     'Benchmark Paper', state['images'])
+
+    def previews():
+        render_previews(plan_deck(entry['blueprint'], state['images']), 'Benchmark Paper',
+                        os.path.join(workdir, 'bench'), ['md', 'html', 'pdf'])
+
+    return [
+        ('extract_text_from_pdf', 'pages', pages, extract_text),
+        ('identify_sections', 'pages', pages, sections),
+        ('extract_images_from_pdf', 'pages', pages, images),
+        ('caption_index', 'pages', pages, captions),
+        ('smart_match_figures', 'slides', len(slides), figures),
+        ('detect_hallucinations', 'slides', len(slides), hallucinations),
+        ('verification_report', 'slides', len(slides), verification),
+        ('organize_presentation', 'slides', len(slides), organize),
+        ('generate_pptx_from_blueprint', 'slides', len(slides), pptx),
+        ('render_previews', 'slides', len(slides), previews),
+    ]
+
+
+def run_benchmarks(corpus: dict, repeat: int = 3, workdir: str = None) -> dict:
+    """Time each stage `repeat` times (median) plus one tracemalloc pass for memory."""
+    workdir = workdir or os.path.join(CORPUS_DIR, 'work')
+    results = {}
+    for name, entry in corpus.items():
+        os.makedirs(workdir, exist_ok=True)
+        stages = _stages(entry, workdir)
+        timings = {stage[0]: [] for stage in stages}
+
+        for run in range(repeat + 1):
+            trace_memory = run == repeat  # Last pass measures memory only
+            tracer = Tracer(f'bench-{name}', trace_memory=trace_memory).activate()
+            for stage_name, _, _, fn in stages:
+                with contextlib.redirect_stdout(io.StringIO()), tracer.span(stage_name) as span:
+                    fn()
+                if not trace_memory:
+                    timings[stage_name].append(span.wall_seconds)
+            tracer.deactivate()
+
+        memory = {s.name: s.peak_traced_mb for s in tracer.spans}
+        results[name] = {}
+        for stage_name, unit, units, _ in stages:
+            median = statistics.median(timings[stage_name])
+            results[name][stage_name] = {
+                'median_seconds': round(median, 6),
+                'min_seconds': round(min(timings[stage_name]), 6),
+                'throughput': round(units / median, 2) if median else None,
+                'unit': f'{unit}/s',
+                'peak_traced_mb': round(memory.get(stage_name) or 0.0, 3),
+            }
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Stages slower than baseline by more than `tolerance` (fraction)."""
+    regressions = []
+    for corpus_name, stages in results.items():
+        for stage_name, current in stages.items():
+            previous = baseline.get(corpus_name, {}).get(stage_name)
+            if not previous or not previous.get('median_seconds'):
+                continue
+            ratio = current['median_seconds'] / previous['median_seconds']
+            current['vs_baseline'] = round(ratio, 3)
+            if ratio > 1 + tolerance:
+                regressions.append((corpus_name, stage_name, ratio))
+    return regressions
+
+
+def _percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile: the smallest value with at least q% of values at or below it."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+def run_load_test(paper_paths: list, concurrency_levels: list, jobs: int) -> dict:
+    """Run `jobs` full pipelines at each concurrency level with replayed LLM responses.
+
+    Checkpoints and the artifact store are turned off so every job does the
+    full work instead of reusing the first job's stages, and each job writes
+    to its own output directory. One untimed warm-up job absorbs one-off
+    process costs (imports, model loading) before the first level.
+    """
+    import config
+    from pipeline import ResearchPaperPipeline
+    config.CHECKPOINTS_ENABLED = False
+    config.INCREMENTAL_ENABLED = False
+    workdir = os.path.join(CORPUS_DIR, 'e2e')
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    def one_job(level, i):
+        output_dir = os.path.join(workdir, f"c{level}_job{i}")
+        start = time.perf_counter()
+        ResearchPaperPipeline(paper_paths[i % len(paper_paths)], show_progress=False, output_dir=output_dir).run()
+        return time.perf_counter() - start
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        one_job('warmup', 0)
+
+    results = {}
+    for level in concurrency_levels:
+        print(f"Running {jobs} pipelines at concurrency {level}...")
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(max_workers=level) as executor:
+            latencies = list(executor.map(lambda i: one_job(level, i), range(jobs)))
+        wall = time.perf_counter() - start
+        results[level] = {
+            'jobs': jobs,
+            'wall_seconds': round(wall, 3),
+            'throughput_jobs_per_s': round(jobs / wall, 3),
+            'p50_seconds': round(_percentile(latencies, 50), 3),
+            'p95_seconds': round(_percentile(latencies, 95), 3),
+            'p99_seconds': round(_percentile(latencies, 99), 3),
+            'max_seconds': round(max(latencies), 3),
+        }
+    return results
+
+
+def print_load_results(results: dict):
+    base = None
+    print(f"\n  {'concurrency':>11} {'jobs/s':>8} {'speedup':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for level, r in results.items():
+        base = base or r['throughput_jobs_per_s']
+        print(f"  {level:>11} {r['throughput_jobs_per_s']:>8.2f} {r['throughput_jobs_per_s'] / base:>7.2f}x "
+              f"{r['p50_seconds']:>7.2f}s {r['p95_seconds']:>7.2f}s {r['p99_seconds']:>7.2f}s")
+
+
+def print_results(results: dict):
+    for corpus_name, stages in results.items():
+        print(f"\n{corpus_name}:")
+        print(f"  {'stage':<30} {'median':>10} {'throughput':>16} {'peak MB':>9} {'vs base':>8}")
+        for stage_name, r in stages.items():
+            vs = f"{r['vs_baseline']:.2f}x" if 'vs_baseline' in r else '-'
+            throughput = f"{r['throughput']} {r['unit']}" if r['throughput'] else '-'
+            print(f"  {stage_name:<30} {r['median_seconds'] * 1000:>8.1f}ms {throughput:>16} "
+                  f"{r['peak_traced_mb']:>9.2f} {vs:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the non-LLM pipeline stages")
+    parser.add_argument('--sizes', default='small,typical', help="Comma-separated: small,typical,large")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed repetitions per stage")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed slowdown before failing")
+    parser.add_argument('--output', default='', help="Also write results to this JSON file")
+    parser.add_argument('--e2e', action='store_true', help="Full-pipeline load test with replayed LLM responses")
+    parser.add_argument('--concurrency', default='1,2,4', help="Concurrency levels for --e2e")
+    parser.add_argument('--jobs', type=int, default=8, help="Pipeline runs per concurrency level for --e2e")
+    parser.add_argument('--replay-file', default='', help="Recorded responses (default: LLM_REPLAY_PATH)")
+    parser.add_argument('--latency', default='', help="Replay latency spec, e.g. zero, const:0.5")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(',') if s.strip()]
+    unknown = [s for s in sizes if s not in CORPUS_SIZES]
+    if unknown:
+        parser.error(f"Unknown corpus size(s): {', '.join(unknown)}")
+
+    if args.e2e:
+        # Must be set before config is imported by the pipeline modules
+        os.environ['LLM_REPLAY_MODE'] = 'replay'
+        if args.replay_file:
+            os.environ['LLM_REPLAY_PATH'] = args.replay_file
+        if args.latency:
+            os.environ['LLM_REPLAY_LATENCY'] = args.latency
+        corpus = build_corpus(sizes)
+        levels = [int(c) for c in args.concurrency.split(',') if c.strip()]
+        results = run_load_test([entry['pdf'] for entry in corpus.values()], levels, args.jobs)
+        print_load_results(results)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+        return
+
+    results = run_benchmarks(build_corpus(sizes), repeat=args.repeat)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved baseline: {args.baseline}")
+
+    if regressions:
+        print(f"\n⚠️  {len(regressions)} stage(s) slower than baseline (tolerance {args.tolerance:.0%}):")
+        for corpus_name, stage_name, ratio in regressions:
+            print(f"  {corpus_name}/{stage_name}: {ratio:.2f}x")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Figure and table caption index with page anchoring.
+
+Built in one pass over per-page text. Only real captions are kept: the first
+"Figure 3: ..." / "Table 2. ..." that is followed by caption-like text, not
+every in-text mention of "Figure 3". Each caption records its page, bounding
+box and character offset, and figure captions are linked to the extracted
+image on the same page, so consumers can look figures up by number in O(1).
+"""
+import re
+from pdf_document import get_document
+
+# "Figure 3:", "Fig. 3.", "Table 2 |", "Figure S1:" at the start of a block/line
+_CAPTION_RE = re.compile(
+    r'(?:^|(?<=\n))\s*(Figure|Fig\.?|Table)\s+([A-Z]?\d+)\s*[:.|]\s*(\S[^\n]*)',
+    re.IGNORECASE
+)
+# Flattened text has no line starts: require an uppercase caption after the separator
+_INLINE_CAPTION_RE = re.compile(
+    r'\b(Figure|Fig\.?|Table)\s+([A-Z]?\d+)\s*[:.|]\s*([A-Z][^.]{10,300}\.?)'
+)
+MAX_CAPTION_CHARS = 300
+
+
+def _kind(label: str) -> str:
+    return 'table' if label.lower().startswith('tab') else 'figure'
+
+
+def _caption_text(text: str) -> str:
+    text = ' '.join(text.split())
+    return text[:MAX_CAPTION_CHARS]
+
+
+class CaptionIndex:
+    """Deduplicated captions keyed by (type, number)."""
+
+    def __init__(self):
+        self._captions = {}
+
+    def add(self, kind: str, number: str, caption: str, page: int = None, bbox=None, offset: int = None) -> bool:
+        """Keep the first caption for a figure/table number; later mentions are ignored."""
+        key = (kind, number.upper())
+        if key in self._captions or len(caption.split()) < 2:
+            return False
+        self._captions[key] = {
+            'type': kind,
+            'number': number,
+            'caption': caption,
+            'page': page,
+            'bbox': bbox,
+            'offset': offset,
+            'image': None,
+        }
+        return True
+
+    @classmethod
+    def from_list(cls, entries: list) -> 'CaptionIndex':
+        """Rebuild an index from to_list() output (e.g. a checkpoint)."""
+        index = cls()
+        for entry in entries:
+            index._captions[(entry['type'], str(entry['number']).upper())] = dict(entry)
+        return index
+
+    @classmethod
+    def from_pdf(cls, pdf_path: str) -> 'CaptionIndex':
+        """One pass over the text blocks of every page of the shared PDF handle."""
+        index = cls()
+        with get_document(pdf_path) as document:
+            offset = 0
+            for page_num in range(document.page_count):
+                page_text = document.page_text(page_num)
+                for block in document.page_blocks(page_num):
+                    x0, y0, x1, y1, text = block[:5]
+                    match = _CAPTION_RE.match(text)
+                    if match:
+                        position = page_text.find(text.strip()[:40])
+                        index.add(_kind(match.group(1)), match.group(2), _caption_text(match.group(3)),
+                                  page=page_num + 1, bbox=(x0, y0, x1, y1),
+                                  offset=offset + max(position, 0))
+                offset += len(page_text) + 2  # Matches PDFDocument.text() page separators
+        return index
+
+    @classmethod
+    def from_text(cls, text: str) -> 'CaptionIndex':
+        """Captions from plain text (line-structured or flattened by clean_text)."""
+        index = cls()
+        pattern = _CAPTION_RE if '\n' in text else _INLINE_CAPTION_RE
+        for match in pattern.finditer(text):
+            index.add(_kind(match.group(1)), match.group(2), _caption_text(match.group(3)),
+                      offset=match.start())
+        return index
+
+    def link_images(self, images: list) -> list:
+        """Attach each figure caption to the nearest image above it on the same page.
+
+        Linked images gain 'figure_number' and 'caption'. Returns the images.
+        """
+        by_page = {}
+        for image in images:
+            if image.get('page') is not None:
+                by_page.setdefault(image['page'], []).append(image)
+        for entry in self._captions.values():
+            if entry['type'] != 'figure' or entry['page'] not in by_page:
+                continue
+            candidates = [i for i in by_page[entry['page']] if 'figure_number' not in i]
+            if not candidates:
+                continue
+            if entry['bbox']:
+                caption_top = entry['bbox'][1]
+                # Figures sit above their captions; prefer the closest bottom edge above
+                def distance(image):
+                    bbox = image.get('bbox')
+                    if not bbox:
+                        return float('inf')
+                    gap = caption_top - bbox[3]
+                    return gap if gap >= -5 else 1e6 + abs(gap)
+                image = min(candidates, key=distance)
+            else:
+                image = candidates[0]
+            image['figure_number'] = entry['number']
+            image['caption'] = entry['caption']
+            entry['image'] = image['path']
+        return images
+
+    def get(self, kind: str, number) -> dict:
+        return self._captions.get((kind, str(number).upper()))
+
+    def figure(self, number) -> dict:
+        return self.get('figure', number)
+
+    def table(self, number) -> dict:
+        return self.get('table', number)
+
+    def __len__(self):
+        return len(self._captions)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def to_list(self) -> list:
+        """Captions in document order (figures/tables interleaved by position)."""
+        return sorted(self._captions.values(),
+                      key=lambda c: (c['page'] or 0, c['offset'] or 0, c['type'], c['number']))
+
+
+if __name__ == '__main__':
+    # Test
+    text = """Figure 1: Overview of the proposed architecture with encoder and decoder.
+As shown in Figure 1, the encoder feeds the decoder. Figure 1 also shows the loss.
+Table 1: Accuracy on ImageNet and CIFAR-10 for all baselines.
+Results in Table 1 confirm the gains (see Figure 2).
+Fig. 2. Training curves for the three model sizes."""
+    index = CaptionIndex.from_text(text)
+    for entry in index:
+        print(f"  {entry['type']} {entry['number']} @ {entry['offset']}: {entry['caption']}")
+    print(f"Figure 2 lookup: {index.figure(2)['caption']}")
@@ -0,0 +1,179 @@
+"""Durable per-stage checkpoints so interrupted pipeline runs can be resumed.
+
+Every run gets a directory runs/<run-id>/ holding a manifest (run parameters
+and completed stages) plus one JSON file per stage. Files are written to a
+temporary name and atomically renamed, so a crash mid-write never leaves a
+half-written checkpoint behind.
+
+Stage outputs are also kept in a content-addressed ArtifactStore keyed by a
+fingerprint of the stage's inputs (upstream fingerprints + the run parameters
+it depends on), so a new run only recomputes stages whose inputs changed.
+
+    runs/20260101_120000_ab12cd/
+        manifest.json
+        ingestion.json
+        sections.json
+        task_summarization.json
+        ...
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+import uuid
+import config
+
+
+def atomic_write_json(path: str, data) -> str:
+    """Write JSON to path via a temp file + rename (atomic on POSIX and Windows)."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, default=str)  # e.g. arXiv publication datetimes
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def stage_fingerprint(stage: str, upstream: list, params: dict) -> str:
+    """Fingerprint of a stage's inputs."""
+    payload = json.dumps([stage, upstream, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def file_fingerprint(path: str) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def new_run_id() -> str:
+    return time.strftime('%Y%m%d_%H%M%S') + '_' + uuid.uuid4().hex[:6]
+
+
+class RunCheckpoint:
+    """Stage outputs of one pipeline run."""
+
+    def __init__(self, run_id: str = None, runs_dir: str = None, params: dict = None):
+        self.run_id = run_id or new_run_id()
+        self.run_dir = os.path.join(runs_dir or config.RUNS_DIR, self.run_id)
+        self.manifest_path = os.path.join(self.run_dir, 'manifest.json')
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {
+                'run_id': self.run_id,
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'params': params or {},
+                'completed': [],
+                'fingerprints': {},
+                'status': 'running',
+            }
+            atomic_write_json(self.manifest_path, self.manifest)
+
+    @classmethod
+    def open(cls, run_id: str, runs_dir: str = None):
+        """Open an existing run for resuming; an unknown run_id writes nothing."""
+        run_dir = os.path.join(runs_dir or config.RUNS_DIR, run_id)
+        if not os.path.exists(os.path.join(run_dir, 'manifest.json')):
+            raise FileNotFoundError(f"No checkpointed run '{run_id}' in {run_dir}")
+        checkpoint = cls(run_id, runs_dir)  # Reads the manifest; doesn't rewrite it
+        if not checkpoint.manifest.get('params'):
+            raise FileNotFoundError(f"No checkpointed run '{run_id}' in {checkpoint.run_dir}")
+        return checkpoint
+
+    @property
+    def params(self) -> dict:
+        return self.manifest['params']
+
+    def has(self, stage: str, fingerprint: str = None) -> bool:
+        """Stage completed (and, if a fingerprint is given, with the same inputs)."""
+        if stage not in self.manifest['completed']:
+            return False
+        return fingerprint is None or self.manifest.get('fingerprints', {}).get(stage) == fingerprint
+
+    def save(self, stage: str, data, fingerprint: str = None) -> str:
+        """Persist a stage's output, then mark it completed in the manifest."""
+        path = atomic_write_json(self._stage_path(stage), data)
+        if stage not in self.manifest['completed']:
+            self.manifest['completed'].append(stage)
+        if fingerprint:
+            self.manifest.setdefault('fingerprints', {})[stage] = fingerprint
+        self.manifest['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        atomic_write_json(self.manifest_path, self.manifest)
+        return path
+
+    def load(self, stage: str):
+        with open(self._stage_path(stage), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def set_status(self, status: str, error: str = None):
+        self.manifest['status'] = status
+        self.manifest['error'] = error
+        atomic_write_json(self.manifest_path, self.manifest)
+
+    def _stage_path(self, stage: str) -> str:
+        return os.path.join(self.run_dir, stage.replace(':', '_') + '.json')
+
+
+class ArtifactStore:
+    """Stage outputs shared across runs, addressed by input fingerprint."""
+
+    def __init__(self, root: str = None):
+        self.root = root or config.ARTIFACTS_DIR
+
+    def get(self, fingerprint: str):
+        """Stored output for these inputs, or None."""
+        try:
+            with open(self._path(fingerprint), 'r', encoding='utf-8') as f:
+                return json.load(f)['data']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, fingerprint: str, stage: str, data) -> str:
+        return atomic_write_json(self._path(fingerprint), {'stage': stage, 'data': data})
+
+    def _path(self, fingerprint: str) -> str:
+        return os.path.join(self.root, fingerprint[:2], fingerprint + '.json')
+
+
+def list_runs(runs_dir: str = None) -> list:
+    """Manifests of all checkpointed runs, newest first."""
+    runs_dir = runs_dir or config.RUNS_DIR
+    if not os.path.isdir(runs_dir):
+        return []
+    manifests = []
+    for run_id in sorted(os.listdir(runs_dir), reverse=True):
+        path = os.path.join(runs_dir, run_id, 'manifest.json')
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                manifests.append(json.load(f))
+    return manifests
+
+
+if __name__ == '__main__':
+    # Test
+    import shutil
+    checkpoint = RunCheckpoint(runs_dir='.test_runs', params={'paper_path': 'paper.pdf'})
+    checkpoint.save('ingestion', {'paper_text': 'Abstract ...'})
+    checkpoint.save('task:summarization', {'raw': 'Summary ...'},
+                    fingerprint=stage_fingerprint('task:summarization', [], {'style': 'concise'}))
+
+    resumed = RunCheckpoint.open(checkpoint.run_id, runs_dir='.test_runs')
+    print(f"Run {resumed.run_id}: completed {resumed.manifest['completed']}")
+    print(f"Summarization: {resumed.load('task:summarization')['raw']}")
+    changed = stage_fingerprint('task:summarization', [], {'style': 'teaching'})
+    print(f"Reusable after a style change: {resumed.has('task:summarization', changed)}")
+    shutil.rmtree('.test_runs')
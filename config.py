@@ -31,15 +31,122 @@ MAX_BULLETS_PER_SLIDE = 5  # Keep slides focused with 3-4 bullets
 MAX_WORDS_PER_BULLET = 25  # Allow detailed, self-explanatory bullets
 MIN_BULLETS_PER_SLIDE = 3  # Minimum 3 bullets for substance
 
-# No timeout - let the model take as long as it needs
+# Text fitting (text_fit): font sizes chosen from font metrics, overflow goes to continuation slides
+USE_LLM_COMPRESSION = os.getenv('USE_LLM_COMPRESSION', 'false').lower() == 'true'  # Also run the compression agent
+TEXT_FIT_FONTS = os.getenv('TEXT_FIT_FONTS', 'calibri.ttf,Carlito-Regular.ttf,DejaVuSans.ttf').split(',')
+TEXT_FIT_BOLD_FONTS = os.getenv('TEXT_FIT_BOLD_FONTS', 'calibrib.ttf,Carlito-Bold.ttf,DejaVuSans-Bold.ttf').split(',')
+BULLET_FONT_SIZES = (18, 12)  # Largest and smallest bullet size (points)
+TITLE_FONT_SIZES = (22, 14)
+
+# LLM Transport (shared keep-alive connections to Ollama)
+OLLAMA_API_BASE = os.getenv('OLLAMA_API_BASE', 'http://localhost:11434')
+LLM_TRANSPORT_ENABLED = os.getenv('LLM_TRANSPORT_ENABLED', 'true').lower() == 'true'
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '2'))  # In-flight requests per model
+LLM_MODEL_CONCURRENCY = os.getenv('LLM_MODEL_CONCURRENCY', '')  # Per-model overrides, e.g. "qwen2.5:14b=1,mistral=4"
+LLM_MAX_QUEUE = int(os.getenv('LLM_MAX_QUEUE', '0'))  # Waiting requests per model before rejecting; 0 = unbounded
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '600'))  # Seconds per request (local models can be slow)
+LLM_RETRIES = int(os.getenv('LLM_RETRIES', '3'))
+LLM_RETRY_BACKOFF = float(os.getenv('LLM_RETRY_BACKOFF', '2.0'))  # Base seconds, doubled per attempt
+LLM_POOL_SIZE = int(os.getenv('LLM_POOL_SIZE', '8'))  # Idle keep-alive connections per host
+# Several Ollama hosts: "url|weight=2|models=mistral+qwen2.5:7b,url2" (empty = OLLAMA_API_BASE only)
+OLLAMA_ENDPOINTS = os.getenv('OLLAMA_ENDPOINTS', '')
+LLM_HEALTH_INTERVAL = float(os.getenv('LLM_HEALTH_INTERVAL', '30'))  # Seconds between endpoint health checks
+
+# LLM Response Cache (request-level, shared across runs)
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', '.cache/llm_cache.sqlite')
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600)))  # Seconds; 0 = never expire
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000'))
+LLM_CACHE_MAX_MB = int(os.getenv('LLM_CACHE_MAX_MB', '200'))
+LLM_CACHE_SEMANTIC = os.getenv('LLM_CACHE_SEMANTIC', 'false').lower() == 'true'  # Near-duplicate lookup
+LLM_CACHE_SIMILARITY = float(os.getenv('LLM_CACHE_SIMILARITY', '0.97'))
+
+# LLM Record/Replay (offline load testing)
+LLM_REPLAY_MODE = os.getenv('LLM_REPLAY_MODE', '')  # '', 'record' or 'replay'
+LLM_REPLAY_PATH = os.getenv('LLM_REPLAY_PATH', 'replay/llm_responses.jsonl')
+LLM_REPLAY_LATENCY = os.getenv('LLM_REPLAY_LATENCY', 'recorded')  # recorded, zero, const:S, uniform:A:B, lognormal:MU:SIGMA
+LLM_REPLAY_SCALE = float(os.getenv('LLM_REPLAY_SCALE', '1.0'))
+LLM_REPLAY_STRICT = os.getenv('LLM_REPLAY_STRICT', 'false').lower() == 'true'  # Fail on unrecorded prompts
+
+# Embeddings (semantic cache lookups, survey retrieval, near-duplicate bullets)
+EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+
+# Fact checking
+NUMERIC_CONTEXT_CHARS = 150  # Source characters either side of a number searched for claim keywords
+USE_LLM_VERIFICATION = os.getenv('USE_LLM_VERIFICATION', 'false').lower() == 'true'  # Also run the verification agent
+VERIFICATION_MIN_OVERLAP = 0.5  # Share of a claim-free bullet's keywords a source sentence must contain
+
+# Slide merging and classification (slide_organizer)
+SLIDE_MERGE_TITLE_SIMILARITY = 0.7  # Title word Jaccard above which slides are merged
+SLIDE_MERGE_NEAR_DUPLICATES = os.getenv('SLIDE_MERGE_NEAR_DUPLICATES', 'false').lower() == 'true'  # Embedding bullet dedupe
+SLIDE_MERGE_BULLET_SIMILARITY = float(os.getenv('SLIDE_MERGE_BULLET_SIMILARITY', '0.9'))
+SLIDE_CLASSIFY_EMBEDDINGS = os.getenv('SLIDE_CLASSIFY_EMBEDDINGS', 'true').lower() == 'true'  # Prototype scoring
+SLIDE_CLASSIFY_MIN_SIMILARITY = float(os.getenv('SLIDE_CLASSIFY_MIN_SIMILARITY', '0.3'))
 
 # Processing Settings
+ARXIV_USE_SOURCE = os.getenv('ARXIV_USE_SOURCE', 'true').lower() == 'true'  # Parse LaTeX e-prints, PDF as fallback
+PDF_TEXT_BACKEND = os.getenv('PDF_TEXT_BACKEND', 'pymupdf')  # 'pymupdf' (shared handle) or 'pdfplumber'
+PDF_TEXT_LAYOUT = os.getenv('PDF_TEXT_LAYOUT', 'columns')  # 'columns' (reading order, no headers/footers) or 'raw'
+PDF_REPEATED_LINE_SHARE = 0.3  # Header/footer lines repeated on this share of pages are dropped
+# OCR for scanned pages (pytesseract + the tesseract binary)
+OCR_ENABLED = os.getenv('OCR_ENABLED', 'true').lower() == 'true'
+OCR_DPI = int(os.getenv('OCR_DPI', '300'))
+OCR_LANG = os.getenv('OCR_LANG', 'eng')
+OCR_WORKERS = int(os.getenv('OCR_WORKERS', str(min(4, os.cpu_count() or 1))))
+OCR_CACHE_DIR = os.getenv('OCR_CACHE_DIR', '.cache/ocr')
+OCR_MIN_CHARS = 20  # Pages with less extracted text than this (and an image) are OCR'd
+PDF_DOCUMENT_CACHE = int(os.getenv('PDF_DOCUMENT_CACHE', '4'))  # Parsed PDFs kept open for reuse across stages
+# Tables (native PPTX tables from pdfplumber's table finder)
+TABLE_WORKERS = int(os.getenv('TABLE_WORKERS', str(min(4, os.cpu_count() or 1))))
+TABLE_CACHE_DIR = os.getenv('TABLE_CACHE_DIR', '.cache/tables')
+TABLE_MAX_HEIGHT = 300  # Points below a caption searched for borderless tables
+TABLE_MAX_ROWS = 10  # Larger tables are truncated on the slide
+TABLE_MAX_COLS = 6
+TABLE_MAX_SLIDES = 3  # Uncited tables added to the results section
+
+# Deck rendering (slide payloads are prepared in worker processes, then assembled in order)
+PPTX_WORKERS = int(os.getenv('PPTX_WORKERS', str(os.cpu_count() or 1)))
+PPTX_PARALLEL_MIN_IMAGES = 8  # Decks with fewer images are prepared in-process
+PPTX_IMAGE_DPI = int(os.getenv('PPTX_IMAGE_DPI', '200'))  # Figures are downscaled to this at their size on the slide
 CHUNK_SIZE = 2000
 CHUNK_OVERLAP = 200
 MAX_SECTION_LENGTH = 800  # Limit section text to avoid token overload
 
+# Checkpoints (resume interrupted runs with: python main.py --resume <run-id>)
+CHECKPOINTS_ENABLED = os.getenv('CHECKPOINTS_ENABLED', 'true').lower() == 'true'
+RUNS_DIR = os.getenv('RUNS_DIR', 'runs')
+# Reuse stage outputs from earlier runs whose inputs match (e.g. only style/target_slides changed)
+INCREMENTAL_ENABLED = os.getenv('INCREMENTAL_ENABLED', 'true').lower() == 'true'
+ARTIFACTS_DIR = os.getenv('ARTIFACTS_DIR', '.cache/artifacts')
+
+# Survey Decks (python survey.py paper1.pdf paper2.pdf ...)
+SURVEY_WORKERS = int(os.getenv('SURVEY_WORKERS', '4'))  # Papers ingested/summarised concurrently
+SURVEY_PASSAGE_WORDS = int(os.getenv('SURVEY_PASSAGE_WORDS', '120'))
+SURVEY_PASSAGE_OVERLAP = int(os.getenv('SURVEY_PASSAGE_OVERLAP', '30'))
+SURVEY_EVIDENCE_PER_TOPIC = int(os.getenv('SURVEY_EVIDENCE_PER_TOPIC', '8'))
+SURVEY_EVIDENCE_PER_PAPER = int(os.getenv('SURVEY_EVIDENCE_PER_PAPER', '2'))  # Keeps one paper from dominating a topic
+SURVEY_DIGEST_CHARS = int(os.getenv('SURVEY_DIGEST_CHARS', '400'))  # Per-paper summary length sent to the LLM
+SURVEY_DENSE_RETRIEVAL = os.getenv('SURVEY_DENSE_RETRIEVAL', 'false').lower() == 'true'  # Blend embeddings into BM25
+SURVEY_OUTPUT = "survey_blueprint.txt"
+SURVEY_EVIDENCE_OUTPUT = "survey_evidence.json"
+
+# Pipeline Service (python service.py)
+SERVICE_HOST = os.getenv('SERVICE_HOST', '127.0.0.1')
+SERVICE_PORT = int(os.getenv('SERVICE_PORT', '8765'))
+SERVICE_WORKERS = int(os.getenv('SERVICE_WORKERS', '1'))  # Concurrent jobs (LLM concurrency is limited separately)
+SERVICE_DB = os.getenv('SERVICE_DB', '.cache/jobs.sqlite')
+SERVICE_MAX_ATTEMPTS = int(os.getenv('SERVICE_MAX_ATTEMPTS', '3'))  # Starts before an interrupted job is failed
+SERVICE_OUTPUT_DIR = os.getenv('SERVICE_OUTPUT_DIR', 'output/jobs')
+SERVICE_ACCESS_LOG = os.getenv('SERVICE_ACCESS_LOG', 'false').lower() == 'true'
+
 # Output Settings
 OUTPUT_DIR = "output"
 SLIDES_OUTPUT = "slide_blueprint.txt"
 PRESENTER_NOTES_OUTPUT = "presenter_notes.txt"
-VERIFICATION_REPORT_OUTPUT = "verification_report.txt"
+VERIFICATION_REPORT_OUTPUT = "verification_report.json"  # Per-bullet source evidence
+# Deck formats next to the slide blueprint: pptx, md (Marp), html (reveal.js), pdf. Previews are written first.
+OUTPUT_FORMATS = [f.strip() for f in os.getenv('OUTPUT_FORMATS', 'pptx').split(',') if f.strip()]
+REVEAL_JS_URL = os.getenv('REVEAL_JS_URL', 'https://cdn.jsdelivr.net/npm/reveal.js@5')
+RUN_REPORT_OUTPUT = "run_report.json"  # Per-stage timing/memory/token report
+TRACE_OUTPUT = os.getenv('TRACE_OUTPUT', '')  # e.g. "trace.json" to also write a Chrome trace
+TRACE_MEMORY = os.getenv('TRACE_MEMORY', 'false').lower() == 'true'  # tracemalloc peaks (slower)
@@ -0,0 +1,32 @@
+"""Shared sentence-embedding helper (optional sentence-transformers backend)."""
+import config
+
+_encoder = None
+_encoder_failed = False
+
+def get_encoder():
+    """Load the sentence-transformers model once; return None if unavailable."""
+    global _encoder, _encoder_failed
+    if _encoder is not None or _encoder_failed:
+        return _encoder
+    try:
+        from sentence_transformers import SentenceTransformer
+        _encoder = SentenceTransformer(config.EMBEDDING_MODEL)
+    except Exception as e:
+        print(f"⚠️  Embeddings unavailable ({e}) - falling back to exact matching")
+        _encoder_failed = True
+    return _encoder
+
+def is_available() -> bool:
+    """Check whether an embedding model can be used."""
+    return get_encoder() is not None
+
+def encode(texts: list):
+    """Embed a batch of texts as L2-normalised float32 rows, or None if unavailable."""
+    encoder = get_encoder()
+    if encoder is None or not texts:
+        return None
+    import numpy as np
+    vectors = encoder.encode(list(texts), batch_size=64, normalize_embeddings=True,
+                             show_progress_bar=False)
+    return np.asarray(vectors, dtype=np.float32)
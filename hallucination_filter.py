@@ -1,59 +1,38 @@
 """Post-processing filter to detect and remove hallucinated facts."""
-import re
-from difflib import SequenceMatcher
+from claim_scanner import scan_claim, scan_claims
+from numeric_index import NumericIndex, parse_numbers
 
 def extract_factual_claims(bullet):
-    """Extract factual claims from a bullet point."""
-    claims = []
-    
-    # Extract numbers with context
-    number_patterns = [
-        (r'(\d+\.?\d*%)', 'percentage'),
-        (r'(\d+\.?\d*[KMB])\s*(parameters|images|samples)', 'count'),
-        (r'accuracy[:\s]+(\d+\.?\d*)', 'accuracy'),
-        (r'learning rate[:\s]+(\d+\.?\d*)', 'learning_rate'),
-        (r'batch size[:\s]+(\d+)', 'batch_size'),
-        (r'(\d+)\s*(layers|epochs|classes)', 'architecture'),
-    ]
-    
-    for pattern, claim_type in number_patterns:
-        matches = re.finditer(pattern, bullet, re.IGNORECASE)
-        for match in matches:
-            claims.append({
-                'type': claim_type,
-                'value': match.group(1) if match.lastindex >= 1 else match.group(0),
-                'text': match.group(0)
-            })
-    
-    # Extract model/dataset names
-    if re.search(r'\b[A-Z][a-zA-Z]*Net\b', bullet):  # ResNet, EfficientNet, etc.
-        model_match = re.search(r'\b([A-Z][a-zA-Z]*Net[-\d]*)\b', bullet)
-        if model_match:
-            claims.append({
-                'type': 'model_name',
-                'value': model_match.group(1),
-                'text': model_match.group(0)
-            })
+    """Extract factual claims from a bullet point (see claim_scanner for the claim types)."""
+    return scan_claim(bullet)
+
+def verify_claim_in_source(claim_text, source_text, source_lower=None, numeric_index=None, context=None):
+    """Check if a claim appears in the source text.
     
-    return claims
+    Numbers are matched by value and unit through a NumericIndex of the source
+    (0.852 = 85.2%, 1.2M = 1,200,000), with the keywords of context (the whole
+    bullet) required near them. Pass source_lower/numeric_index when checking many claims.
+    """
+    verified, confidence, _ = locate_claim(claim_text, source_text, source_lower, numeric_index, context)
+    return verified, confidence
 
-def verify_claim_in_source(claim_text, source_text):
-    """Check if a claim appears in the source text."""
+def locate_claim(claim_text, source_text, source_lower=None, numeric_index=None, context=None):
+    """verify_claim_in_source plus where: (verified, confidence, (start, end) in source or None)."""
+    # Numbers: canonical value lookup, not substring ("8%" must not match "98%")
+    if parse_numbers(claim_text):
+        index = numeric_index or NumericIndex.for_text(source_text)
+        verified, confidence, evidence = index.verify(claim_text, context)
+        return verified, confidence, (evidence[0] if verified else None)
+    
     # Normalize texts
     claim_lower = claim_text.lower()
-    source_lower = source_text.lower()
+    if source_lower is None:
+        source_lower = source_text.lower()
     
     # Direct substring match
-    if claim_lower in source_lower:
-        return True, 1.0
-    
-    # Check for numbers specifically
-    claim_numbers = re.findall(r'\d+\.?\d*', claim_text)
-    if claim_numbers:
-        for num in claim_numbers:
-            # Check if this exact number appears in source
-            if num in source_text:
-                return True, 0.8
+    position = source_lower.find(claim_lower)
+    if position >= 0:
+        return True, 1.0, (position, position + len(claim_lower))
     
     # Fuzzy match for similar phrases
     words = claim_lower.split()
@@ -66,19 +45,23 @@ def verify_claim_in_source(claim_text, source_text):
         
         if len(word_positions) >= len(words) * 0.7:
             # Most words found
-            return True, 0.6
+            return True, 0.6, None
     
-    return False, 0.0
+    return False, 0.0, None
 
 def detect_hallucinations(slides, source_text):
     """Detect hallucinated content by comparing against source."""
     hallucinated_bullets = []
     verified_bullets = []
+    source_lower = source_text.lower()
+    numeric_index = NumericIndex.for_text(source_text)
+    
+    # Scan every bullet of the deck in one batch
+    deck_claims = iter(scan_claims([bullet for slide in slides for bullet in slide['bullets']]))
     
     for slide_idx, slide in enumerate(slides):
         for bullet_idx, bullet in enumerate(slide['bullets']):
-            # Extract claims from bullet
-            claims = extract_factual_claims(bullet)
+            claims = next(deck_claims)
             
             if not claims:
                 # No specific claims to verify - keep it
@@ -90,7 +73,8 @@ def detect_hallucinations(slides, source_text):
             min_confidence = 1.0
             
             for claim in claims:
-                verified, confidence = verify_claim_in_source(claim['text'], source_text)
+                verified, confidence = verify_claim_in_source(claim['text'], source_text, source_lower,
+                                                              numeric_index, context=bullet)
                 if not verified:
                     all_verified = False
                     break
@@ -125,18 +109,13 @@ def filter_hallucinated_bullets(slides, source_text=None):
             print(f"    Unverified claims: {[c['text'] for c in claims]}")
     
     # Create filtered slides
+    hallucinated_positions = {(s_idx, b_idx) for s_idx, b_idx, _, _ in hallucinated}
     filtered_slides = []
     for slide_idx, slide in enumerate(slides):
         filtered_bullets = []
         
         for bullet_idx, bullet in enumerate(slide['bullets']):
-            # Check if this bullet is hallucinated
-            is_hallucinated = any(
-                s_idx == slide_idx and b_idx == bullet_idx 
-                for s_idx, b_idx, _, _ in hallucinated
-            )
-            
-            if not is_hallucinated:
+            if (slide_idx, bullet_idx) not in hallucinated_positions:
                 filtered_bullets.append(bullet)
         
         if filtered_bullets:
@@ -165,23 +144,14 @@ def verify_numbers_consistency(slides):
     # Extract all numbers mentioned
     numbers_by_context = {}
     
-    for slide in slides:
-        for bullet in slide['bullets']:
-            # Find accuracy mentions
-            acc_match = re.search(r'accuracy[:\s]+(\d+\.?\d*)%?', bullet, re.IGNORECASE)
-            if acc_match:
-                acc = float(acc_match.group(1))
-                if 'accuracy' not in numbers_by_context:
-                    numbers_by_context['accuracy'] = []
-                numbers_by_context['accuracy'].append((acc, bullet))
-            
-            # Find parameter counts
-            param_match = re.search(r'(\d+\.?\d*)[KMB]?\s*parameters', bullet, re.IGNORECASE)
-            if param_match:
-                param = param_match.group(1)
-                if 'parameters' not in numbers_by_context:
-                    numbers_by_context['parameters'] = []
-                numbers_by_context['parameters'].append((param, bullet))
+    bullets = [bullet for slide in slides for bullet in slide['bullets']]
+    for bullet, claims in zip(bullets, scan_claims(bullets)):
+        for claim in claims:
+            # Accuracy mentions and parameter counts
+            if claim['type'] == 'accuracy':
+                numbers_by_context.setdefault('accuracy', []).append((float(claim['value']), bullet))
+            elif claim['type'] == 'param_count' or (claim['type'] == 'count' and 'param' in claim['text'].lower()):
+                numbers_by_context.setdefault('parameters', []).append((claim['value'], bullet))
     
     # Check for inconsistencies
     for context, values in numbers_by_context.items():
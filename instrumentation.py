@@ -0,0 +1,254 @@
+"""Per-stage timing, memory and token instrumentation for pipeline runs.
+
+Spans are opened with a context manager (or start/end for callback-driven
+stages such as agent tasks) and record wall time, CPU time, peak traced Python
+memory (tracemalloc, optional), resident memory at start and end and LLM tokens.
+The run report adds the process RSS high-water mark, which only ever rises and
+so is reported once for the whole run rather than per stage.
+A finished run can be written as a JSON report and as a Chrome trace-event file
+(open in chrome://tracing or Perfetto).
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_active_tracer = contextvars.ContextVar('active_tracer', default=None)
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MB (None when unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):  # Not Linux
+        return None
+
+
+def _rss_peak_mb() -> float:
+    """Process peak resident set size in MB (0 when unavailable)."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if peak > 1 << 32 else peak / 1024
+
+
+class Span:
+    """One timed stage."""
+
+    def __init__(self, name: str, category: str, parent, attrs: dict):
+        self.name = name
+        self.category = category
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent else 0
+        self.attrs = attrs
+        self.thread_id = threading.get_ident()
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_traced_mb = None
+        self.rss_start_mb = _rss_mb()
+        self.rss_end_mb = None
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._running_peak = 0
+
+    def to_dict(self, origin: float) -> dict:
+        return {
+            'name': self.name,
+            'category': self.category,
+            'parent': self.parent.name if self.parent else None,
+            'depth': self.depth,
+            'start_offset_seconds': round(self.start_wall - origin, 6),
+            'wall_seconds': round(self.wall_seconds, 6),
+            'cpu_seconds': round(self.cpu_seconds, 6),
+            'peak_traced_mb': None if self.peak_traced_mb is None else round(self.peak_traced_mb, 3),
+            'rss_start_mb': _round(self.rss_start_mb, 1),
+            'rss_end_mb': _round(self.rss_end_mb, 1),
+            'rss_delta_mb': _round(self.rss_delta_mb, 1),
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'attrs': self.attrs,
+        }
+
+    @property
+    def rss_delta_mb(self) -> float:
+        """Resident memory the stage left behind (negative if it freed more than it kept)."""
+        if self.rss_start_mb is None or self.rss_end_mb is None:
+            return None
+        return self.rss_end_mb - self.rss_start_mb
+
+
+def _round(value, digits):
+    return None if value is None else round(value, digits)
+
+
+class Tracer:
+    """Collects spans for one pipeline run.
+
+    tracemalloc is process-wide, so traced peaks are only meaningful when one
+    run is active in the process at a time. Worker threads of a run (copied
+    contexts) may report tokens and open spans concurrently, so the span
+    stack is updated under a lock.
+    """
+
+    def __init__(self, name: str = 'pipeline', trace_memory: bool = False):
+        self.name = name
+        self.trace_memory = trace_memory
+        self.spans = []
+        self._stack = []
+        self._origin = time.perf_counter()
+        self._started_at = time.time()
+        self._owns_tracemalloc = False
+        self._token = None
+        self._lock = threading.Lock()
+
+    def activate(self):
+        """Make this the tracer that record_tokens() reports to in this context."""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        self._token = _active_tracer.set(self)
+        return self
+
+    def deactivate(self):
+        while self._stack:
+            self.end()
+        if self._token is not None:
+            _active_tracer.reset(self._token)
+            self._token = None
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+
+    def start(self, name: str, category: str = 'stage', **attrs) -> Span:
+        """Open a span nested under the current one."""
+        with self._lock:
+            parent = self._stack[-1] if self._stack else None
+            if self._tracing():
+                current_peak = tracemalloc.get_traced_memory()[1]
+                if parent:
+                    parent._running_peak = max(parent._running_peak, current_peak)
+                tracemalloc.reset_peak()
+            span = Span(name, category, parent, attrs)
+            self._stack.append(span)
+            self.spans.append(span)
+            return span
+
+    def end(self, span: Span = None) -> Span:
+        """Close the innermost span (or everything down to the given one)."""
+        with self._lock:
+            if not self._stack:
+                return None
+            while True:
+                current = self._stack.pop()
+                current.wall_seconds = time.perf_counter() - current.start_wall
+                current.cpu_seconds = time.process_time() - current.start_cpu
+                current.rss_end_mb = _rss_mb()
+                if self._tracing():
+                    peak = max(current._running_peak, tracemalloc.get_traced_memory()[1])
+                    current.peak_traced_mb = peak / (1024 * 1024)
+                    if current.parent:
+                        current.parent._running_peak = max(current.parent._running_peak, peak)
+                    tracemalloc.reset_peak()
+                if span is None or current is span or not self._stack:
+                    return current
+
+    @contextmanager
+    def span(self, name: str, category: str = 'stage', **attrs):
+        """Context manager around one stage."""
+        opened = self.start(name, category, **attrs)
+        try:
+            yield opened
+        finally:
+            self.end(opened)
+
+    def add_tokens(self, prompt_tokens: int = 0, completion_tokens: int = 0):
+        """Attribute LLM tokens to every open span."""
+        with self._lock:
+            for open_span in self._stack:
+                open_span.prompt_tokens += prompt_tokens
+                open_span.completion_tokens += completion_tokens
+
+    def report(self) -> dict:
+        """Summary of the run suitable for JSON."""
+        top_level = [s for s in self.spans if s.depth == 0]
+        return {
+            'run': self.name,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self._started_at)),
+            'total_wall_seconds': round(sum(s.wall_seconds for s in top_level), 6),
+            'total_cpu_seconds': round(sum(s.cpu_seconds for s in top_level), 6),
+            'process_rss_peak_mb': round(_rss_peak_mb(), 1),
+            'prompt_tokens': sum(s.prompt_tokens for s in top_level),
+            'completion_tokens': sum(s.completion_tokens for s in top_level),
+            'spans': [s.to_dict(self._origin) for s in self.spans],
+        }
+
+    def write_report(self, path: str) -> str:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def write_chrome_trace(self, path: str) -> str:
+        """Write complete ("X") trace events, timestamps in microseconds."""
+        pid = os.getpid()
+        events = []
+        for s in self.spans:
+            events.append({
+                'name': s.name,
+                'cat': s.category,
+                'ph': 'X',
+                'ts': round((s.start_wall - self._origin) * 1e6, 1),
+                'dur': round(s.wall_seconds * 1e6, 1),
+                'pid': pid,
+                'tid': s.thread_id,
+                'args': dict(s.attrs, cpu_seconds=round(s.cpu_seconds, 6),
+                             peak_traced_mb=s.peak_traced_mb, rss_delta_mb=s.rss_delta_mb,
+                             prompt_tokens=s.prompt_tokens, completion_tokens=s.completion_tokens),
+            })
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+    def _tracing(self) -> bool:
+        return self.trace_memory and tracemalloc.is_tracing()
+
+
+def current_tracer():
+    """Tracer active in this context, or None."""
+    return _active_tracer.get()
+
+def record_tokens(prompt_tokens: int = 0, completion_tokens: int = 0):
+    """Report LLM token usage to the active tracer, if any."""
+    tracer = _active_tracer.get()
+    if tracer is not None:
+        tracer.add_tokens(prompt_tokens, completion_tokens)
+
+
+if __name__ == '__main__':
+    # Test
+    tracer = Tracer('demo', trace_memory=True).activate()
+    with tracer.span('ingestion'):
+        data = [str(i) * 10 for i in range(200000)]
+        with tracer.span('parse', category='substage'):
+            parsed = [d.upper() for d in data]
+    with tracer.span('agents'):
+        record_tokens(1200, 300)
+        time.sleep(0.05)
+    tracer.deactivate()
+
+    print(json.dumps(tracer.report(), indent=2))
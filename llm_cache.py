@@ -0,0 +1,258 @@
+"""Request-level LLM response cache backed by SQLite.
+
+Entries are keyed on (model, temperature, normalised prompt hash) so identical
+summarisation/compression prompts are answered locally across papers and re-runs.
+Eviction is LRU with a TTL plus entry-count and total-size limits. An optional
+near-duplicate lookup compares prompt embeddings for very similar prompts.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    temperature REAL,
+    prompt_hash TEXT NOT NULL,
+    prompt_chars INTEGER NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    embedding BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache(last_access);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_model ON llm_cache(model, temperature);
+"""
+
+def normalize_prompt(messages) -> str:
+    """Flatten chat messages into a whitespace-normalised string."""
+    if isinstance(messages, str):
+        parts = [('user', messages)]
+    else:
+        parts = []
+        for message in messages or []:
+            content = message.get('content') or ''
+            if not isinstance(content, str):
+                content = json.dumps(content, sort_keys=True)
+            parts.append((message.get('role', 'user'), content))
+    return '\n'.join(role + ': ' + re.sub(r'\s+', ' ', content).strip() for role, content in parts)
+
+def prompt_hash(messages) -> str:
+    """Stable hash of the normalised prompt."""
+    return hashlib.sha256(normalize_prompt(messages).encode('utf-8')).hexdigest()
+
+def make_key(model: str, temperature, messages) -> str:
+    """Cache key for one LLM request."""
+    raw = f"{model}|{temperature}|{prompt_hash(messages)}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed LRU/TTL cache for LLM responses."""
+
+    def __init__(self, path: str = None, ttl: int = None, max_entries: int = None,
+                 max_mb: int = None, semantic: bool = None, similarity: float = None):
+        self.path = path or config.LLM_CACHE_PATH
+        self.ttl = config.LLM_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or config.LLM_CACHE_MAX_ENTRIES
+        self.max_bytes = (max_mb or config.LLM_CACHE_MAX_MB) * 1024 * 1024
+        self.semantic = config.LLM_CACHE_SEMANTIC if semantic is None else semantic
+        self.similarity = similarity or config.LLM_CACHE_SIMILARITY
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def get(self, model: str, temperature, messages):
+        """Return a cached response or None."""
+        key = make_key(model, temperature, messages)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and not self._expired(row[1], now):
+                self._touch(key, now)
+                self.hits += 1
+                return row[0]
+
+        if self.semantic:
+            response = self._near_duplicate(model, temperature, messages, now)
+            if response is not None:
+                with self._lock:
+                    self.near_hits += 1
+                return response
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, model: str, temperature, messages, response: str):
+        """Store a response and enforce TTL and size limits."""
+        key = make_key(model, temperature, messages)
+        normalized = normalize_prompt(messages)
+        embedding = self._embed(normalized) if self.semantic else None
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO llm_cache
+                   (key, model, temperature, prompt_hash, prompt_chars, response, size,
+                    created_at, last_access, hits, embedding)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)""",
+                (key, model, temperature, hashlib.sha256(normalized.encode('utf-8')).hexdigest(),
+                 len(normalized), response, len(response.encode('utf-8')), now, now, embedding)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current cache size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            'hits': self.hits,
+            'near_hits': self.near_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.near_hits) / lookups if lookups else 0.0,
+            'entries': entries,
+            'size_mb': size / (1024 * 1024),
+        }
+
+    def clear(self):
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl) and now - created_at > self.ttl
+
+    def _touch(self, key: str, now: float):
+        self._conn.execute(
+            "UPDATE llm_cache SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key)
+        )
+        self._conn.commit()
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least-recently-used ones until within limits."""
+        if self.ttl:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+
+        entries, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        if entries <= self.max_entries and size <= self.max_bytes:
+            return
+
+        for key, entry_size in self._conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY last_access ASC"
+        ).fetchall():
+            if entries <= self.max_entries and size <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            entries -= 1
+            size -= entry_size
+
+    def _embed(self, normalized: str):
+        """Mean-pooled embedding over prompt windows (encoders truncate long inputs)."""
+        import embeddings
+        windows = [normalized[i:i + 1000] for i in range(0, len(normalized), 1000)] or ['']
+        vectors = embeddings.encode(windows)
+        if vectors is None:
+            return None
+        pooled = vectors.mean(axis=0)
+        pooled /= max(float((pooled ** 2).sum()) ** 0.5, 1e-12)
+        return pooled.astype('float32').tobytes()
+
+    def _near_duplicate(self, model: str, temperature, messages, now: float):
+        """Find a cached response whose prompt embedding is above the similarity threshold."""
+        import numpy as np
+        normalized = normalize_prompt(messages)
+        query = self._embed(normalized)
+        if query is None:
+            return None
+
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT key, response, created_at, prompt_chars, embedding FROM llm_cache
+                   WHERE model = ? AND temperature IS ? AND embedding IS NOT NULL""",
+                (model, temperature)
+            ).fetchall()
+            # Length guard: similar embeddings of very different-sized prompts are not reusable
+            rows = [r for r in rows if not self._expired(r[2], now)
+                    and abs(r[3] - len(normalized)) <= 0.1 * max(r[3], len(normalized))]
+            if not rows:
+                return None
+
+            matrix = np.frombuffer(b''.join(r[4] for r in rows), dtype=np.float32).reshape(len(rows), -1)
+            scores = matrix @ np.frombuffer(query, dtype=np.float32)
+            best = int(scores.argmax())
+            if scores[best] < self.similarity:
+                return None
+            self._touch(rows[best][0], now)
+            return rows[best][1]
+
+
+_cache = None
+
+def get_cache():
+    """Process-wide cache instance, or None when caching is disabled."""
+    global _cache
+    if _cache is None and config.LLM_CACHE_ENABLED:
+        _cache = LLMCache()
+    return _cache
+
+def wrap_llm(llm, cache: LLMCache = None):
+    """Route an LLM's call() through the cache, keeping the same object for CrewAI agents."""
+    cache = cache or get_cache()
+    if cache is None:
+        return llm
+
+    inner_call = llm.call
+    model = str(getattr(llm, 'model', ''))
+    temperature = getattr(llm, 'temperature', None)
+
+    def cached_call(messages, tools=None, *args, **kwargs):
+        # Tool-calling and structured-output requests are not plain text completions
+        if tools or kwargs.get('response_model') or kwargs.get('available_functions'):
+            return inner_call(messages, tools, *args, **kwargs)
+
+        response = cache.get(model, temperature, messages)
+        if response is not None:
+            return response
+
+        response = inner_call(messages, tools, *args, **kwargs)
+        if isinstance(response, str) and response.strip():
+            cache.put(model, temperature, messages, response)
+        return response
+
+    llm.call = cached_call
+    return llm
+
+def report():
+    """Print cache hit rates for this process."""
+    cache = get_cache()
+    if cache is None:
+        return
+    s = cache.stats()
+    print(f"[LLM CACHE] hits: {s['hits']}, near-duplicate hits: {s['near_hits']}, "
+          f"misses: {s['misses']}, hit rate: {s['hit_rate']:.0%} "
+          f"({s['entries']} entries, {s['size_mb']:.1f} MB)")
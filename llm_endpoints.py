@@ -0,0 +1,171 @@
+"""Pool of Ollama endpoints with weighted least-outstanding routing and failover."""
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlparse
+import config
+
+
+def _base_model(name: str) -> str:
+    """"mistral:latest" and "mistral" refer to the same model."""
+    return name[:-len(':latest')] if name.endswith(':latest') else name
+
+
+class Endpoint:
+    """One Ollama host with its routing weight, models and health state."""
+
+    def __init__(self, url: str, weight: float = 1.0, models=None):
+        self.url = url.rstrip('/')
+        self.weight = max(float(weight), 0.01)
+        self.models = {_base_model(m) for m in models} if models else set()
+        self.discovered_models = set()
+        self.healthy = True
+        self.outstanding = 0
+        self.active = {}  # model -> requests in flight on this host
+        self.completed = 0
+        self.failures = 0
+        self.last_failure = 0.0
+
+    def serves(self, model: str) -> bool:
+        """Configured models win; otherwise use what the host reported; unknown means any."""
+        known = self.models or self.discovered_models
+        return not known or _base_model(model) in known
+
+    def __repr__(self):
+        return f"Endpoint({self.url}, weight={self.weight}, healthy={self.healthy})"
+
+
+def parse_endpoints(spec: str) -> list:
+    """Parse "url|weight=2|models=a+b, url2" into Endpoint objects."""
+    endpoints = []
+    for entry in (spec or '').split(','):
+        fields = [f.strip() for f in entry.split('|') if f.strip()]
+        if not fields:
+            continue
+        options = dict(f.split('=', 1) for f in fields[1:] if '=' in f)
+        models = [m for m in options.get('models', '').split('+') if m]
+        endpoints.append(Endpoint(fields[0], float(options.get('weight', 1)), models))
+    return endpoints
+
+
+class EndpointPool:
+    """Routes requests to the healthy endpoint with the fewest outstanding requests per weight.
+
+    With a per-endpoint limit, a host already running that many requests for
+    the model is skipped; when every healthy host is at its limit, acquire()
+    waits for a release instead of overloading the survivors of a failover.
+    """
+
+    def __init__(self, endpoints: list = None, health_interval: float = None, health_timeout: float = 5.0):
+        self.endpoints = endpoints or parse_endpoints(config.OLLAMA_ENDPOINTS) or [Endpoint(config.OLLAMA_API_BASE)]
+        self.health_interval = config.LLM_HEALTH_INTERVAL if health_interval is None else health_interval
+        self.health_timeout = health_timeout
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._health_thread = None
+        self._stop = threading.Event()
+
+    def candidates(self, model: str) -> list:
+        """Endpoints configured for a model (healthy or not)."""
+        return [e for e in self.endpoints if e.serves(model)]
+
+    def acquire(self, model: str, exclude=(), limit: int = None) -> Endpoint:
+        """Pick an endpoint for one request and count it as outstanding.
+
+        limit caps the model's in-flight requests per endpoint (None = no cap).
+        Returns None when every endpoint serving the model is excluded.
+        """
+        self._ensure_health_checks()
+        with self._released:
+            while True:
+                options = [e for e in self.candidates(model) if e not in exclude]
+                if not options:
+                    return None
+                free = [e for e in options if not limit or e.active.get(model, 0) < limit]
+                healthy = [e for e in free if e.healthy]
+                if healthy:
+                    chosen = min(healthy, key=lambda e: ((e.outstanding + 1) / e.weight, e.completed))
+                    break
+                if free and not any(e.healthy for e in options):
+                    # Everything is marked down: probe the one that failed longest ago
+                    chosen = min(free, key=lambda e: e.last_failure)
+                    break
+                self._released.wait()  # Healthy hosts are all at the limit
+            chosen.outstanding += 1
+            chosen.active[model] = chosen.active.get(model, 0) + 1
+            return chosen
+
+    def release(self, endpoint: Endpoint, model: str, ok: bool = True, down: bool = False):
+        """Finish a request; connection failures take the endpoint out of rotation.
+
+        Other failures (timeouts, HTTP errors) are counted but leave it healthy.
+        """
+        with self._released:
+            endpoint.outstanding -= 1
+            endpoint.active[model] -= 1
+            self._released.notify_all()
+            if ok:
+                endpoint.completed += 1
+                endpoint.healthy = True
+            else:
+                endpoint.failures += 1
+                endpoint.last_failure = time.time()
+                if down:
+                    endpoint.healthy = False
+                    print(f"⚠️  LLM endpoint {endpoint.url} unreachable - failing over")
+
+    def check_health(self):
+        """Probe every endpoint's /api/tags and refresh its health and model list."""
+        for endpoint in self.endpoints:
+            parsed = urlparse(endpoint.url)
+            if parsed.scheme == 'https':
+                conn = http.client.HTTPSConnection(parsed.hostname, parsed.port or 443, timeout=self.health_timeout)
+            else:
+                conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=self.health_timeout)
+            try:
+                conn.request('GET', '/api/tags')
+                response = conn.getresponse()
+                data = json.loads(response.read() or b'{}')
+                healthy = response.status == 200
+                models = {_base_model(m.get('name', '')) for m in data.get('models', [])}
+            except (OSError, http.client.HTTPException, ValueError):
+                healthy, models = False, None
+            finally:
+                conn.close()
+
+            with self._released:
+                if healthy and not endpoint.healthy:
+                    print(f"✓ LLM endpoint {endpoint.url} is back")
+                    self._released.notify_all()
+                endpoint.healthy = healthy
+                if models is not None:
+                    endpoint.discovered_models = models
+
+    def status(self) -> list:
+        with self._lock:
+            return [{
+                'url': e.url,
+                'weight': e.weight,
+                'healthy': e.healthy,
+                'outstanding': e.outstanding,
+                'completed': e.completed,
+                'failures': e.failures,
+            } for e in self.endpoints]
+
+    def close(self):
+        self._stop.set()
+
+    def _ensure_health_checks(self):
+        """Start the background health checker on first use (multi-endpoint pools only)."""
+        if self._health_thread or len(self.endpoints) < 2 or not self.health_interval:
+            return
+        with self._lock:
+            if self._health_thread:
+                return
+            self._health_thread = threading.Thread(target=self._health_loop, daemon=True)
+            self._health_thread.start()
+
+    def _health_loop(self):
+        while not self._stop.wait(self.health_interval):
+            self.check_health()
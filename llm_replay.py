@@ -0,0 +1,197 @@
+"""Record/replay LLM backend for deterministic, offline throughput testing.
+
+In record mode every agent call is answered by the real model and appended to a
+JSONL file together with its latency. In replay mode the same LLM objects answer
+from that file at a configurable synthetic latency, so the whole pipeline can be
+load-tested on any machine without Ollama or network access.
+
+Latency specs (LLM_REPLAY_LATENCY):
+    recorded            recorded latency (scaled by LLM_REPLAY_SCALE)
+    zero                no delay - measures pure pipeline overhead
+    const:1.5           fixed seconds
+    uniform:0.5:2.0     uniform between bounds
+    lognormal:0.0:0.5   lognormal(mu, sigma) seconds
+"""
+import json
+import os
+import random
+import re
+import threading
+import time
+import weakref
+import config
+import instrumentation
+from llm_cache import make_key, normalize_prompt
+
+
+class ReplayMissError(KeyError):
+    """No recorded response matches a request in strict replay mode."""
+
+
+def agent_role(messages) -> str:
+    """Agent role of a crewAI prompt (its system message opens "You are <role>."), or ''."""
+    if isinstance(messages, str):
+        text = messages
+    else:
+        text = next((str(m.get('content', '')) for m in messages if m.get('role') == 'system'), '')
+    match = re.match(r'\s*You are (.+?)\.', text)
+    return match.group(1).strip() if match else ''
+
+
+class ResponseRecorder:
+    """Appends live responses to a JSONL recording."""
+
+    def __init__(self, path: str = None):
+        self.path = path or config.LLM_REPLAY_PATH
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def record(self, model: str, temperature, messages, response: str, latency: float):
+        entry = {
+            'key': make_key(model, temperature, messages),
+            'model': model,
+            'role': agent_role(messages),
+            'temperature': temperature,
+            'prompt_tokens': len(normalize_prompt(messages).split()),
+            'completion_tokens': len(response.split()),
+            'latency_seconds': round(latency, 4),
+            'response': response,
+        }
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+            self.recorded += 1
+
+
+class ResponsePlayer:
+    """Serves recorded responses with synthetic latency."""
+
+    def __init__(self, path: str = None, latency: str = None, scale: float = None,
+                 strict: bool = None, seed: int = 0):
+        self.path = path or config.LLM_REPLAY_PATH
+        self.latency = latency or config.LLM_REPLAY_LATENCY
+        self.scale = config.LLM_REPLAY_SCALE if scale is None else scale
+        self.strict = config.LLM_REPLAY_STRICT if strict is None else strict
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._by_key = {}
+        self._by_model = {}
+        self._by_role = {}
+        # Sequence positions per pipeline run (its tracer), so concurrent runs don't share one
+        self._run_cursors = weakref.WeakKeyDictionary()
+        self._cursor = {}
+        self.exact_hits = 0
+        self.sequence_hits = 0
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._by_key.setdefault(entry['key'], entry)
+                    self._by_model.setdefault(entry['model'], []).append(entry)
+                    self._by_role.setdefault((entry['model'], entry.get('role', '')), []).append(entry)
+        if not self._by_model:
+            raise ValueError(f"No recorded responses in {self.path}")
+
+    def lookup(self, model: str, temperature, messages) -> dict:
+        """Exact prompt match, else the recordings for this agent role in order (cycling).
+
+        Each pipeline run (the active instrumentation tracer) keeps its own
+        position in the sequence, so a run gets the same responses however
+        concurrent runs interleave.
+        """
+        with self._lock:
+            entry = self._by_key.get(make_key(model, temperature, messages))
+            if entry:
+                self.exact_hits += 1
+                return entry
+            if self.strict:
+                raise ReplayMissError(f"No recorded response for {model} prompt")
+            role = agent_role(messages)
+            entries = (self._by_role.get((model, role)) or self._by_model.get(model)
+                       or next(iter(self._by_model.values())))
+            run = instrumentation.current_tracer()
+            cursor = self._cursor if run is None else self._run_cursors.setdefault(run, {})
+            index = cursor.get((model, role), 0)
+            cursor[(model, role)] = index + 1
+            self.sequence_hits += 1
+            return entries[index % len(entries)]
+
+    def delay(self, entry: dict) -> float:
+        """Synthetic latency in seconds for one replayed response."""
+        kind, *args = self.latency.split(':')
+        with self._lock:
+            if kind == 'recorded':
+                seconds = entry.get('latency_seconds', 0.0)
+            elif kind == 'const':
+                seconds = float(args[0])
+            elif kind == 'uniform':
+                seconds = self._rng.uniform(float(args[0]), float(args[1]))
+            elif kind == 'lognormal':
+                seconds = self._rng.lognormvariate(float(args[0]), float(args[1]))
+            else:
+                seconds = 0.0
+        return seconds * self.scale
+
+
+def _passthrough(kwargs, tools) -> bool:
+    return bool(tools or kwargs.get('response_model') or kwargs.get('available_functions'))
+
+def record_llm(llm, recorder: ResponseRecorder):
+    """Capture every plain text response the LLM returns."""
+    inner_call = llm.call
+    model = str(getattr(llm, 'model', ''))
+    temperature = getattr(llm, 'temperature', None)
+
+    def recording_call(messages, tools=None, *args, **kwargs):
+        start = time.perf_counter()
+        response = inner_call(messages, tools, *args, **kwargs)
+        if not _passthrough(kwargs, tools) and isinstance(response, str):
+            recorder.record(model, temperature, messages, response, time.perf_counter() - start)
+        return response
+
+    llm.call = recording_call
+    return llm
+
+def replay_llm(llm, player: ResponsePlayer):
+    """Answer every call from the recording; the network is never touched."""
+    model = str(getattr(llm, 'model', ''))
+    temperature = getattr(llm, 'temperature', None)
+
+    def replay_call(messages, tools=None, *args, **kwargs):
+        entry = player.lookup(model, temperature, messages)
+        time.sleep(player.delay(entry))
+        instrumentation.record_tokens(entry.get('prompt_tokens', 0), entry.get('completion_tokens', 0))
+        return entry['response']
+
+    llm.call = replay_call
+    return llm
+
+
+_recorder = None
+_player = None
+
+def install(llm):
+    """Apply the configured record/replay mode (LLM_REPLAY_MODE) to an LLM."""
+    global _recorder, _player
+    if config.LLM_REPLAY_MODE == 'record':
+        _recorder = _recorder or ResponseRecorder()
+        return record_llm(llm, _recorder)
+    if config.LLM_REPLAY_MODE == 'replay':
+        try:
+            _player = _player or ResponsePlayer()
+        except FileNotFoundError:
+            raise SystemExit(f"[LLM REPLAY] No recording at {config.LLM_REPLAY_PATH}. Record one against a live "
+                             f"model first, e.g. LLM_REPLAY_MODE=record python pipeline.py paper.pdf "
+                             f"(or point LLM_REPLAY_PATH / benchmark.py --replay-file at an existing recording)")
+        return replay_llm(llm, _player)
+    return llm
+
+def report():
+    """Print record/replay counters for this process."""
+    if _recorder:
+        print(f"[LLM REPLAY] recorded {_recorder.recorded} responses to {_recorder.path}")
+    if _player:
+        print(f"[LLM REPLAY] replayed {_player.exact_hits} exact, {_player.sequence_hits} by sequence "
+              f"(latency: {_player.latency} x{_player.scale})")
@@ -0,0 +1,444 @@
+"""Shared HTTP transport for Ollama chat requests.
+
+One transport per process holds keep-alive connections per host, limits
+in-flight requests per model with a semaphore, applies request timeouts with
+retry and exponential backoff, and tracks queue-depth metrics. Every pipeline in
+the process goes through it, so a single Ollama instance is never flooded.
+Requests are spread over the endpoints in an EndpointPool (see llm_endpoints),
+failing over to another host when one is unreachable.
+"""
+import http.client
+import json
+import queue
+import random
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+import config
+import instrumentation
+from llm_endpoints import EndpointPool
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TransportError(Exception):
+    """Raised when an LLM request cannot be completed."""
+
+
+class ConnectionPool:
+    """Keep-alive HTTP connections to a single host."""
+
+    def __init__(self, base_url: str, size: int, timeout: float):
+        parsed = urlparse(base_url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        self.https = parsed.scheme == 'https'
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def acquire(self, fresh: bool = False):
+        """Reuse an idle connection or open a new one; returns (conn, reused)."""
+        if not fresh:
+            try:
+                return self._idle.get_nowait(), True
+            except queue.Empty:
+                pass
+        cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout), False
+
+    def release(self, conn, reusable: bool = True):
+        """Return a connection to the pool, closing it if broken or surplus."""
+        if reusable:
+            try:
+                self._idle.put_nowait(conn)
+                return
+            except queue.Full:
+                pass
+        conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class _ModelGate:
+    """Concurrency semaphore plus queue metrics for one model."""
+
+    def __init__(self, limit: int, per_endpoint: int):
+        self.limit = limit
+        self.per_endpoint = per_endpoint
+        self.semaphore = threading.BoundedSemaphore(limit)
+        self.waiting = 0
+        self.in_flight = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+
+def parse_model_limits(spec: str) -> dict:
+    """Parse "model=limit,model=limit" into a dict."""
+    limits = {}
+    for item in (spec or '').split(','):
+        if '=' in item:
+            name, limit = item.rsplit('=', 1)
+            limits[name.strip()] = int(limit)
+    return limits
+
+
+class LLMTransport:
+    """Pooled, rate-limited client for the Ollama chat API."""
+
+    def __init__(self, base_url: str = None, max_concurrency: int = None, timeout: float = None,
+                 retries: int = None, backoff: float = None, pool_size: int = None,
+                 max_queue: int = None, model_limits: dict = None, endpoints: EndpointPool = None):
+        if endpoints is None and base_url:
+            from llm_endpoints import Endpoint
+            endpoints = EndpointPool([Endpoint(base_url)])
+        self.endpoints = endpoints or EndpointPool()
+        self.max_concurrency = max_concurrency or config.LLM_MAX_CONCURRENCY
+        self.timeout = timeout or config.LLM_TIMEOUT
+        self.retries = config.LLM_RETRIES if retries is None else retries
+        self.backoff = config.LLM_RETRY_BACKOFF if backoff is None else backoff
+        self.pool_size = pool_size or config.LLM_POOL_SIZE
+        self.max_queue = config.LLM_MAX_QUEUE if max_queue is None else max_queue
+        self.model_limits = parse_model_limits(config.LLM_MODEL_CONCURRENCY)
+        self.model_limits.update(model_limits or {})
+
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._gates = {}
+
+    def chat(self, model: str, messages: list, options: dict = None) -> dict:
+        """Send one non-streaming chat request and return the parsed response."""
+        payload = {'model': model, 'messages': messages, 'stream': False}
+        if options:
+            payload['options'] = options
+
+        gate = self._gate(model)
+        with self._lock:
+            if self.max_queue and gate.waiting >= self.max_queue:
+                gate.rejected += 1
+                raise TransportError(f"LLM queue for '{model}' is full ({gate.waiting} waiting)")
+            gate.waiting += 1
+            gate.max_waiting = max(gate.max_waiting, gate.waiting)
+
+        queued_at = time.perf_counter()
+        gate.semaphore.acquire()
+        with self._lock:
+            gate.waiting -= 1
+            gate.in_flight += 1
+            gate.wait_seconds += time.perf_counter() - queued_at
+
+        try:
+            data = self._post_with_retry('/api/chat', payload, gate)
+        except Exception:
+            with self._lock:
+                gate.failed += 1
+            raise
+        finally:
+            with self._lock:
+                gate.in_flight -= 1
+            gate.semaphore.release()
+
+        prompt_tokens = data.get('prompt_eval_count', 0) or 0
+        completion_tokens = data.get('eval_count', 0) or 0
+        with self._lock:
+            gate.completed += 1
+            gate.prompt_tokens += prompt_tokens
+            gate.completion_tokens += completion_tokens
+        instrumentation.record_tokens(prompt_tokens, completion_tokens)
+        return data
+
+    def metrics(self) -> dict:
+        """Per-model queue depth, throughput and token counters."""
+        with self._lock:
+            return {
+                model: {
+                    'limit': g.limit,
+                    'waiting': g.waiting,
+                    'in_flight': g.in_flight,
+                    'max_waiting': g.max_waiting,
+                    'completed': g.completed,
+                    'failed': g.failed,
+                    'retries': g.retries,
+                    'rejected': g.rejected,
+                    'avg_wait_seconds': g.wait_seconds / max(g.completed + g.failed, 1),
+                    'prompt_tokens': g.prompt_tokens,
+                    'completion_tokens': g.completion_tokens,
+                }
+                for model, g in self._gates.items()
+            }
+
+    def close(self):
+        """Close all idle pooled connections."""
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close()
+
+    def _gate(self, model: str) -> _ModelGate:
+        """Per-model gate; the in-flight limit applies per endpoint serving the model.
+
+        The semaphore bounds the total; EndpointPool.acquire enforces the
+        per-endpoint share, so a failover never overloads the remaining hosts.
+        """
+        with self._lock:
+            if model not in self._gates:
+                per_endpoint = self.model_limits.get(model, self.max_concurrency)
+                serving = max(len(self.endpoints.candidates(model)), 1)
+                self._gates[model] = _ModelGate(per_endpoint * serving, per_endpoint)
+            return self._gates[model]
+
+    def _pool(self, base_url: str) -> ConnectionPool:
+        with self._lock:
+            if base_url not in self._pools:
+                self._pools[base_url] = ConnectionPool(base_url, self.pool_size, self.timeout)
+            return self._pools[base_url]
+
+    def _post_with_retry(self, path: str, payload: dict, gate: _ModelGate) -> dict:
+        """Try endpoints in routing order; back off only once every endpoint has failed."""
+        last_error = None
+        tried = set()
+        attempt = 0
+        while attempt <= self.retries:
+            endpoint = self.endpoints.acquire(payload['model'], exclude=tried, limit=gate.per_endpoint)
+            if endpoint is None:
+                # Every endpoint failed this round: back off, then start over
+                attempt += 1
+                tried.clear()
+                if attempt > self.retries:
+                    break
+                with self._lock:
+                    gate.retries += 1
+                time.sleep(self.backoff * (2 ** (attempt - 1)) * (1 + random.random() * 0.25))
+                continue
+
+            try:
+                data = self._post(endpoint.url, path, payload)
+            except TransportError as e:
+                self.endpoints.release(endpoint, payload['model'], ok=False,
+                                       down=getattr(e, 'connection_error', False))
+                last_error = e
+                if not getattr(e, 'retryable', True):
+                    raise
+                tried.add(endpoint)
+                continue
+            self.endpoints.release(endpoint, payload['model'], ok=True)
+            return data
+        raise TransportError(f"LLM request failed after {self.retries + 1} attempts: {last_error}")
+
+    def _post(self, base_url: str, path: str, payload: dict) -> dict:
+        """POST JSON over a pooled keep-alive connection."""
+        pool = self._pool(base_url)
+        body = json.dumps(payload).encode('utf-8')
+        conn, reused = pool.acquire()
+        while True:
+            try:
+                conn.request('POST', path, body=body,
+                             headers={'Content-Type': 'application/json', 'Connection': 'keep-alive'})
+                response = conn.getresponse()
+                raw = response.read()
+                break
+            except (OSError, http.client.HTTPException) as e:
+                # A timeout on an open socket is a slow reply, not an unreachable host
+                read_timeout = isinstance(e, socket.timeout) and conn.sock is not None
+                pool.release(conn, reusable=False)
+                # An idle keep-alive socket may have been closed by the server: retry once fresh
+                if reused and not isinstance(e, socket.timeout):
+                    conn, reused = pool.acquire(fresh=True)
+                    continue
+                error = TransportError(f"{base_url}{path}: {e}")
+                error.connection_error = not read_timeout
+                raise error from e
+
+        pool.release(conn, reusable=not response.will_close)
+        if response.status != 200:
+            error = TransportError(f"{base_url}{path}: HTTP {response.status} {raw[:200]!r}")
+            error.retryable = response.status in RETRYABLE_STATUS
+            raise error
+        return json.loads(raw)
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+def get_transport() -> LLMTransport:
+    """Process-wide transport shared by every pipeline."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = LLMTransport()
+        return _transport
+
+def ollama_model_name(model: str) -> str:
+    """Strip LiteLLM-style provider prefixes ("ollama_chat/mistral" -> "mistral")."""
+    for prefix in ('ollama_chat/', 'ollama/'):
+        if model.startswith(prefix):
+            return model[len(prefix):]
+    return model
+
+def bind_llm(llm, transport: LLMTransport = None):
+    """Send an Ollama LLM's plain chat calls through the shared transport."""
+    transport = transport or get_transport()
+    inner_call = llm.call
+    model = ollama_model_name(str(getattr(llm, 'model', '')))
+
+    def transport_call(messages, tools=None, *args, **kwargs):
+        if tools or kwargs.get('response_model') or kwargs.get('available_functions'):
+            return inner_call(messages, tools, *args, **kwargs)
+
+        if isinstance(messages, str):
+            messages = [{'role': 'user', 'content': messages}]
+        options = {}
+        if getattr(llm, 'temperature', None) is not None:
+            options['temperature'] = llm.temperature
+        if getattr(llm, 'stop', None):
+            options['stop'] = list(llm.stop)
+
+        data = transport.chat(model, list(messages), options)
+        return (data.get('message') or {}).get('content', '')
+
+    llm.call = transport_call
+    return llm
+
+def report():
+    """Print transport queue metrics for this process."""
+    if _transport is None:
+        return
+    for model, m in _transport.metrics().items():
+        print(f"[LLM TRANSPORT] {model}: {m['completed']} ok, {m['failed']} failed, "
+              f"{m['retries']} retries, max queue {m['max_waiting']}, "
+              f"avg wait {m['avg_wait_seconds']:.2f}s")
+    endpoints = _transport.endpoints.status()
+    if len(endpoints) > 1:
+        for e in endpoints:
+            state = 'up' if e['healthy'] else 'DOWN'
+            print(f"[LLM TRANSPORT]   {e['url']} ({state}): {e['completed']} requests, {e['failures']} failures")
+
+
+class FakeOllamaServer:
+    """Minimal local stand-in for the Ollama API, for testing without a model."""
+
+    def __init__(self, port: int = 0, latency: float = 0.0, reply: str = "ok",
+                 models=('mistral',), fail_first: int = 0):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, data):
+                body = json.dumps(data).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                try:
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client timed out and hung up
+
+            def do_GET(self):
+                if self.path == '/api/tags':
+                    self._send(200, {'models': [{'name': m} for m in server.models]})
+                else:
+                    self._send(404, {'error': 'not found'})
+
+            def do_POST(self):
+                if server.down:
+                    # Simulate a dead host: drop kept-alive connections without replying
+                    self.close_connection = True
+                    return
+                payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                with server.lock:
+                    server.requests += 1
+                    server.active += 1
+                    server.max_active = max(server.max_active, server.active)
+                    fail = server.requests <= server.fail_first
+                try:
+                    time.sleep(server.latency)
+                    if fail:
+                        self._send(503, {'error': 'overloaded'})
+                    else:
+                        self._send(200, {
+                            'model': payload.get('model'),
+                            'message': {'role': 'assistant', 'content': server.reply},
+                            'prompt_eval_count': sum(len(str(m.get('content', '')).split())
+                                                     for m in payload.get('messages', [])),
+                            'eval_count': len(server.reply.split()),
+                            'done': True,
+                        })
+                finally:
+                    with server.lock:
+                        server.active -= 1
+
+        self.latency = latency
+        self.reply = reply
+        self.models = list(models)
+        self.fail_first = fail_first
+        self.down = False
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.active = 0
+        self.max_active = 0
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.down = True
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == '__main__':
+    # Test against fake servers: throughput with one vs three endpoints, then failover
+    from concurrent.futures import ThreadPoolExecutor
+    from llm_endpoints import Endpoint
+
+    def run_batch(transport, n=24):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=n) as executor:
+            list(executor.map(
+                lambda i: transport.chat('mistral', [{'role': 'user', 'content': f'prompt {i}'}]),
+                range(n)
+            ))
+        return time.perf_counter() - start
+
+    fakes = [FakeOllamaServer(latency=0.1).start() for _ in range(3)]
+
+    single = LLMTransport(max_concurrency=2, backoff=0.01,
+                          endpoints=EndpointPool([Endpoint(fakes[0].url)], health_interval=0))
+    print(f"1 endpoint:  24 requests in {run_batch(single):.2f}s")
+
+    multi = LLMTransport(max_concurrency=2, backoff=0.01,
+                         endpoints=EndpointPool([Endpoint(f.url) for f in fakes], health_interval=0))
+    print(f"3 endpoints: 24 requests in {run_batch(multi):.2f}s")
+    print(f"Per-server requests: {[f.requests for f in fakes]}")
+
+    fakes[1].stop()
+    print(f"1 endpoint down: 24 requests in {run_batch(multi):.2f}s")
+    print(json.dumps(multi.endpoints.status(), indent=2))
+
+    for fake in (fakes[0], fakes[2]):
+        fake.stop()
@@ -13,6 +13,11 @@ def main():
     console.print("[bold cyan]  Supports: PDF, TXT, arXiv URLs[/bold cyan]")
     console.print("[bold cyan]═══════════════════════════════════════════════════[/bold cyan]\n")
     
+    # Resume an interrupted run: python main.py --resume <run-id>
+    if len(sys.argv) > 2 and sys.argv[1] == '--resume':
+        ResearchPaperPipeline.resume(sys.argv[2]).run()
+        return
+    
     # Get paper path
     if len(sys.argv) > 1:
         paper_input = sys.argv[1]
@@ -0,0 +1,153 @@
+"""Numeric index of a paper for verifying numbers in slide claims.
+
+Every number in the source is parsed once into a canonical value: thousands
+separators removed, scale words/suffixes applied (1.2M = 1,200,000) and
+percentages also stored as fractions (85.2% = 0.852). Values go into a sorted
+array, so a claimed number is looked up with a binary search. A claim matches
+a source number that rounds to it at the claim's precision ("85%" matches
+85.2, "85.2%" does not match 85). A match also needs one of the claim's
+keywords near the number, and units that agree.
+"""
+import re
+import numpy as np
+import config
+from passage_index import tokenize
+
+_NUMBER_RE = re.compile(
+    r'(?<![\w.])(?P<number>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)'
+    r'(?:(?P<suffix>[kKMBT])(?![a-zA-Z])|\s*(?P<word>thousand|million|billion|trillion)\b)?'
+    r'\s*(?P<unit>%|percent\b|ms\b|hours?\b|days?\b|GB\b|MB\b|x\b|×)?'
+)
+_SCALES = {'k': 1e3, 'thousand': 1e3, 'm': 1e6, 'million': 1e6, 'b': 1e9, 'billion': 1e9,
+           't': 1e12, 'trillion': 1e12}
+_UNITS = {'percent': '%', 'hour': 'hours', 'day': 'days', '×': 'x'}
+
+
+def parse_numbers(text: str) -> list:
+    """[(value, unit, decimals, scale, start, end)] for every number; percentages keep their % value."""
+    numbers = []
+    for match in _NUMBER_RE.finditer(text):
+        digits = match.group('number').replace(',', '')
+        try:
+            value = float(digits)
+        except ValueError:
+            continue
+        scale_name = match.group('suffix') or match.group('word')
+        scale = _SCALES[scale_name.lower()] if scale_name else 1.0
+        value *= scale
+        decimals = len(digits.split('.')[1]) if '.' in digits and 'e' not in digits.lower() else 0
+        unit = match.group('unit')
+        unit = _UNITS.get(unit, unit) if unit else None
+        end = match.start() + len(match.group(0).rstrip())
+        numbers.append((value, unit, decimals, scale, match.start(), end))
+    return numbers
+
+
+def _keywords(text: str) -> set:
+    return {t for t in tokenize(text) if re.search('[a-z]', t)}  # Words and names like f1, cifar-10
+
+
+class NumericIndex:
+    """Sorted canonical values of every number in a source text."""
+
+    _last = None  # (source hash, index): verify calls outside a deck reuse the last index
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        values, positions, units = [], [], []
+        for value, unit, _, _, start, end in parse_numbers(text):
+            values.append(value)
+            positions.append((start, end))
+            units.append(unit)
+            if unit == '%':
+                # Also findable as a fraction: "85.2%" verifies "0.852"
+                values.append(value / 100)
+                positions.append((start, end))
+                units.append(None)
+        order = np.argsort(np.array(values, dtype=np.float64), kind='stable')
+        self.values = np.array(values, dtype=np.float64)[order]
+        self.positions = np.array(positions, dtype=np.int64).reshape(-1, 2)[order]
+        self.units = [units[i] for i in order]
+
+    @classmethod
+    def for_text(cls, text: str) -> 'NumericIndex':
+        key = hash(text)
+        if cls._last is None or cls._last[0] != key:
+            cls._last = (key, cls(text))
+        return cls._last[1]
+
+    def __len__(self):
+        return len(self.values)
+
+    def lookup(self, value: float, tolerance: float) -> np.ndarray:
+        """Indices of source numbers within tolerance of value (binary search)."""
+        lo = np.searchsorted(self.values, value - tolerance, side='left')
+        hi = np.searchsorted(self.values, value + tolerance, side='right')
+        return np.arange(lo, hi)
+
+    def context(self, i: int) -> str:
+        start, end = self.positions[i]
+        window = config.NUMERIC_CONTEXT_CHARS
+        return self.lower[max(start - window, 0):end + window]
+
+    def match_number(self, value: float, unit: str, decimals: int, scale: float, keywords: set) -> tuple:
+        """Best source occurrence of one claimed number: (found, context matched, position)."""
+        # Half a unit in the claim's last digit ("1.2M" is 1.2 +- 0.05 million)
+        tolerance = 0.5 * 10.0 ** -decimals * scale + abs(value) * 1e-9
+        queries = [(value, tolerance)]
+        if unit == '%':
+            queries.append((value / 100, tolerance / 100))
+        found = None
+        for query, tol in queries:
+            for i in self.lookup(query, tol):
+                source_unit = self.units[i]
+                if unit and source_unit and unit != source_unit:
+                    continue  # "3.5 hours" is not "3.5 days"; unitless source numbers (tables) still match
+                if not keywords or any(k in self.context(i) for k in keywords):
+                    return True, True, tuple(self.positions[i])
+                found = found or tuple(self.positions[i])
+        return found is not None, False, found
+
+    def verify(self, claim_text: str, context: str = None) -> tuple:
+        """(verified, confidence, evidence positions) for every number in a claim.
+
+        context is the full bullet; its keywords must appear near the source
+        number. Returns verified=False if a claimed number is not in the paper.
+        """
+        numbers = parse_numbers(claim_text)
+        if not numbers:
+            return False, 0.0, []
+        keywords = _keywords(re.sub(r'\b\d[\d.,]*', ' ', context or claim_text))  # Keeps "F1", drops "85.2"
+        evidence, in_context = [], True
+        for value, unit, decimals, scale, _, _ in numbers:
+            found, with_context, position = self.match_number(value, unit, decimals, scale, keywords)
+            if not found:
+                return False, 0.0, evidence
+            in_context = in_context and with_context
+            evidence.append(position)
+        return True, (0.9 if in_context else 0.5), evidence
+
+
+if __name__ == '__main__':
+    # Test
+    source = """Our model reaches 85.2% top-1 accuracy on ImageNet with 1,200,000 training images.
+    The base model has 65 million parameters and trains in 3.5 days on 8 GPUs.
+    Dropout 0.1 is used. Table 2 lists F1 of 0.852 on SQuAD."""
+    index = NumericIndex(source)
+    print(f"{len(index)} indexed values")
+    claims = [
+        ('85.2%', 'Achieves 85.2% accuracy on ImageNet'),
+        ('85%', 'Achieves 85% accuracy on ImageNet'),
+        ('85.7%', 'Achieves 85.7% accuracy on ImageNet'),
+        ('1.2M', 'Trained on 1.2M images'),
+        ('65M', 'Has 65M parameters'),
+        ('85.2%', 'F1 of 85.2% on SQuAD'),
+        ('3.5 days', 'Training takes 3.5 days'),
+        ('3.5 hours', 'Training takes 3.5 hours'),
+        ('0.1', 'Uses 0.1 learning rate warmup'),
+    ]
+    for claim, bullet in claims:
+        verified, confidence, evidence = index.verify(claim, bullet)
+        snippet = source[evidence[0][0]:evidence[0][1]] if evidence else '-'
+        print(f"  {bullet:<38} {claim:<10} -> {verified} ({confidence}) evidence: {snippet!r}")
@@ -0,0 +1,96 @@
+"""OCR for scanned (image-only) PDF pages.
+
+Only pages without a usable text layer are OCR'd. Each is rendered with
+PyMuPDF at OCR_DPI and passed to pytesseract in a worker process. Results
+are cached by page fingerprint (content stream + raw image bytes), so a
+rerun or a second copy of the same scan is never OCR'd again. Mixed
+documents keep their native text everywhere else.
+"""
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import config
+from checkpoint import atomic_write_json
+from pdf_document import get_document
+
+
+def textless_pages(document, page_texts: list) -> list:
+    """Pages (0-based) whose extracted text is too short but that carry images."""
+    return [n for n, text in enumerate(page_texts)
+            if len(text.strip()) < config.OCR_MIN_CHARS and document.page_images(n)]
+
+
+def _cache_path(page_fingerprint: str) -> str:
+    key = f"{page_fingerprint}_{config.OCR_DPI}_{config.OCR_LANG}"
+    return os.path.join(config.OCR_CACHE_DIR, key[:2], key + '.json')
+
+
+def _ocr_page(pdf_path: str, page_num: int, dpi: int, lang: str) -> str:
+    """Worker: render one page and OCR it."""
+    import pytesseract
+    from PIL import Image
+    with get_document(pdf_path) as document:
+        pixmap = document.render(page_num, zoom=dpi / 72)
+    image = Image.open(io.BytesIO(pixmap.tobytes('png'))).convert('L')
+    return pytesseract.image_to_string(image, lang=lang)
+
+
+def tesseract_available() -> bool:
+    try:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def ocr_pages(pdf_path: str, pages: list, workers: int = None) -> dict:
+    """OCR text for the given pages (0-based) as {page: text}; cached pages are not re-rendered."""
+    if not pages:
+        return {}
+    results, missing = {}, {}
+    with get_document(pdf_path) as document:
+        for page_num in pages:
+            path = _cache_path(document.page_fingerprint(page_num))
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    results[page_num] = json.load(f)['text']
+            else:
+                missing.setdefault(path, []).append(page_num)  # Identical pages are OCR'd once
+    if not missing:
+        return results
+    if not tesseract_available():
+        print(f"⚠️  {len(missing)} page(s) have no text layer, but pytesseract/tesseract is not installed - skipping OCR")
+        return results
+
+    print(f"🔍 OCR: {len(missing)} scanned page(s) at {config.OCR_DPI} DPI")
+    page_nums = [same[0] for same in missing.values()]
+    workers = min(workers or config.OCR_WORKERS, len(missing))
+    args = ([pdf_path] * len(missing), page_nums, [config.OCR_DPI] * len(missing), [config.OCR_LANG] * len(missing))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            texts = list(pool.map(_ocr_page, *args))
+    else:
+        texts = [_ocr_page(*a) for a in zip(*args)]
+    for (path, same), text in zip(missing.items(), texts):
+        atomic_write_json(path, {'page': same[0], 'text': text})
+        results.update(dict.fromkeys(same, text))
+    return results
+
+
+if __name__ == '__main__':
+    # Test
+    import sys
+    import time
+    if len(sys.argv) < 2:
+        print("Usage: python ocr.py <scanned.pdf>")
+        sys.exit(1)
+    with get_document(sys.argv[1]) as document:
+        pages = textless_pages(document, [document.page_text(n) for n in range(document.page_count)])
+        print(f"{len(pages)} of {document.page_count} pages need OCR: {pages[:20]}")
+    start = time.perf_counter()
+    texts = ocr_pages(sys.argv[1], pages)
+    print(f"OCR'd {len(texts)} pages in {time.perf_counter() - start:.2f}s")
+    for page_num in sorted(texts)[:2]:
+        print(f"\n--- page {page_num + 1} ---\n{texts[page_num][:500]}")
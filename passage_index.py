@@ -0,0 +1,146 @@
+"""Passage index shared across many papers (BM25, optionally blended with embeddings).
+
+Papers are split into overlapping word windows tagged with their paper and
+section. Queries score only the postings of their own terms, so retrieval
+cost grows with the matching passages rather than with the whole corpus.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+import numpy as np
+import config
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+(?:[.-][a-z0-9]+)*')
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or that the their this
+to was were which with we our these those using used use can also than such not but been
+""".split())
+
+
+def tokenize(text: str) -> list:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+
+class Passage:
+    """One retrievable window of a paper."""
+
+    __slots__ = ('doc_id', 'title', 'section', 'text', 'length')
+
+    def __init__(self, doc_id: str, title: str, section: str, text: str, length: int):
+        self.doc_id = doc_id
+        self.title = title
+        self.section = section
+        self.text = text
+        self.length = length
+
+    def to_dict(self) -> dict:
+        return {'doc_id': self.doc_id, 'title': self.title, 'section': self.section, 'text': self.text}
+
+
+class PassageIndex:
+    """BM25 inverted index over passages from many documents."""
+
+    def __init__(self, passage_words: int = None, overlap: int = None, k1: float = 1.5, b: float = 0.75,
+                 dense: bool = None):
+        self.passage_words = passage_words or config.SURVEY_PASSAGE_WORDS
+        self.overlap = config.SURVEY_PASSAGE_OVERLAP if overlap is None else overlap
+        self.k1 = k1
+        self.b = b
+        self.dense = config.SURVEY_DENSE_RETRIEVAL if dense is None else dense
+        self.passages = []
+        self._postings = defaultdict(list)  # term -> [(passage id, term frequency)]
+        self._arrays = None
+        self._vectors = None
+
+    def add_document(self, doc_id: str, title: str, sections: dict) -> int:
+        """Split a paper's sections into passages and index them; returns the passage count."""
+        added = 0
+        step = max(self.passage_words - self.overlap, 1)
+        for section, content in sections.items():
+            if section == 'references':
+                continue
+            words = content.split()
+            for start in range(0, max(len(words) - self.overlap, 1), step):
+                text = ' '.join(words[start:start + self.passage_words])
+                terms = Counter(tokenize(text))
+                if not terms:
+                    continue
+                passage_id = len(self.passages)
+                self.passages.append(Passage(doc_id, title, section, text, sum(terms.values())))
+                for term, tf in terms.items():
+                    self._postings[term].append((passage_id, tf))
+                added += 1
+        self._arrays = None
+        self._vectors = None
+        return added
+
+    def _build(self):
+        """Freeze postings into numpy arrays (and embed passages if dense retrieval is on)."""
+        lengths = np.array([p.length for p in self.passages], dtype=np.float32)
+        norm = self.k1 * (1 - self.b + self.b * lengths / max(lengths.mean(), 1.0))
+        n = len(self.passages)
+        self._arrays = {}
+        for term, postings in self._postings.items():
+            ids = np.fromiter((p for p, _ in postings), dtype=np.int32, count=len(postings))
+            tf = np.fromiter((t for _, t in postings), dtype=np.float32, count=len(postings))
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            # Precomputed per-posting BM25 contribution
+            self._arrays[term] = (ids, idf * tf * (self.k1 + 1) / (tf + norm[ids]))
+        if self.dense:
+            import embeddings
+            self._vectors = embeddings.encode([p.text for p in self.passages])
+
+    def search(self, query: str, k: int = 8, per_doc: int = 2) -> list:
+        """Top-k passages for a query, at most per_doc from any one paper."""
+        if not self.passages:
+            return []
+        if self._arrays is None:
+            self._build()
+        scores = np.zeros(len(self.passages), dtype=np.float32)
+        for term in set(tokenize(query)):
+            if term in self._arrays:
+                ids, contribution = self._arrays[term]
+                scores[ids] += contribution
+        if self._vectors is not None:
+            import embeddings
+            query_vector = embeddings.encode([query])
+            if query_vector is not None:
+                # Blend max-normalised BM25 with cosine similarity
+                top = scores.max()
+                scores = 0.5 * (scores / top if top > 0 else scores) + 0.5 * (self._vectors @ query_vector[0])
+
+        results = []
+        taken = Counter()
+        for passage_id in np.argsort(-scores):
+            if scores[passage_id] <= 0 or len(results) >= k:
+                break
+            passage = self.passages[passage_id]
+            if taken[passage.doc_id] >= per_doc:
+                continue
+            taken[passage.doc_id] += 1
+            results.append(dict(passage.to_dict(), score=round(float(scores[passage_id]), 4)))
+        return results
+
+    def stats(self) -> dict:
+        return {
+            'documents': len({p.doc_id for p in self.passages}),
+            'passages': len(self.passages),
+            'terms': len(self._postings),
+        }
+
+
+if __name__ == '__main__':
+    # Test
+    index = PassageIndex(passage_words=40, overlap=10, dense=False)
+    index.add_document('P1', 'Attention Is All You Need', {
+        'methods': "The Transformer relies entirely on self-attention to compute representations of its input "
+                   "and output without recurrence. Multi-head attention lets the model attend to information "
+                   "from different representation subspaces.",
+        'results': "On WMT 2014 English-German the big model achieves 28.4 BLEU, outperforming previous "
+                   "ensembles by more than 2 BLEU."})
+    index.add_document('P2', 'BERT', {
+        'methods': "BERT pre-trains deep bidirectional representations with a masked language model objective.",
+        'results': "BERT obtains 80.5% on GLUE, a 7.7 point absolute improvement."})
+    print(index.stats())
+    for hit in index.search("quantitative results BLEU GLUE improvement", k=3):
+        print(f"  [{hit['doc_id']}] {hit['section']} ({hit['score']}): {hit['text'][:60]}...")
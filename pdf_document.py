@@ -0,0 +1,189 @@
+"""Shared, memory-mapped PDF handles.
+
+Every stage that reads a PDF (text ingestion, image extraction, page
+rendering) asks get_document() for the same handle. The file is mmapped once
+and parsed once by PyMuPDF straight from the mapping; pages are only loaded
+when a stage asks for them, and per-page text is memoised. pdfplumber/PyPDF2
+fallbacks read from a second mapping of the same file instead of re-reading it.
+
+Handles are reference-counted: use them as `with get_document(path) as doc:`.
+A handle evicted from the cache (or closed with close_document) while another
+thread still holds it is closed when that thread lets go.
+"""
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+import fitz  # PyMuPDF
+import config
+
+
+class PDFDocument:
+    """One parsed PDF shared by all pipeline stages.
+
+    PyMuPDF documents are not thread-safe, so every access goes through a lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self.doc = fitz.open(stream=self._view, filetype='pdf')
+        self._lock = threading.RLock()
+        self._text = {}
+        self._blocks = {}
+        self._words = {}
+        self.closed = False
+        self.users = 0  # Holders that have not exited their `with` block (guarded by _registry_lock)
+        self.retired = False  # Out of the cache; closed when the last holder is done
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        _release(self)
+
+    def __len__(self):
+        return self.page_count
+
+    @property
+    def page_count(self) -> int:
+        return self.doc.page_count
+
+    def page(self, page_num: int):
+        """Load one page on demand (0-based)."""
+        with self._lock:
+            return self.doc.load_page(page_num)
+
+    def page_text(self, page_num: int) -> str:
+        """Plain text of one page, extracted once."""
+        with self._lock:
+            if page_num not in self._text:
+                self._text[page_num] = self.doc.load_page(page_num).get_text()
+            return self._text[page_num]
+
+    def page_blocks(self, page_num: int) -> list:
+        """Text blocks (x0, y0, x1, y1, text, block_no, block_type) of one page, extracted once."""
+        with self._lock:
+            if page_num not in self._blocks:
+                self._blocks[page_num] = self.doc.load_page(page_num).get_text('blocks')
+            return self._blocks[page_num]
+
+    def page_words(self, page_num: int) -> list:
+        """Words (x0, y0, x1, y1, text, block_no, line_no, word_no) of one page, extracted once."""
+        with self._lock:
+            if page_num not in self._words:
+                self._words[page_num] = self.doc.load_page(page_num).get_text('words')
+            return self._words[page_num]
+    
+    def text(self) -> str:
+        return "".join(self.page_text(n) + "\n\n" for n in range(self.page_count))
+
+    def page_images(self, page_num: int) -> list:
+        """Image entries (xref first) referenced by one page."""
+        with self._lock:
+            return self.doc.load_page(page_num).get_images()
+
+    def image_bbox(self, page_num: int, xref: int):
+        """Where an image is drawn on a page (x0, y0, x1, y1), or None."""
+        with self._lock:
+            rects = self.doc.load_page(page_num).get_image_rects(xref)
+            return tuple(rects[0]) if rects else None
+
+    def extract_image(self, xref: int) -> dict:
+        with self._lock:
+            return self.doc.extract_image(xref)
+
+    def render(self, page_num: int, zoom: float = 2.0):
+        """Rasterise one page to a Pixmap."""
+        with self._lock:
+            return self.doc.load_page(page_num).get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+
+    def page_fingerprint(self, page_num: int) -> str:
+        """sha256 of a page's content stream and its raw image streams (no decoding)."""
+        with self._lock:
+            page = self.doc.load_page(page_num)
+            digest = hashlib.sha256(page.read_contents())
+            for image in page.get_images():
+                digest.update(self.doc.xref_stream_raw(image[0]) or b'')
+            return digest.hexdigest()
+    
+    def open_stream(self):
+        """Independent read-only mapping of the file for pdfplumber/PyPDF2 (shares the page cache)."""
+        return mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.doc.close()
+            self._view.release()
+            self._map.close()
+            self._file.close()
+
+
+_documents = OrderedDict()
+_registry_lock = threading.Lock()
+
+def get_document(path: str) -> PDFDocument:
+    """Shared handle for a PDF, reopened if the file changed on disk.
+
+    The caller holds a reference until it exits the handle's `with` block.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _registry_lock:
+        document = _documents.get(key)
+        if document is not None and not document.closed:
+            _documents.move_to_end(key)
+        else:
+            document = PDFDocument(path)
+            _documents[key] = document
+            # Keep a handful of recently used PDFs open (survey runs touch many)
+            while len(_documents) > config.PDF_DOCUMENT_CACHE:
+                _retire(_documents.popitem(last=False)[1])
+        document.users += 1
+        return document
+
+def _retire(document: PDFDocument):
+    """Drop a handle from use: close it now if nobody holds it, else on the last release."""
+    document.retired = True
+    if document.users == 0:
+        document.close()
+
+def _release(document: PDFDocument):
+    with _registry_lock:
+        document.users -= 1
+        if document.retired and document.users == 0:
+            document.close()
+
+def close_document(path: str):
+    """Close every cached handle for a path (once their holders are done)."""
+    target = os.path.abspath(path)
+    with _registry_lock:
+        for key in [k for k in _documents if k[0] == target]:
+            _retire(_documents.pop(key))
+
+
+if __name__ == '__main__':
+    # Test
+    import sys
+    import time
+    if len(sys.argv) < 2:
+        print("Usage: python pdf_document.py <paper.pdf>")
+        sys.exit(1)
+    start = time.perf_counter()
+    with get_document(sys.argv[1]) as document:
+        print(f"Opened {document.page_count} pages in {time.perf_counter() - start:.3f}s")
+        start = time.perf_counter()
+        chars = len(document.text())
+        images = sum(len(document.page_images(n)) for n in range(document.page_count))
+        print(f"Text: {chars} chars, images: {images} ({time.perf_counter() - start:.3f}s)")
+        with get_document(sys.argv[1]) as again:
+            print(f"Same handle on second request: {again is document}")
+        close_document(sys.argv[1])
+        print(f"Still open while held: {not document.closed}")
+    print(f"Closed after release: {document.closed}")
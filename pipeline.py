@@ -1,7 +1,7 @@
 """Main pipeline orchestration for research paper to slide deck generation."""
 from crewai import Crew, Process
 from utils import (
-    extract_text_from_pdf, clean_text, identify_sections,
+    extract_pages_from_pdf, clean_text, identify_sections,
     extract_figures_and_tables, save_output
 )
 from tasks import (
@@ -16,149 +16,524 @@ from agents import (
     compilation_agent
 )
 from arxiv_downloader import download_arxiv_paper, get_arxiv_metadata
-from pptx_generator import generate_pptx_from_blueprint
+from arxiv_source import (
+    download_arxiv_source, parse_source_archive, is_source_archive, SourceUnavailableError
+)
+from pptx_generator import generate_pptx_from_deck, parse_blueprint, plan_deck
+from slide_renderers import render_previews
+from verification_report import build_report, page_starts, write_report
 import config
+import llm_cache
+import llm_replay
+import llm_transport
+from instrumentation import Tracer
+from caption_index import CaptionIndex
+from table_extractor import extract_tables, strip_table_text, to_column_table
+from checkpoint import RunCheckpoint, ArtifactStore, stage_fingerprint, file_fingerprint
 import os
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 console = Console()
 
+# stage: (upstream stages, run parameters it depends on). Agent tasks run
+# sequentially and see every earlier output, so each depends on the one before.
+STAGE_DEPENDENCIES = {
+    'ingestion': (['paper'], ['text_extraction']),
+    'sections': (['ingestion'], []),
+    'tables': (['sections'], []),
+    'task:summarization': (['sections', 'tables'], ['llm']),
+    'task:structuring': (['task:summarization'], ['llm', 'style', 'target_slides']),
+    'task:visualization': (['task:structuring', 'ingestion'], ['llm']),
+    'task:compression': (['task:visualization'], ['llm', 'llm_compression']),
+    'task:verification': (['task:compression', 'ingestion'], ['llm', 'llm_verification']),
+    'task:compilation': (['task:verification', 'tables'], ['llm', 'style', 'target_slides']),
+    'images': (['paper', 'sections'], ['image_dir']),  # Linked to the figure captions, written to image_dir
+}
+
+def llm_identity() -> list:
+    """Models behind the agents, as a stage-fingerprint parameter."""
+    # Replayed responses must never be reused by live runs (and vice versa)
+    return [config.LLM_PROVIDER, config.PRIMARY_MODEL, config.SECONDARY_MODEL,
+            config.LLM_REPLAY_MODE == 'replay']
+
 class ResearchPaperPipeline:
     """Main pipeline for converting research papers to slide decks."""
     
     def __init__(self, paper_path: str, target_slides: int = None, style: str = "concise", 
-                 is_arxiv: bool = False):
+                 is_arxiv: bool = False, show_progress: bool = True, output_dir: str = None,
+                 checkpoint: RunCheckpoint = None, on_previews=None):
         self.paper_path = paper_path
         self.target_slides = target_slides
         self.style = style
         self.is_arxiv = is_arxiv
+        self.show_progress = show_progress  # Disable when several pipelines share a console
+        self.output_dir = output_dir or config.OUTPUT_DIR
+        # Jobs with their own output directory also keep their extracted images apart
+        self.image_dir = os.path.join(output_dir, 'extracted_images') if output_dir else 'extracted_images'
+        self.pptx_path = None
+        self.preview_paths = {}  # OUTPUT_FORMATS other than pptx: {format: path}
+        self.on_previews = on_previews  # Called with preview_paths as soon as they are written
         self.paper_text = None
+        self.page_starts = None  # Offset of each PDF page in paper_text
         self.sections = None
         self.figures = None
+        self.tables = []
+        self.verification = None  # Evidence report of the last run (verification_report)
         self.paper_title = "Research Paper"
         self.paper_metadata = None
+        self.source_path = paper_path if is_source_archive(paper_path) else None  # LaTeX e-print
+        self._source = None
+        self.tracer = Tracer('pipeline', trace_memory=config.TRACE_MEMORY)
+        if checkpoint is None and config.CHECKPOINTS_ENABLED:  # checkpoint=False disables
+            checkpoint = RunCheckpoint(params={
+                'paper_path': paper_path,
+                'target_slides': target_slides,
+                'style': style,
+                'is_arxiv': is_arxiv,
+                'output_dir': output_dir,
+            })
+        self.checkpoint = checkpoint or None
+        self.artifacts = ArtifactStore() if config.INCREMENTAL_ENABLED else None
+        self._fingerprints = {}
+    
+    @classmethod
+    def resume(cls, run_id: str, show_progress: bool = True):
+        """Rebuild an interrupted run from its checkpoints; completed stages are skipped."""
+        checkpoint = RunCheckpoint.open(run_id)
+        params = checkpoint.params
+        console.print(f"[cyan]Resuming run {run_id} (completed: {', '.join(checkpoint.manifest['completed']) or 'nothing'})[/cyan]", emoji=False)
+        return cls(
+            paper_path=params['paper_path'],
+            target_slides=params.get('target_slides'),
+            style=params.get('style', 'concise'),
+            is_arxiv=params.get('is_arxiv', False),
+            show_progress=show_progress,
+            output_dir=params.get('output_dir'),
+            checkpoint=checkpoint
+        )
         
     def run(self):
         """Execute the full pipeline."""
         console.print("\n[bold cyan]🚀 Starting Research Paper → Slide Deck Pipeline[/bold cyan]\n")
+        if self.checkpoint:
+            console.print(f"[dim]Run ID: {self.checkpoint.run_id} (checkpoints in {self.checkpoint.run_dir})[/dim]\n")
+        
+        self.tracer.activate()
+        try:
+            result = self._run_stages()
+        except BaseException as e:
+            if self.checkpoint:
+                self.checkpoint.set_status('failed', str(e))
+                console.print(f"[yellow]Resume with: python main.py --resume {self.checkpoint.run_id}[/yellow]")
+            raise
+        finally:
+            self.tracer.deactivate()
+            self._save_run_report()
         
+        if self.checkpoint:
+            self.checkpoint.set_status('done')
+        console.print("[bold green]✨ Pipeline completed successfully![/bold green]\n")
+        return result
+    
+    def _checkpointed(self, stage: str, compute):
+        """Reuse a stage's output if its inputs are unchanged, otherwise compute and store it."""
+        data = self._restore(stage)
+        if data is None:
+            data = compute()
+            self._store(stage, data)
+        return data
+    
+    def _restore(self, stage: str):
+        """Output of a stage from this run's checkpoint or an earlier run with the same inputs."""
+        fingerprint = self._fingerprint(stage)
+        if self.checkpoint and self.checkpoint.has(stage, fingerprint):
+            console.print(f"[dim]↺ {stage}: restored from checkpoint[/dim]", emoji=False)
+            return self.checkpoint.load(stage)
+        data = self.artifacts.get(fingerprint) if self.artifacts else None
+        if data is not None:
+            console.print(f"[dim]↺ {stage}: inputs unchanged, reusing earlier output[/dim]", emoji=False)
+            if self.checkpoint:
+                self.checkpoint.save(stage, data, fingerprint)
+        return data
+    
+    def _store(self, stage: str, data):
+        fingerprint = self._fingerprint(stage)
+        if self.checkpoint:
+            self.checkpoint.save(stage, data, fingerprint)
+        if self.artifacts:
+            self.artifacts.put(fingerprint, stage, data)
+    
+    def _fingerprint(self, stage: str) -> str:
+        """Fingerprint of a stage's inputs (see STAGE_DEPENDENCIES)."""
+        if stage not in self._fingerprints:
+            if stage == 'paper':
+                fingerprint = file_fingerprint(self.paper_path)
+                if self.source_path and self.source_path != self.paper_path:
+                    fingerprint = stage_fingerprint(stage, [fingerprint, file_fingerprint(self.source_path)], {})
+            elif stage == 'download':
+                fingerprint = stage_fingerprint(stage, [], {'arxiv_id': self.paper_path})
+            else:
+                upstream, params = STAGE_DEPENDENCIES[stage]
+                fingerprint = stage_fingerprint(stage, [self._fingerprint(u) for u in upstream],
+                                                {name: self._stage_param(name) for name in params})
+            self._fingerprints[stage] = fingerprint
+        return self._fingerprints[stage]
+    
+    def _stage_param(self, name: str):
+        if name == 'text_extraction':
+            return [config.PDF_TEXT_BACKEND, config.PDF_TEXT_LAYOUT, config.OCR_ENABLED, config.OCR_LANG]
+        if name == 'image_dir':
+            return os.path.abspath(self.image_dir)  # Image paths in the output point into it
+        if name in ('llm_compression', 'llm_verification'):
+            return getattr(config, f"USE_{name.upper()}")
+        return llm_identity() if name == 'llm' else getattr(self, name)
+    
+    def _run_stages(self):
+        """Run every pipeline stage, each inside an instrumentation span."""
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
-            console=console
+            console=console,
+            disable=not self.show_progress
         ) as progress:
             
             # Step 0: Download from arXiv if needed
             if self.is_arxiv:
                 task0 = progress.add_task("📥 Downloading from arXiv...", total=None)
-                arxiv_id = self.paper_path  # Save original arXiv ID
-                self.paper_path = download_arxiv_paper(arxiv_id)
-                self.paper_metadata = get_arxiv_metadata(arxiv_id)  # Use arXiv ID, not file path
-                self.paper_title = self.paper_metadata['title']
+                self._download()
                 progress.update(task0, completed=True)
                 console.print(f"[green]✓[/green] Downloaded: {self.paper_title}\n")
             
             # Step 1: Ingestion
             task1 = progress.add_task("📄 Ingesting paper...", total=None)
-            self.paper_text = self._ingest_paper()
+            self._ingest()
             progress.update(task1, completed=True)
             console.print("[green]✓[/green] Paper ingested successfully\n")
             
             # Step 2: Section identification
             task2 = progress.add_task("📑 Identifying sections...", total=None)
-            self.sections = identify_sections(self.paper_text)
-            self.figures = extract_figures_and_tables(self.paper_text)
+            self._identify_sections()
+            self._identify_tables()
             progress.update(task2, completed=True)
-            console.print(f"[green]✓[/green] Found {len(self.sections)} sections and {len(self.figures)} figures/tables\n")
+            console.print(f"[green]✓[/green] Found {len(self.sections)} sections and {len(self.figures)} figures/tables"
+                          f" ({len(self.tables)} tables extracted)\n")
             
             # Step 3: Run agent crew
             task3 = progress.add_task("🤖 Running agent crew...", total=None)
-            result = self._run_agent_crew()
+            with self.tracer.span('agent_crew'):
+                result = self._run_agent_crew()
             progress.update(task3, completed=True)
             console.print("[green]✓[/green] Agent processing complete\n")
             
             # Step 4: Save outputs
             task4 = progress.add_task("💾 Saving outputs...", total=None)
-            self._save_results(result)
+            with self.tracer.span('save_results'):
+                self._save_results(result)
+            with self.tracer.span('verification_report'):
+                self.verification = self._verify_slides(result)
             progress.update(task4, completed=True)
             console.print("[green]✓[/green] Results saved to output directory\n")
             
             # Step 5: Generate PowerPoint
             task5 = progress.add_task("📊 Generating PowerPoint...", total=None)
-            pptx_path = self._generate_pptx(result)
+            with self.tracer.span('pptx'):
+                pptx_path = self._generate_pptx(result)
+                self.pptx_path = pptx_path
             progress.update(task5, completed=True)
-            console.print(f"[green]✓[/green] PowerPoint generated: {pptx_path}\n")
+            if pptx_path:
+                console.print(f"[green]✓[/green] PowerPoint generated: {pptx_path}\n")
+            else:
+                console.print(f"[green]✓[/green] Slides written: {', '.join(self.preview_paths.values())}\n")
         
-        console.print("[bold green]✨ Pipeline completed successfully![/bold green]\n")
         return result
     
-    def _ingest_paper(self):
-        """Ingest and clean paper text."""
+    def prepare(self):
+        """Download (if arXiv), ingest and split the paper without running the agents."""
+        if self.is_arxiv:
+            self._download()
+        self._ingest()
+        self._identify_sections()
+        self._identify_tables()
+        return self
+    
+    def summarize(self) -> str:
+        """Run only the summarization task (shares its stored output with full runs)."""
+        data = self._restore('task:summarization')
+        if data is None:
+            agent = summarization_agent.copy()
+            task = create_summarization_task(self.sections)
+            task.agent = agent
+            with self.tracer.span('task:summarization', category='agent_task'):
+                result = Crew(agents=[agent], tasks=[task], process=Process.sequential, verbose=False).kickoff()
+            data = {'raw': result.raw}
+            self._store('task:summarization', data)
+        return data['raw']
+    
+    def _download(self):
+        with self.tracer.span('download'):
+            arxiv_id = self.paper_path  # Save original arXiv ID
+            download = self._checkpointed('download', lambda: {
+                'paper_path': download_arxiv_paper(arxiv_id),
+                'source_path': self._download_source(arxiv_id),
+                'metadata': get_arxiv_metadata(arxiv_id)  # Use arXiv ID, not file path
+            })
+            self.paper_path = download['paper_path']
+            self.source_path = download.get('source_path')
+            self.paper_metadata = download['metadata']
+            self.paper_title = self.paper_metadata['title']
+    
+    def _download_source(self, arxiv_id: str):
+        """Fetch the LaTeX e-print alongside the PDF (None if unavailable)."""
+        if not config.ARXIV_USE_SOURCE:
+            return None
+        try:
+            return download_arxiv_source(arxiv_id.split("/")[-1].replace(".pdf", "")
+                                         if "arxiv.org" in arxiv_id else arxiv_id)
+        except Exception as e:
+            console.print(f"[yellow]No LaTeX source ({e}), using the PDF[/yellow]")
+            return None
+    
+    def _latex_source(self):
+        """Parsed LaTeX source, or None to fall back to the PDF."""
+        if self._source is None and self.source_path:
+            try:
+                self._source = parse_source_archive(self.source_path, image_dir=self.image_dir)
+                console.print(f"[green]✓[/green] Using LaTeX source: {len(self._source['sections'])} sections, "
+                              f"{len(self._source['figures'])} figures, {len(self._source['tables'])} tables")
+            except SourceUnavailableError as e:
+                if self.paper_path == self.source_path:
+                    raise
+                console.print(f"[yellow]{e} - using the PDF[/yellow]")
+                self.source_path = None
+        return self._source
+    
+    def _ingest(self):
+        with self.tracer.span('ingestion') as span:
+            ingested = self._checkpointed('ingestion', self._ingest_paper)
+            if isinstance(ingested, str):  # Stored before page offsets were kept with the text
+                ingested = self._ingest_paper()
+                self._store('ingestion', ingested)
+            self.paper_text, self.page_starts = ingested['text'], ingested['page_starts']
+            span.attrs['chars'] = len(self.paper_text)
+    
+    def _identify_sections(self):
+        with self.tracer.span('sections') as span:
+            found = self._checkpointed('sections', self._find_sections)
+            self.sections = found['sections']
+            self.figures = found['figures']
+            if found.get('title') and self.paper_title == "Research Paper":
+                self.paper_title = found['title']
+            span.attrs.update(sections=len(self.sections), figures=len(self.figures))
+    
+    def _find_sections(self) -> dict:
+        source = self._latex_source()
+        if source:
+            # Exact sections and numbered captions straight from the LaTeX
+            return {
+                'title': source['title'],
+                'sections': {name: clean_text(content) for name, content in source['sections'].items()},
+                'figures': [{'type': f['type'], 'number': f['number'], 'caption': f['caption']}
+                            for f in source['figures'] + source['tables']]
+            }
+        return {
+            'sections': identify_sections(self.paper_text),
+            'figures': extract_figures_and_tables(
+                self.paper_text, self.paper_path if self.paper_path.endswith('.pdf') else None)
+        }
+    
+    def _identify_tables(self):
+        with self.tracer.span('tables') as span:
+            self.tables = self._checkpointed('tables', self._extract_tables)
+            if self.tables:
+                # Tables get native slides; their cells don't need to go through the LLM
+                self.sections = {name: strip_table_text(content, self.tables)
+                                 for name, content in self.sections.items()}
+            span.attrs['tables'] = len(self.tables)
+    
+    def _extract_tables(self) -> list:
+        """Structured tables from the LaTeX tabulars, else from the PDF pages their captions are on."""
+        source = self._latex_source()
+        if source:
+            return [to_column_table(table['rows'], table['number'], table['caption'])
+                    for table in source['tables'] if len(table.get('rows') or []) >= 2]
         if self.paper_path.endswith('.pdf'):
-            text = extract_text_from_pdf(self.paper_path)
-        else:
-            with open(self.paper_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-        
-        return clean_text(text)
+            return extract_tables(self.paper_path, self.figures or [])
+        return []
+    
+    def _ingest_paper(self) -> dict:
+        """Ingest and clean paper text.
+
+        For a PDF, also where each page begins in the text (page numbers in the
+        verification report), so the pages are only extracted once.
+        """
+        source = self._latex_source()
+        if source:
+            return {'text': clean_text(source['text']), 'page_starts': None}
+        if self.paper_path.endswith('.pdf'):
+            pages = extract_pages_from_pdf(self.paper_path)
+            text = clean_text("".join(page + "\n\n" for page in pages))  # As extract_text_from_pdf joins them
+            return {'text': text, 'page_starts': page_starts(text, [clean_text(page) for page in pages])}
+        with open(self.paper_path, 'r', encoding='utf-8') as f:
+            return {'text': clean_text(f.read()), 'page_starts': None}
     
     def _run_agent_crew(self):
         """Run the CrewAI agent pipeline."""
         
-        # Create tasks
+        # Create tasks (names label the instrumentation spans)
+        task_names = ['summarization', 'structuring', 'visualization',
+                      'compression', 'verification', 'compilation']
         tasks = [
             create_summarization_task(self.sections),
-            create_structuring_task(self.sections),
+            create_structuring_task(self.sections, self.style, self.target_slides),
             create_visualization_task(
                 {'text': self.paper_text, 'figures': self.figures},
                 self.sections
             ),
             create_compression_task(self.sections),
             create_verification_task(self.sections, self.paper_text),
-            create_compilation_task(self.sections, self.figures, self.paper_text)
+            create_compilation_task(self.sections, self.figures, self.paper_text,
+                                    self.style, self.target_slides, self.tables)
         ]
         
+        # Fresh agent copies per run: CrewAI executors cannot be shared by concurrent crews
+        agents = [agent.copy() for agent in (
+            summarization_agent,
+            structuring_agent,
+            visualization_agent,
+            compression_agent,
+            verification_agent,
+            compilation_agent
+        )]
+        for task, agent in zip(tasks, agents):
+            task.agent = agent
+        # Optional agents: overflow is handled by text_fit, facts are checked by _verify_slides
+        optional = {'compression': config.USE_LLM_COMPRESSION, 'verification': config.USE_LLM_VERIFICATION}
+        if not all(optional.values()):
+            keep = [i for i, name in enumerate(task_names) if optional.get(name, True)]
+            task_names = [task_names[i] for i in keep]
+            tasks = [tasks[i] for i in keep]
+            agents = [agents[i] for i in keep]
+        
+        # Skip tasks whose inputs are unchanged (interrupted run, or only later parameters changed)
+        restored = {}
+        for name in task_names:
+            data = self._restore(f"task:{name}")
+            if data is None:
+                break
+            restored[name] = data['raw']
+        if restored:
+            if task_names[-1] in restored:
+                return restored[task_names[-1]]
+            remaining = [i for i, name in enumerate(task_names) if name not in restored]
+            task_names = [task_names[i] for i in remaining]
+            tasks = [tasks[i] for i in remaining]
+            agents = [agents[i] for i in remaining]
+            # A fresh crew only passes along outputs of its own tasks, so hand the earlier ones over explicitly
+            earlier = "\n\n".join(f"=== {name.upper()} (earlier step output) ===\n{raw}"
+                                   for name, raw in restored.items())
+            for task in tasks:
+                task.description += f"\n\nOutputs of earlier steps:\n{earlier}"
+        
         # Create crew
         crew = Crew(
-            agents=[
-                summarization_agent,
-                structuring_agent,
-                visualization_agent,
-                compression_agent,
-                verification_agent,
-                compilation_agent
-            ],
+            agents=agents,
             tasks=tasks,
             process=Process.sequential,
-            verbose=True
+            verbose=True,
+            task_callback=lambda output: self._on_task_complete(task_names, output)
         )
         
-        # Execute
-        result = crew.kickoff()
+        # Execute (sequential: each task's span closes when the next one starts)
+        self._task_index = 0
+        self.tracer.start(f"task:{task_names[0]}", category='agent_task')
+        try:
+            result = crew.kickoff()
+        finally:
+            if self._task_index < len(task_names):
+                self.tracer.end()
+        self._record_crew_usage(result)
+        llm_cache.report()
+        llm_transport.report()
+        llm_replay.report()
         return result
     
+    def _on_task_complete(self, task_names, output):
+        """Crew task callback: checkpoint the output, close the task's span and open the next."""
+        self._store(f"task:{task_names[self._task_index]}", {'raw': output.raw})
+        self.tracer.end()
+        self._task_index += 1
+        if self._task_index < len(task_names):
+            self.tracer.start(f"task:{task_names[self._task_index]}", category='agent_task')
+    
+    def _record_crew_usage(self, result):
+        """Fall back to CrewAI's token totals when calls bypassed the transport."""
+        crew_span = next((s for s in reversed(self.tracer.spans) if s.name == 'agent_crew'), None)
+        usage = getattr(result, 'token_usage', None)
+        if crew_span and usage and not crew_span.prompt_tokens:
+            self.tracer.add_tokens(getattr(usage, 'prompt_tokens', 0) or 0,
+                                   getattr(usage, 'completion_tokens', 0) or 0)
+    
+    def _save_run_report(self):
+        """Write the per-stage JSON run report (and Chrome trace if configured)."""
+        from utils import ensure_output_directory
+        ensure_output_directory(self.output_dir)
+        report_path = self.tracer.write_report(os.path.join(self.output_dir, config.RUN_REPORT_OUTPUT))
+        console.print(f"[dim]Run report: {report_path}[/dim]")
+        if config.TRACE_OUTPUT:
+            trace_path = self.tracer.write_chrome_trace(os.path.join(self.output_dir, config.TRACE_OUTPUT))
+            console.print(f"[dim]Chrome trace: {trace_path}[/dim]")
+    
     def _save_results(self, result):
         """Save pipeline results to files."""
         # Save main result
-        save_output(config.SLIDES_OUTPUT, str(result))
+        save_output(config.SLIDES_OUTPUT, str(result), self.output_dir)
         
         console.print(f"\n[bold]Output files:[/bold]")
-        console.print(f"  • {config.OUTPUT_DIR}/{config.SLIDES_OUTPUT}")
+        console.print(f"  • {self.output_dir}/{config.SLIDES_OUTPUT}")
         console.print(f"  • Check the output directory for all generated files\n")
     
+    def _verify_slides(self, result) -> dict:
+        """Check every bullet against the paper and write the evidence report next to the deck."""
+        slides, _ = parse_blueprint(str(result))
+        report = build_report(slides, self.paper_text, self.page_starts)
+        path = write_report(report, os.path.join(self.output_dir, config.VERIFICATION_REPORT_OUTPUT))
+        summary = report['summary']
+        console.print(f"[green]✓[/green] Verified {summary['verified']} of {summary['verified'] + summary['unverified']}"
+                      f" factual bullets ({summary['unverified']} unverified): {path}")
+        return report
+    
+    def _extract_images(self) -> list:
+        """Original figure files from the LaTeX source when available, else images from the PDF."""
+        from pdf_image_extractor import get_relevant_images
+        source = self._latex_source()
+        if source and source['images']:
+            return source['images'][:10]
+        if self.paper_path.endswith('.pdf'):
+            images = get_relevant_images(self.paper_path, max_images=10, output_dir=self.image_dir)
+            # Tag images with the figure number/caption printed below them
+            return CaptionIndex.from_list(self.figures or []).link_images(images)
+        return []
+    
     def _generate_pptx(self, result):
-        """Generate PowerPoint presentation with unique filename and extracted images."""
+        """Generate PowerPoint presentation with unique filename and extracted images.
+
+        The other OUTPUT_FORMATS (md, html, pdf) are rendered from the same slide
+        plan first, next to the PPTX. Returns None when pptx is not requested.
+        """
         import time
         import re
-        from pdf_image_extractor import get_relevant_images
         
         # Extract images from PDF
         extracted_images = []
         try:
             if self.paper_path and os.path.exists(self.paper_path):
                 console.print("[cyan]Extracting images from PDF...[/cyan]")
-                extracted_images = get_relevant_images(self.paper_path, max_images=10)
+                with self.tracer.span('image_extraction', category='substage'):
+                    extracted_images = self._checkpointed('images', self._extract_images)
+                    # Images are referenced by path; re-extract if they were cleaned up since
+                    if not all(os.path.exists(img['path']) for img in extracted_images):
+                        extracted_images = self._extract_images()
                 console.print(f"[green]✓[/green] Extracted {len(extracted_images)} images\n")
         except Exception as e:
             console.print(f"[yellow]Could not extract images: {e}[/yellow]")
@@ -175,7 +550,7 @@ class ResearchPaperPipeline:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             pptx_filename = f"presentation_{timestamp}.pptx"
         
-        pptx_path = os.path.join(config.OUTPUT_DIR, pptx_filename)
+        pptx_path = os.path.join(self.output_dir, pptx_filename)
         
         # If file exists, add number suffix
         if os.path.exists(pptx_path):
@@ -183,12 +558,29 @@ class ResearchPaperPipeline:
             counter = 1
             while os.path.exists(pptx_path):
                 pptx_filename = f"{base_name}_{counter}.pptx"
-                pptx_path = os.path.join(config.OUTPUT_DIR, pptx_filename)
+                pptx_path = os.path.join(self.output_dir, pptx_filename)
                 counter += 1
         
+        deck = plan_deck(str(result), extracted_images, self.tables, self.verification)
+        previews = [fmt for fmt in config.OUTPUT_FORMATS if fmt != 'pptx']
+        if previews:
+            try:
+                with self.tracer.span('previews', category='substage'):
+                    self.preview_paths = render_previews(deck, self.paper_title,
+                                                         os.path.splitext(pptx_path)[0], previews)
+                for path in self.preview_paths.values():
+                    console.print(f"[green]Generated:[/green] {os.path.basename(path)}")
+                if self.on_previews:
+                    self.on_previews(self.preview_paths)
+            except Exception as e:
+                console.print(f"[yellow]Could not render previews: {e}[/yellow]")
+        if 'pptx' not in config.OUTPUT_FORMATS:
+            return None
+        
         try:
             # Generate PPTX with extracted images
-            generate_pptx_from_blueprint(str(result), pptx_path, self.paper_title, extracted_images)
+            with self.tracer.span('pptx_generation', category='substage'):
+                generate_pptx_from_deck(deck, pptx_path, self.paper_title)
             console.print(f"[green]Generated:[/green] {pptx_filename}")
         except Exception as e:
             console.print(f"[red]Error generating PowerPoint: {e}[/red]")
@@ -201,11 +593,13 @@ def main():
     import sys
     
     if len(sys.argv) < 2:
-        console.print("[red]Usage: python pipeline.py <path_to_paper.pdf>[/red]")
+        console.print("[red]Usage: python pipeline.py <path_to_paper.pdf> | --resume <run-id>[/red]")
         sys.exit(1)
     
-    paper_path = sys.argv[1]
-    pipeline = ResearchPaperPipeline(paper_path)
+    if sys.argv[1] == '--resume' and len(sys.argv) > 2:
+        pipeline = ResearchPaperPipeline.resume(sys.argv[2])
+    else:
+        pipeline = ResearchPaperPipeline(sys.argv[1])
     pipeline.run()
 
 if __name__ == "__main__":
@@ -3,8 +3,49 @@ from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
+import io
 import re
 import os
+from concurrent.futures import ProcessPoolExecutor
+import config
+from table_extractor import table_rows
+from text_fit import fit_bullets, fit_title, LINE_SPACING, SPACE_BEFORE, SPACE_AFTER
+
+_IMAGE_BOX = (5.2, 1.5, 4.3, 5.5)  # Left, top, max width, max height (inches) of a figure beside the bullets
+_BYTES_PER_PIXEL = 0.5  # Figures smaller than this at display size are embedded as they are
+_TITLE_BOX = (9, 0.65)  # Width, height (inches) of a content slide's title
+_CONTENT_HEIGHT = 5.5  # Height (inches) of the bullet box; its width is 4.5 beside a figure, else 8.5
+
+# "Slide 3: Title", also as a Markdown heading or in bold ("## Slide 3 - Title", "**Slide 3: Title**")
+_SLIDE_HEADER_RE = re.compile(r'^[#*\s]*Slide\s+\d+\s*[:.\-–]\s*', re.MULTILINE | re.IGNORECASE)
+_NOTES_HEADER_RE = re.compile(r'^[\s#*+\-]*Slide\s+(\d+)\b[\s*:.)\-–]*(.*)$', re.IGNORECASE)
+# "3. **Title**" or "3. Title" - only a header in notes without "Slide N" headers (else a list item)
+_NUMBERED_NOTES_HEADER_RE = re.compile(r'^[\s#*]*(\d+)\.\s+(\**)(.*)$')
+
+
+class _PartNames:
+    """Package.next_partname that remembers the names it has handed out.
+
+    python-pptx walks every part of the package to find a free name, which
+    makes giving each slide a notes page quadratic in the length of the deck.
+    """
+    
+    def __init__(self, package):
+        self.package = package
+        self.taken = {}  # template -> (names in use, next number to try)
+    
+    def __call__(self, tmpl: str):
+        from pptx.opc.packuri import PackURI
+        if tmpl not in self.taken:
+            prefix = tmpl[:(tmpl % 42).find('42')]
+            self.taken[tmpl] = ({p.partname for p in self.package.iter_parts() if p.partname.startswith(prefix)}, 1)
+        names, n = self.taken[tmpl]
+        while tmpl % n in names:
+            n += 1
+        names.add(tmpl % n)
+        self.taken[tmpl] = (names, n + 1)
+        return PackURI(tmpl % n)
+
 
 class PPTXGenerator:
     """Generate PowerPoint presentations with professional styling."""
@@ -13,6 +54,8 @@ class PPTXGenerator:
         self.prs = Presentation()
         self.prs.slide_width = Inches(10)
         self.prs.slide_height = Inches(7.5)
+        package = self.prs.part.package
+        package.next_partname = _PartNames(package)  # Notes pages for long decks in linear time
         
         # Professional black and white color scheme
         self.primary_color = RGBColor(0, 0, 0)          # Black
@@ -193,8 +236,15 @@ class PPTXGenerator:
         p.font.color.rgb = RGBColor(255, 255, 255)
         p.alignment = PP_ALIGN.CENTER
     
-    def add_content_slide_with_image(self, title: str, bullets: list, image_path: str = None):
-        """Add a content slide with bullets and an optional image."""
+    def add_content_slide_with_image(self, title: str, bullets: list, image_path: str = None, notes: str = ""):
+        """Add a content slide with bullets, an optional image and speaker notes."""
+        image = prepare_images([image_path], workers=1).get(image_path) if image_path else None
+        for payload in prepare_content_slides(title, bullets, image, notes):
+            self.add_prepared_slide(payload)
+    
+    def add_prepared_slide(self, payload: dict):
+        """Add a content slide from prepare_content_slides() output (image resized, text fitted)."""
+        title, bullets, image = payload['title'], payload['bullets'], payload['image']
         slide_layout = self.prs.slide_layouts[6]  # Blank layout
         slide = self.prs.slides.add_slide(slide_layout)
         
@@ -224,20 +274,11 @@ class PPTXGenerator:
         title_frame.word_wrap = True
         p = title_frame.paragraphs[0]
         p.text = title
-        p.font.size = Pt(22)  # Smaller to fit long titles
+        p.font.size = Pt(payload['title_size'])
         p.font.bold = True
         p.font.color.rgb = RGBColor(255, 255, 255)
         
-        # Determine layout based on image availability
-        if image_path and os.path.exists(image_path):
-            # Two-column layout: text on left, image on right
-            content_width = 4.5
-            image_left = Inches(5.2)
-            image_width = Inches(4.3)
-        else:
-            # Full width for text
-            content_width = 8.5
-            image_path = None
+        content_width = payload['content_width']
         
         # Add accent line
         accent_line = slide.shapes.add_shape(
@@ -253,7 +294,7 @@ class PPTXGenerator:
         # Add content box
         content_box = slide.shapes.add_textbox(
             Inches(1), Inches(1.2),
-            Inches(content_width), Inches(5.5)
+            Inches(content_width), Inches(_CONTENT_HEIGHT)
         )
         text_frame = content_box.text_frame
         text_frame.word_wrap = True
@@ -268,20 +309,21 @@ class PPTXGenerator:
             
             p.text = bullet
             p.level = 0
-            p.font.size = Pt(18)
+            p.font.size = Pt(payload['font_size'])
             p.font.color.rgb = self.text_color
-            p.space_before = Pt(10)
-            p.space_after = Pt(6)
-            p.line_spacing = 1.2
+            p.space_before = Pt(SPACE_BEFORE)
+            p.space_after = Pt(SPACE_AFTER)
+            p.line_spacing = LINE_SPACING
         
         # Add image if available
-        if image_path:
+        if image:
             try:
                 pic = slide.shapes.add_picture(
-                    image_path,
-                    image_left,
-                    Inches(1.5),
-                    width=image_width
+                    io.BytesIO(image['data']),
+                    Inches(image['left']),
+                    Inches(image['top']),
+                    Inches(image['width']),
+                    Inches(image['height'])
                 )
             except Exception as e:
                 print(f"Could not add image: {e}")
@@ -297,6 +339,101 @@ class PPTXGenerator:
         p.font.size = Pt(12)
         p.font.color.rgb = self.text_color
         p.alignment = PP_ALIGN.RIGHT
+        
+        if payload['notes']:
+            slide.notes_slide.notes_text_frame.text = payload['notes']
+    
+    def add_table_slide(self, title: str, table: dict, notes: str = ""):
+        """Add a native PowerPoint table (editable, crisp at any size) from a column table."""
+        slide_layout = self.prs.slide_layouts[6]  # Blank layout
+        slide = self.prs.slides.add_slide(slide_layout)
+        
+        # Set background
+        background = slide.background
+        fill = background.fill
+        fill.solid()
+        fill.fore_color.rgb = self.bg_color
+        
+        # Add header bar
+        header_shape = slide.shapes.add_shape(
+            1,  # Rectangle
+            Inches(0), Inches(0),
+            Inches(10), Inches(0.8)
+        )
+        header_fill = header_shape.fill
+        header_fill.solid()
+        header_fill.fore_color.rgb = self.primary_color
+        header_shape.line.fill.background()
+        
+        # Add title
+        title_box = slide.shapes.add_textbox(
+            Inches(0.5), Inches(0.15),
+            Inches(9), Inches(0.5)
+        )
+        title_frame = title_box.text_frame
+        p = title_frame.paragraphs[0]
+        p.text = title
+        p.font.size = Pt(28)
+        p.font.bold = True
+        p.font.color.rgb = RGBColor(255, 255, 255)
+        
+        # Keep the table readable: truncate rows/columns that would not fit
+        rows = [row[:config.TABLE_MAX_COLS] for row in table_rows(table)[:config.TABLE_MAX_ROWS + 1]]
+        numeric = table['numeric'][:config.TABLE_MAX_COLS]
+        n_rows, n_cols = len(rows), len(rows[0])
+        row_height = min(0.5, 5.2 / n_rows)
+        shape = slide.shapes.add_table(
+            n_rows, n_cols,
+            Inches(0.5), Inches(1.2),
+            Inches(9), Inches(row_height * n_rows)
+        )
+        font_size = Pt(16 if n_rows <= 6 else 12)
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                cell = shape.table.cell(r, c)
+                cell.text = value
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = self.primary_color if r == 0 else (
+                    RGBColor(242, 242, 242) if r % 2 == 0 else self.bg_color)
+                p = cell.text_frame.paragraphs[0]
+                p.font.size = font_size
+                p.font.bold = r == 0
+                p.font.color.rgb = RGBColor(255, 255, 255) if r == 0 else self.text_color
+                if numeric[c]:
+                    p.alignment = PP_ALIGN.RIGHT
+        
+        # Caption (and what was left out) under the table
+        caption = f"Table {table['number']}: {table['caption']}" if table.get('number') else table.get('caption', '')
+        hidden_rows = table['n_rows'] - (n_rows - 1)
+        hidden_cols = len(table['header']) - n_cols
+        if hidden_rows > 0 or hidden_cols > 0:
+            caption += f" (showing {n_rows - 1} of {table['n_rows']} rows, {n_cols} of {len(table['header'])} columns)"
+        caption_box = slide.shapes.add_textbox(
+            Inches(0.5), Inches(1.3 + row_height * n_rows),
+            Inches(9), Inches(0.6)
+        )
+        caption_frame = caption_box.text_frame
+        caption_frame.word_wrap = True
+        p = caption_frame.paragraphs[0]
+        p.text = caption
+        p.font.size = Pt(12)
+        p.font.italic = True
+        p.font.color.rgb = self.secondary_color
+        
+        # Add footer with slide number
+        footer_box = slide.shapes.add_textbox(
+            Inches(9), Inches(7.2),
+            Inches(0.8), Inches(0.3)
+        )
+        footer_frame = footer_box.text_frame
+        p = footer_frame.paragraphs[0]
+        p.text = str(len(self.prs.slides))
+        p.font.size = Pt(12)
+        p.font.color.rgb = self.text_color
+        p.alignment = PP_ALIGN.RIGHT
+        
+        if notes:
+            slide.notes_slide.notes_text_frame.text = notes
     
     def add_qa_slide(self, title: str, qa_pairs: list):
         """Add a Q&A slide with questions and answers."""
@@ -373,6 +510,92 @@ class PPTXGenerator:
         self.prs.save(filename)
         
 
+def fit_image(image_path: str) -> dict:
+    """Image bytes sized for the figure box: downscaled to PPTX_IMAGE_DPI, aspect ratio kept."""
+    from PIL import Image
+    left, top, max_width, max_height = _IMAGE_BOX
+    with Image.open(image_path) as image:
+        inches_per_pixel = min(max_width / image.width, max_height / image.height)
+        width, height = image.width * inches_per_pixel, image.height * inches_per_pixel
+        pixels = (max(round(width * config.PPTX_IMAGE_DPI), 1), max(round(height * config.PPTX_IMAGE_DPI), 1))
+        if pixels[0] < image.width and os.path.getsize(image_path) > pixels[0] * pixels[1] * _BYTES_PER_PIXEL:
+            # Large full-resolution figures would be embedded (and deflated on save) at many times their shown size
+            keep_jpeg = image.format == 'JPEG' and image.mode in ('RGB', 'L')
+            if image.mode not in ('RGB', 'RGBA', 'L'):
+                image = image.convert('RGBA')  # Palette/CMYK images resample badly or can't be saved as PNG
+            resized = image.resize(pixels, Image.LANCZOS)
+            buffer = io.BytesIO()
+            if keep_jpeg:
+                resized.save(buffer, 'JPEG', quality=90)
+            else:
+                resized.save(buffer, 'PNG')
+            data = buffer.getvalue()
+        else:
+            with open(image_path, 'rb') as f:
+                data = f.read()
+    return {'data': data, 'left': left, 'top': top, 'width': width, 'height': height}
+
+
+def _fit_image_or_none(image_path: str):
+    try:
+        return fit_image(image_path)
+    except Exception as e:
+        print(f"Could not add image: {e}")
+        return None
+
+
+def prepare_images(image_paths: list, workers: int = None) -> dict:
+    """{path: fit_image() result or None}, in worker processes when the deck has many images."""
+    paths = list(dict.fromkeys(p for p in image_paths if p and os.path.exists(p)))
+    workers = min(workers or config.PPTX_WORKERS, len(paths))
+    if workers > 1 and len(paths) >= config.PPTX_PARALLEL_MIN_IMAGES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(paths, pool.map(_fit_image_or_none, paths)))
+    return {path: _fit_image_or_none(path) for path in paths}
+
+
+def prepare_content_slides(title: str, bullets: list, image: dict = None, notes: str = "") -> list:
+    """Payloads for add_prepared_slide(): content and layout, nothing bound to a presentation.
+
+    Font sizes come from font metrics (text_fit). Bullets that don't fit even
+    at the smallest size continue on "(cont.)" slides, full width and without
+    the figure; the notes stay with the first slide.
+    """
+    payloads = []
+    for page, font_size, content_width in paginate_bullets(bullets, image is not None):
+        page_title = f"{title} (cont.)" if payloads else title
+        payloads.append({
+            'title': page_title,
+            'title_size': fit_title(page_title, _TITLE_BOX[0] * 72, _TITLE_BOX[1] * 72, *config.TITLE_FONT_SIZES),
+            'bullets': page,
+            'font_size': font_size,
+            'notes': "" if payloads else notes,
+            'image': None if payloads else image,
+            'content_width': content_width,
+        })
+    return payloads
+
+
+def paginate_bullets(bullets: list, with_image: bool = False) -> list:
+    """Split bullets into slides: [(bullets, font_size, content_width)].
+
+    The first slide is 4.5in wide beside the figure (if any); bullets that
+    don't fit at the smallest font size are refitted at full width.
+    """
+    pages_out = []
+    bullets = tuple(bullets)
+    while bullets:
+        # Two-column layout (text left, image right) or full width for text
+        content_width = 4.5 if with_image else 8.5
+        font_size, pages = fit_bullets(bullets, content_width * 72, _CONTENT_HEIGHT * 72, *config.BULLET_FONT_SIZES)
+        if with_image and len(pages) > 1:
+            pages = pages[:1]  # The rest is refitted at full width
+        pages_out.extend((list(page), font_size, content_width) for page in pages)
+        bullets = bullets[sum(len(page) for page in pages):]
+        with_image = False
+    return pages_out
+
+
 def parse_slide_content(slide_text: str) -> dict:
     """Parse slide content from text format."""
     lines = slide_text.strip().split('\n')
@@ -398,14 +621,8 @@ def parse_slide_content(slide_text: str) -> dict:
     }
 
 
-def generate_pptx_from_blueprint(blueprint_text: str, output_path: str, paper_title: str = "Research Paper", 
-                                 extracted_images: list = None):
-    """Generate PowerPoint from slide blueprint text with extracted images."""
-    generator = PPTXGenerator()
-    
-    # Add title slide
-    generator.add_title_slide(paper_title, "AI-Generated Presentation", "Created by Multi-Agent System")
-    
+def parse_blueprint(blueprint_text: str) -> tuple:
+    """Content slides ({'title', 'bullets', 'visual'}, bullets non-empty) and the presenter notes section."""
     # Extract presenter notes section
     presenter_notes_section = ""
     if "**Presenter Notes:**" in blueprint_text:
@@ -413,50 +630,186 @@ def generate_pptx_from_blueprint(blueprint_text: str, output_path: str, paper_ti
         blueprint_text = parts[0]
         presenter_notes_section = parts[1] if len(parts) > 1 else ""
     
-    # Split into slides - handle both formats
-    # Try numbered format first: "1. **Title**"
-    slides = re.split(r'\n\d+\.\s+\*\*', blueprint_text)
-    
-    # If that didn't work, try section format: "=== TITLE ==="
-    if len(slides) <= 1:
-        slides = re.split(r'===\s+([^=]+)\s+===', blueprint_text)
+    # Split into slides - handle all three formats
+    # "Slide N: Title" first, as the compilation prompts ask for it
+    slides = []
+    chunks = _SLIDE_HEADER_RE.split(blueprint_text)
+    if len(chunks) == 1:
+        # Numbered format: "1. **Title**"
+        chunks = re.split(r'\n\d+\.\s+\*\*', blueprint_text)
+    if len(chunks) > 1:
+        slides = [parse_slide_content(chunk) for chunk in chunks[1:]]  # Skip the text before the first slide
+    else:
+        # Section format: "=== TITLE ===" followed by "- bullet" lines
+        chunks = re.split(r'===\s+([^=]+)\s+===', blueprint_text)
+        for title, content in zip(chunks[1::2], chunks[2::2]):
+            bullets = [line.strip('- ').strip() for line in content.split('\n') if line.strip().startswith('-')]
+            slides.append({'title': title.strip(), 'bullets': bullets, 'visual': ""})
+    return [slide for slide in slides if slide['bullets']], presenter_notes_section
+
+
+def _title_key(text: str) -> str:
+    return re.sub(r'\W+', ' ', text).strip().lower()
+
+
+def _numbered_notes_header(line: str, titles: dict, current, block_start: bool):
+    """Match of a "3. Title" notes header, or None for a numbered list item."""
+    match = _NUMBERED_NOTES_HEADER_RE.match(line)
+    if not match:
+        return None
+    if match.group(2) or _title_key(match.group(3).replace('**', '')) in titles:
+        return match
+    # A plain numbered line opening a paragraph is a header if it moves on to a later slide
+    later = int(match.group(1)) - 1 > (-1 if current is None else current)
+    return match if block_start and later else None
+
+
+def parse_presenter_notes(notes_text: str, slides: list) -> list:
+    """Notes for each slide from the presenter notes section ("Slide N: ..." paragraphs).
+
+    A paragraph goes to its slide by number, or by title when its header
+    names one. "3. Title" headers count only in notes that have no "Slide N"
+    headers, and only in bold, naming a slide, or opening a paragraph for a
+    later slide - otherwise a numbered line is a list item in the notes.
+    Audience questions and answers (see extract_qa_from_notes) end the
+    current paragraph and are not copied into slide notes.
+    """
+    notes = [[] for _ in slides]
+    titles = {_title_key(slide['title']): i for i, slide in enumerate(slides)}
+    slide_headers = any(_NOTES_HEADER_RE.match(line.strip()) for line in notes_text.split('\n'))
+    current = None
+    previous = ''
+    for line in notes_text.split('\n'):
+        line, block_start = line.strip(), not previous
+        previous = line
+        header = _NOTES_HEADER_RE.match(line)
+        if line.endswith('?') or line.startswith(('+ ', 'Q:')):
+            current = None
+            continue
+        if not header and not slide_headers:
+            header = _numbered_notes_header(line, titles, current, block_start)
+        if header:
+            rest = header.groups()[-1].replace('**', '').strip()
+            index = titles.get(_title_key(rest), int(header.group(1)) - 1)
+            current = index if index < len(slides) else None
+            if _title_key(rest) in titles:
+                continue  # "Slide 3: Title" - the notes follow
+            line = rest
+        elif line.startswith(('**', '#')) and _title_key(line) in titles:
+            current = titles[_title_key(line)]
+            continue
+        if current is not None and line:
+            notes[current].append(line.lstrip('-*• ').replace('**', ''))
+    return ["\n".join(lines) for lines in notes]
+
+
+def plan_deck(blueprint_text: str, extracted_images: list = None, tables: list = None, verification: dict = None) -> dict:
+    """Slide model shared by the PPTX and the lightweight renderers (slide_renderers.py).
+
+    Returns {'slides': [{'title', 'bullets', 'image' (path or None), 'notes',
+    'tables'}], 'qa': [...]}. Bullets that overflow a slide continue on
+    "(cont.)" slides (see paginate_bullets), so every renderer gets the same
+    slides as the PPTX. A table goes right after the slide that cites it
+    ("Table 2"); up to TABLE_MAX_SLIDES uncited numeric tables follow the
+    first results slide. Each slide's notes hold its presenter notes from the
+    blueprint and, with a verification report (see verification_report.py),
+    the source evidence for its bullets.
+    """
+    from verification_report import slide_notes
+    slides, presenter_notes_section = parse_blueprint(blueprint_text)
+    checked = (verification or {}).get('slides', [])
+    slide_notes_text = parse_presenter_notes(presenter_notes_section, slides)
     
     # Process content slides with images
     image_index = 0
-    for i, slide_text in enumerate(slides[1:]):  # Skip first empty split
-        # For section format, odd indices are titles, even are content
-        if '===' in blueprint_text and i % 2 == 0:
-            title = slide_text.strip()
-            content = slides[i + 2] if i + 2 < len(slides) else ""
-            bullets = [line.strip('- ').strip() for line in content.split('\n') if line.strip().startswith('-')]
-        else:
-            slide_data = parse_slide_content(slide_text)
-            title = slide_data['title']
-            bullets = slide_data['bullets']
-        
-        if bullets:
-            # Add image if available
-            image_path = None
-            if extracted_images and image_index < len(extracted_images):
+    used_images = set()
+    # Images linked to a caption go to the slide that cites their figure number
+    figure_images = {str(img['figure_number']): img['path']
+                     for img in extracted_images or [] if img.get('figure_number')}
+    tables_by_number = {str(t['number']).upper(): t for t in tables or [] if t.get('number')}
+    used_tables = set()
+    results_tables_added = False
+    plan = []
+    for i, slide_data in enumerate(slides):
+        title = slide_data['title']
+        bullets = slide_data['bullets']
+        
+        # Add image if available
+        image_path = None
+        cited = re.findall(r'\b(?:Figure|Fig\.?)\s+(\d+)', f"{title} {' '.join(bullets)}", re.IGNORECASE)
+        for number in cited:
+            if figure_images.get(number) and figure_images[number] not in used_images:
+                image_path = figure_images[number]
+                break
+        if image_path is None and extracted_images:
+            while image_index < len(extracted_images) and extracted_images[image_index]['path'] in used_images:
+                image_index += 1
+            if image_index < len(extracted_images):
                 image_path = extracted_images[image_index]['path']
                 image_index += 1
-            
-            generator.add_content_slide_with_image(
-                title,
-                bullets,
-                image_path
-            )
+        if image_path:
+            used_images.add(image_path)
+        
+        # Native table slides for the tables this slide refers to
+        text = f"{title} {' '.join(bullets)}"
+        numbers = re.findall(r'\bTable\s+([A-Z]?\d+)', text, re.IGNORECASE)
+        if not results_tables_added and re.search(r'result|experiment|evaluation|benchmark', title, re.IGNORECASE):
+            results_tables_added = True
+            uncited = [n for n, t in tables_by_number.items() if n not in used_tables and any(t['numeric'])]
+            numbers += uncited[:config.TABLE_MAX_SLIDES]
+        slide_tables = []
+        for number in numbers:
+            table = tables_by_number.get(number.upper())
+            if table and number.upper() not in used_tables:
+                used_tables.add(number.upper())
+                slide_tables.append(table)
+        
+        notes = "\n\n".join(part for part in (slide_notes_text[i], slide_notes(checked[i]) if i < len(checked) else "")
+                              if part)
+        pages = [page for page, _, _ in paginate_bullets(bullets, image_path is not None)]
+        for number, page in enumerate(pages):
+            plan.append({'title': f"{title} (cont.)" if number else title, 'bullets': page,
+                         'image': None if number else image_path, 'notes': "" if number else notes,
+                         'tables': slide_tables if number == len(pages) - 1 else []})
+    
+    return {'slides': plan, 'qa': extract_qa_from_notes(presenter_notes_section) if presenter_notes_section else []}
+
+
+def generate_pptx_from_deck(deck: dict, output_path: str, paper_title: str = "Research Paper"):
+    """Build the PowerPoint for a plan_deck() slide model.
+
+    Figures are prepared in parallel (prepare_images), then the slides are
+    assembled in order in one serial pass.
+    """
+    generator = PPTXGenerator()
+    
+    # Add title slide
+    generator.add_title_slide(paper_title, "AI-Generated Presentation", "Created by Multi-Agent System")
+    
+    # Resize figures in worker processes; the presentation itself is built serially
+    images = prepare_images([slide['image'] for slide in deck['slides']])
+    for slide in deck['slides']:
+        for payload in prepare_content_slides(slide['title'], slide['bullets'], images.get(slide['image']),
+                                              slide['notes']):
+            generator.add_prepared_slide(payload)
+        for table in slide['tables']:
+            generator.add_table_slide(f"{slide['title']} - Table {table['number']}", table)
     
     # Add Q&A slide at the end
-    if presenter_notes_section:
-        qa_content = extract_qa_from_notes(presenter_notes_section)
-        if qa_content:
-            generator.add_qa_slide("Questions & Discussion", qa_content)
+    if deck['qa']:
+        generator.add_qa_slide("Questions & Discussion", deck['qa'])
     
     generator.save(output_path)
     return output_path
 
 
+def generate_pptx_from_blueprint(blueprint_text: str, output_path: str, paper_title: str = "Research Paper", 
+                                 extracted_images: list = None, tables: list = None, verification: dict = None):
+    """Generate PowerPoint from slide blueprint text with extracted images and native tables (see plan_deck)."""
+    deck = plan_deck(blueprint_text, extracted_images, tables, verification)
+    return generate_pptx_from_deck(deck, output_path, paper_title)
+
+
 def extract_qa_from_notes(notes_text: str) -> list:
     """Extract questions and answers from presenter notes."""
     qa_pairs = []
@@ -0,0 +1,400 @@
+"""Long-running pipeline service with warm components and a persistent job queue.
+
+The service imports CrewAI, builds the agents and LLM clients once, then runs
+jobs from a SQLite-backed priority queue. Jobs are submitted and inspected over
+a small JSON HTTP API, on a TCP port or a Unix socket:
+
+    POST   /jobs                {"paper_path": "...", "target_slides": 10,
+                                 "style": "concise", "is_arxiv": false, "priority": 0}
+    GET    /jobs                (optional ?status=queued)
+    GET    /jobs/<id>           (result.preview_paths appear while the PPTX is still being built)
+    GET    /jobs/<id>/result
+    DELETE /jobs/<id>           (cancel a queued job)
+    GET    /health
+
+Usage:
+    python service.py --port 8765
+    python service.py --socket /tmp/slide-deck.sock --workers 2
+"""
+import argparse
+import json
+import os
+import socketserver
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import config
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed', 'cancelled')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    params TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, priority DESC, created_at);
+"""
+
+
+class JobQueue:
+    """Persistent priority queue of pipeline jobs."""
+
+    def __init__(self, path: str = None):
+        self.path = path or config.SERVICE_DB
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+        columns = {r['name'] for r in self._conn.execute("PRAGMA table_info(jobs)")}
+        if 'attempts' not in columns:  # Queue created before attempts were counted
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+
+    def submit(self, params: dict, priority: int = 0) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        with self._available:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, priority, params, created_at) VALUES (?, 'queued', ?, ?, ?)",
+                (job_id, priority, json.dumps(params), time.time())
+            )
+            self._available.notify()
+        return job_id
+
+    def claim(self, timeout: float = None):
+        """Mark the highest-priority queued job as running and return it (or None)."""
+        with self._available:
+            while True:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' ORDER BY priority DESC, created_at LIMIT 1"
+                ).fetchone()
+                if row:
+                    self._conn.execute("UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 "
+                                       "WHERE id = ?", (time.time(), row['id']))
+                    job = self._to_dict(row, status='running')
+                    job['attempts'] += 1
+                    return job
+                if not self._available.wait(timeout):
+                    return None
+
+    def complete(self, job_id: str, result: dict):
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET status = 'done', finished_at = ?, result = ? WHERE id = ?",
+                               (time.time(), json.dumps(result), job_id))
+
+    def update_result(self, job_id: str, partial: dict):
+        """Merge partial output (e.g. preview paths) into a running job's result."""
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM jobs WHERE id = ? AND status = 'running'",
+                                     (job_id,)).fetchone()
+            if row:
+                result = (json.loads(row['result']) if row['result'] else {}) | partial
+                self._conn.execute("UPDATE jobs SET result = ? WHERE id = ?", (json.dumps(result), job_id))
+
+    def fail(self, job_id: str, error: str):
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET status = 'failed', finished_at = ?, error = ? WHERE id = ?",
+                               (time.time(), error, job_id))
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id))
+            return cursor.rowcount > 0
+
+    def requeue_interrupted(self, max_attempts: int = None) -> tuple:
+        """Jobs left 'running' by a previous process go back on the queue: (requeued, failed).
+
+        A job already started max_attempts times is marked failed instead, so
+        a job that crashes the process can't crash every restart.
+        """
+        max_attempts = max_attempts or config.SERVICE_MAX_ATTEMPTS
+        with self._lock:
+            failed = self._conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, error = ? "
+                "WHERE status = 'running' AND attempts >= ?",
+                (time.time(), f"Interrupted {max_attempts} times; not retried", max_attempts)
+            ).rowcount
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL, result = NULL WHERE status = 'running'"
+            ).rowcount
+        return requeued, failed
+
+    def get(self, job_id: str):
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self, status: str = None, limit: int = 100) -> list:
+        query = "SELECT * FROM jobs"
+        args = []
+        if status:
+            query += " WHERE status = ?"
+            args.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, args + [limit]).fetchall()
+        return [self._to_dict(r) for r in rows]
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: 0 for status in JOB_STATUSES} | {r[0]: r[1] for r in rows}
+
+    @staticmethod
+    def _to_dict(row, status: str = None) -> dict:
+        return {
+            'id': row['id'],
+            'status': status or row['status'],
+            'priority': row['priority'],
+            'params': json.loads(row['params']),
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'attempts': row['attempts'],
+        }
+
+
+class PipelineService:
+    """Runs queued jobs on worker threads using warm pipeline components."""
+
+    def __init__(self, queue: JobQueue = None, workers: int = None):
+        self.queue = queue or JobQueue()
+        self.workers = workers or config.SERVICE_WORKERS
+        self._stop = threading.Event()
+        self._threads = []
+        self.started_at = None
+
+    def warm_up(self):
+        """Pay import, agent construction and model load costs once, up front."""
+        start = time.perf_counter()
+        import pipeline  # noqa: F401  (builds agents and LLM clients)
+        import pdf_image_extractor  # noqa: F401
+        import pptx_generator  # noqa: F401
+        if config.LLM_CACHE_SEMANTIC:
+            import embeddings
+            embeddings.get_encoder()
+        print(f"[SERVICE] Warm-up done in {time.perf_counter() - start:.1f}s")
+
+    def start(self):
+        self.warm_up()
+        requeued, failed = self.queue.requeue_interrupted()
+        if requeued:
+            print(f"[SERVICE] Re-queued {requeued} interrupted job(s)")
+        if failed:
+            print(f"[SERVICE] Failed {failed} job(s) interrupted {config.SERVICE_MAX_ATTEMPTS} times")
+        self.started_at = time.time()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f"pipeline-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+
+    def _worker(self):
+        from pipeline import ResearchPaperPipeline
+        while not self._stop.is_set():
+            job = self.queue.claim(timeout=1.0)
+            if job is None:
+                continue
+            params = job['params']
+            output_dir = os.path.join(config.SERVICE_OUTPUT_DIR, job['id'])
+            print(f"[SERVICE] Job {job['id']} started: {params.get('paper_path')}")
+            try:
+                pipe = ResearchPaperPipeline(
+                    paper_path=params['paper_path'],
+                    target_slides=params.get('target_slides'),
+                    style=params.get('style', 'concise'),
+                    is_arxiv=params.get('is_arxiv', False),
+                    show_progress=False,
+                    output_dir=output_dir,
+                    # Previews are rendered before the PPTX; show them on the job right away
+                    on_previews=lambda paths: self.queue.update_result(
+                        job['id'], {'output_dir': output_dir, 'preview_paths': paths})
+                )
+                pipe.run()
+                self.queue.complete(job['id'], {
+                    'output_dir': output_dir,
+                    'pptx_path': pipe.pptx_path,
+                    'preview_paths': pipe.preview_paths,
+                    'blueprint_path': os.path.join(output_dir, config.SLIDES_OUTPUT),
+                    'run_report_path': os.path.join(output_dir, config.RUN_REPORT_OUTPUT),
+                    'paper_title': pipe.paper_title,
+                })
+                print(f"[SERVICE] Job {job['id']} done")
+            except Exception as e:
+                self.queue.fail(job['id'], f"{e}\n{traceback.format_exc()}")
+                print(f"[SERVICE] Job {job['id']} failed: {e}")
+
+
+def _validate_job(payload: dict) -> dict:
+    if not isinstance(payload.get('paper_path'), str) or not payload['paper_path'].strip():
+        raise ValueError("'paper_path' is required")
+    style = payload.get('style', 'concise')
+    if style not in ('concise', 'detailed', 'teaching'):
+        raise ValueError("'style' must be concise, detailed or teaching")
+    target_slides = payload.get('target_slides')
+    if target_slides is not None and not isinstance(target_slides, int):
+        raise ValueError("'target_slides' must be an integer")
+    return {
+        'paper_path': payload['paper_path'].strip(),
+        'target_slides': target_slides,
+        'style': style,
+        'is_arxiv': bool(payload.get('is_arxiv', False)),
+    }
+
+
+def make_handler(service: PipelineService):
+    """HTTP handler class bound to a service instance."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def address_string(self):
+            # Unix-socket clients have no (host, port) address
+            return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+        def log_message(self, fmt, *args):
+            if config.SERVICE_ACCESS_LOG:
+                super().log_message(fmt, *args)
+
+        def _send(self, status: int, data):
+            body = json.dumps(data, default=str).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _parts(self):
+            parsed = urlparse(self.path)
+            return [p for p in parsed.path.split('/') if p], parse_qs(parsed.query)
+
+        def do_GET(self):
+            parts, query = self._parts()
+            if parts == ['health']:
+                import llm_transport
+                self._send(200, {
+                    'status': 'ok',
+                    'uptime_seconds': round(time.time() - (service.started_at or time.time()), 1),
+                    'workers': service.workers,
+                    'jobs': service.queue.counts(),
+                    'llm': llm_transport.get_transport().metrics() if config.LLM_TRANSPORT_ENABLED else {},
+                })
+            elif parts == ['jobs']:
+                self._send(200, service.queue.list(status=query.get('status', [None])[0]))
+            elif len(parts) in (2, 3) and parts[0] == 'jobs':
+                job = service.queue.get(parts[1])
+                if job is None:
+                    self._send(404, {'error': 'job not found'})
+                elif len(parts) == 2:
+                    self._send(200, job)
+                elif parts[2] == 'result':
+                    self._send_result(job)
+                else:
+                    self._send(404, {'error': 'not found'})
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def _send_result(self, job: dict):
+            if job['status'] != 'done':
+                self._send(409, {'error': f"job is {job['status']}", 'job': job})
+                return
+            result = dict(job['result'])
+            try:
+                with open(result['blueprint_path'], 'r', encoding='utf-8') as f:
+                    result['blueprint'] = f.read()
+            except OSError:
+                result['blueprint'] = None
+            self._send(200, result)
+
+        def do_POST(self):
+            parts, _ = self._parts()
+            if parts != ['jobs']:
+                self._send(404, {'error': 'not found'})
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                params = _validate_job(payload)
+                priority = int(payload.get('priority', 0))
+            except (ValueError, TypeError) as e:
+                self._send(400, {'error': str(e)})
+                return
+            job_id = service.queue.submit(params, priority)
+            self._send(202, {'id': job_id, 'status': 'queued'})
+
+        def do_DELETE(self):
+            parts, _ = self._parts()
+            if len(parts) == 2 and parts[0] == 'jobs':
+                if service.queue.cancel(parts[1]):
+                    self._send(200, {'id': parts[1], 'status': 'cancelled'})
+                else:
+                    self._send(409, {'error': 'job not found or already started'})
+            else:
+                self._send(404, {'error': 'not found'})
+
+    return Handler
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve(host: str = None, port: int = None, socket_path: str = None, workers: int = None):
+    """Start workers and serve the HTTP API until interrupted."""
+    service = PipelineService(workers=workers)
+    service.start()
+    handler = make_handler(service)
+
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, handler)
+        print(f"[SERVICE] Listening on unix:{socket_path} ({service.workers} worker(s))")
+    else:
+        server = ThreadingHTTPServer((host or config.SERVICE_HOST, port or config.SERVICE_PORT), handler)
+        server.daemon_threads = True
+        print(f"[SERVICE] Listening on http://{server.server_address[0]}:{server.server_address[1]} "
+              f"({service.workers} worker(s))")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[SERVICE] Shutting down")
+    finally:
+        service.stop()
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Research paper → slide deck pipeline service")
+    parser.add_argument('--host', default=None, help=f"Bind address (default {config.SERVICE_HOST})")
+    parser.add_argument('--port', type=int, default=None, help=f"TCP port (default {config.SERVICE_PORT})")
+    parser.add_argument('--socket', default=None, help="Serve on a Unix socket instead of TCP")
+    parser.add_argument('--workers', type=int, default=None, help="Concurrent pipeline jobs")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.socket, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,48 +1,96 @@
 """Organize slides in logical presentation order."""
 import re
+from collections import Counter, defaultdict
+import config
+
+# Standard research presentation order
+SECTION_ORDER = {
+    'introduction': 1, 'background': 2, 'methodology': 3, 'experimental': 4,
+    'results': 5, 'discussion': 6, 'conclusion': 7, 'other': 3.5,
+}
+
+# Keyword fast path: title words are decisive, content words only a hint
+_TITLE_RULES = [
+    ('introduction', ['introduction', 'intro', 'overview', 'abstract']),
+    ('background', ['background', 'related work', 'motivation', 'problem', 'prior work']),
+    ('methodology', ['method', 'approach', 'architecture', 'model', 'design', 'proposed', 'algorithm']),
+    ('experimental', ['experiment', 'evaluation', 'setup', 'implementation', 'training']),
+    ('results', ['result', 'performance', 'comparison', 'analysis', 'findings']),
+    ('discussion', ['discussion', 'limitation', 'future work', 'implication']),
+    ('conclusion', ['conclusion', 'summary', 'takeaway']),
+]
+_CONTENT_RULES = [
+    ('methodology', ['architecture', 'model', 'layer', 'network']),
+    ('results', ['accuracy', 'performance', 'outperform', 'score']),
+    ('experimental', ['training', 'optimizer', 'hyperparameter', 'epoch']),
+    ('discussion', ['limitation', 'future', 'improve']),
+]
+
+# What each section is about, embedded once and compared against every slide
+SECTION_PROTOTYPES = {
+    'introduction': "Introduction and overview: the problem this paper addresses, its motivation and main contributions.",
+    'background': "Background and related work: prior approaches, existing methods and their limitations.",
+    'methodology': "Method: the proposed model architecture, algorithm, components and how the approach works.",
+    'experimental': "Experimental setup: datasets, training details, hyperparameters, baselines and evaluation metrics.",
+    'results': "Results: quantitative performance, accuracy and scores compared with baselines, ablations.",
+    'discussion': "Discussion: analysis of findings, limitations, implications and future work.",
+    'conclusion': "Conclusion: summary of the key takeaways and contributions of the paper.",
+}
+_prototypes = None
+
+def _keyword_class(title_lower, content):
+    """(type, confidence) from the keyword rules; confidence 1.0 for an unambiguous title match."""
+    matches = [slide_type for slide_type, words in _TITLE_RULES if any(word in title_lower for word in words)]
+    if matches:
+        # "Experimental Results" names two sections: first rule wins, but let embeddings decide
+        return matches[0], 1.0 if len(matches) == 1 else 0.75
+    for slide_type, words in _CONTENT_RULES:
+        if any(word in content for word in words):
+            return slide_type, 0.5
+    return 'other', 0.0
 
 def classify_slide(title, bullets):
-    """Classify slide type based on title and content."""
-    title_lower = title.lower()
-    content = ' '.join(bullets).lower()
-    
-    # Classification rules - following standard research presentation structure
-    if any(word in title_lower for word in ['introduction', 'intro', 'overview', 'abstract']):
-        return 'introduction', 1
-    
-    if any(word in title_lower for word in ['background', 'related work', 'motivation', 'problem', 'prior work']):
-        return 'background', 2
-    
-    if any(word in title_lower for word in ['method', 'approach', 'architecture', 'model', 'design', 'proposed', 'algorithm']):
-        return 'methodology', 3
-    
-    if any(word in title_lower for word in ['experiment', 'evaluation', 'setup', 'implementation', 'training']):
-        return 'experimental', 4
-    
-    if any(word in title_lower for word in ['result', 'performance', 'comparison', 'analysis', 'findings']):
-        return 'results', 5
-    
-    if any(word in title_lower for word in ['discussion', 'limitation', 'future work', 'implication']):
-        return 'discussion', 6
-    
-    if any(word in title_lower for word in ['conclusion', 'summary', 'takeaway']):
-        return 'conclusion', 7
-    
-    # Content-based classification if title is ambiguous
-    if 'architecture' in content or 'model' in content or 'layer' in content or 'network' in content:
-        return 'methodology', 3
-    
-    if 'accuracy' in content or 'performance' in content or 'outperform' in content or 'score' in content:
-        return 'results', 5
-    
-    if 'training' in content or 'optimizer' in content or 'hyperparameter' in content or 'epoch' in content:
-        return 'experimental', 4
-    
-    if 'limitation' in content or 'future' in content or 'improve' in content:
-        return 'discussion', 6
-    
-    # Default to methodology if unclear
-    return 'other', 3.5
+    """Classify slide type based on title and content (keyword rules only)."""
+    slide_type, _ = _keyword_class(title.lower(), ' '.join(bullets).lower())
+    return slide_type, SECTION_ORDER[slide_type]
+
+def _prototype_vectors():
+    global _prototypes
+    if _prototypes is None:
+        import embeddings
+        _prototypes = embeddings.encode(list(SECTION_PROTOTYPES.values()))
+    return _prototypes
+
+def classify_slides(slides, use_embeddings=None):
+    """Classify a whole deck: [(type, order, confidence)] per slide.
+    
+    Slides whose title names their section are settled by the keyword rules.
+    The rest are embedded in one batch and scored against the section
+    prototypes with a single matrix multiply; the prototype wins when its
+    cosine similarity reaches SLIDE_CLASSIFY_MIN_SIMILARITY.
+    """
+    if use_embeddings is None:
+        use_embeddings = config.SLIDE_CLASSIFY_EMBEDDINGS
+    results = []
+    pending = []
+    for i, slide in enumerate(slides):
+        slide_type, confidence = _keyword_class(slide['title'].lower(), ' '.join(slide['bullets']).lower())
+        results.append((slide_type, SECTION_ORDER[slide_type], confidence))
+        if confidence < 1.0:
+            pending.append(i)
+    
+    if use_embeddings and pending:
+        import embeddings
+        vectors = embeddings.encode([f"{slides[i]['title']}. {' '.join(slides[i]['bullets'])}" for i in pending])
+        prototypes = _prototype_vectors() if vectors is not None else None
+        if prototypes is not None:
+            scores = vectors @ prototypes.T
+            names = list(SECTION_PROTOTYPES)
+            for i, row in zip(pending, scores):
+                best = int(row.argmax())
+                if row[best] >= config.SLIDE_CLASSIFY_MIN_SIMILARITY:
+                    results[i] = (names[best], SECTION_ORDER[names[best]], round(float(row[best]), 3))
+    return results
 
 def reorder_slides(slides):
     """Reorder slides in logical presentation flow: Introduction → Background → Methodology → Experimental Results → Discussion → Conclusion."""
@@ -51,12 +99,12 @@ def reorder_slides(slides):
     
     # Classify each slide
     classified = []
-    for i, slide in enumerate(slides):
-        slide_type, order = classify_slide(slide['title'], slide['bullets'])
+    for i, (slide, (slide_type, order, confidence)) in enumerate(zip(slides, classify_slides(slides))):
         classified.append({
             'slide': slide,
             'type': slide_type,
             'order': order,
+            'confidence': confidence,
             'original_index': i
         })
     
@@ -74,54 +122,78 @@ def reorder_slides(slides):
         if item['type'] != current_section:
             current_section = item['type']
             print(f"\n  {current_section.upper()}:")
-        print(f"    {i+1}. {item['slide']['title'][:60]}")
+        print(f"    {i+1}. {item['slide']['title'][:60]} ({item['confidence']:.2f})")
     
     return reordered
 
-def merge_duplicate_sections(slides):
-    """Merge slides with similar titles/sections."""
+def _title_tokens(title):
+    return frozenset(title.lower().split())
+
+def _bullet_key(bullet):
+    """Bullets differing only in case, spacing or trailing punctuation are duplicates."""
+    return hash(' '.join(re.sub(r'[^\w%.\s-]', ' ', bullet.lower()).split()).strip(' .'))
+
+def merge_duplicate_sections(slides, near_duplicates=None):
+    """Merge slides with similar titles/sections.
+    
+    A slide is merged into the earliest kept slide whose title word-set Jaccard
+    similarity exceeds SLIDE_MERGE_TITLE_SIMILARITY. Candidates come from an
+    inverted index over title words, so only slides sharing a word are compared.
+    With near_duplicates (SLIDE_MERGE_NEAR_DUPLICATES), bullets whose embeddings
+    are within SLIDE_MERGE_BULLET_SIMILARITY of a kept bullet are dropped too.
+    """
     if not slides:
         return slides
-    
-    merged = []
-    skip_indices = set()
-    
-    for i, slide in enumerate(slides):
-        if i in skip_indices:
-            continue
-        
-        # Check if next slide is similar
-        current_title = slide['title'].lower()
-        current_bullets = slide['bullets'][:]
+    if near_duplicates is None:
+        near_duplicates = config.SLIDE_MERGE_NEAR_DUPLICATES
+    
+    # Embed every bullet once up front (None if embeddings are unavailable)
+    vectors = None
+    if near_duplicates:
+        import embeddings
+        vectors = embeddings.encode([b for slide in slides for b in slide['bullets']])
+    
+    kept = []           # [slide index, title tokens, bullets, bullet keys, bullet vector ids]
+    index = defaultdict(list)  # title word -> positions in kept
+    offset = 0
+    for j, slide in enumerate(slides):
+        tokens = _title_tokens(slide['title'])
+        overlap = Counter(k for token in tokens for k in index[token])
+        target = None
+        for k in sorted(overlap):
+            other = kept[k][1]
+            if overlap[k] / (len(tokens) + len(other) - overlap[k]) > config.SLIDE_MERGE_TITLE_SIMILARITY:
+                target = kept[k]
+                break
+        if target is None:
+            target = [j, tokens, [], set(), []]
+            for token in tokens:
+                index[token].append(len(kept))
+            kept.append(target)
+        else:
+            print(f"  ℹ️  Merged duplicate: '{slide['title']}' into '{slides[target[0]]['title']}'")
         
-        for j in range(i + 1, len(slides)):
-            if j in skip_indices:
+        # Merge bullets (exact duplicates by normalised hash, near duplicates by cosine similarity)
+        for n, bullet in enumerate(slide['bullets']):
+            key = _bullet_key(bullet)
+            if key in target[3]:
                 continue
-            
-            next_title = slides[j]['title'].lower()
-            
-            # Check for similar titles
-            similarity = similar_titles(current_title, next_title)
-            if similarity > 0.7:
-                # Merge bullets
-                for bullet in slides[j]['bullets']:
-                    if bullet not in current_bullets:
-                        current_bullets.append(bullet)
-                skip_indices.add(j)
-                print(f"  ℹ️  Merged duplicate: '{slides[j]['title']}' into '{slide['title']}'")
-        
-        # Add merged slide (limit bullets to 3-4, keep most important)
-        merged.append({
-            'title': slide['title'],
-            'bullets': current_bullets[:4]
-        })
-    
-    return merged
+            vector_id = offset + n
+            if vectors is not None and target[4]:
+                if float((vectors[target[4]] @ vectors[vector_id]).max()) >= config.SLIDE_MERGE_BULLET_SIMILARITY:
+                    continue
+            target[2].append(bullet)
+            target[3].add(key)
+            target[4].append(vector_id)
+        offset += len(slide['bullets'])
+    
+    # Merged slides keep their position; limit bullets to 3-4, keep most important
+    return [{'title': slides[j]['title'], 'bullets': bullets[:4]} for j, _, bullets, _, _ in kept]
 
 def similar_titles(title1, title2):
     """Calculate similarity between two titles."""
-    words1 = set(title1.split())
-    words2 = set(title2.split())
+    words1 = _title_tokens(title1)
+    words2 = _title_tokens(title2)
     
     if not words1 or not words2:
         return 0.0
@@ -0,0 +1,218 @@
+"""Lightweight deck formats rendered from the same slide model as the PPTX.
+
+plan_deck() (pptx_generator) turns a blueprint into slides with their figure,
+tables and notes; the renderers here write that model as Marp Markdown, a
+reveal.js HTML page or a PDF (PyMuPDF). Markdown and HTML link figures by
+their path relative to the output file instead of copying them, so every
+format shares the images extracted once for the deck. They take milliseconds
+and are written before the PPTX, so a preview exists while it is built.
+"""
+import html
+import os
+import config
+from table_extractor import table_rows
+from text_fit import fit_bullets, fit_title, font_path
+
+_PAGE = (720, 540)  # PDF page size in points (10 x 7.5 in, as the PPTX)
+
+
+def _relative(path: str, output_path: str) -> str:
+    """Figure path as referenced from the output file (forward slashes for Markdown/HTML)."""
+    start = os.path.dirname(os.path.abspath(output_path))
+    return os.path.relpath(os.path.abspath(path), start).replace(os.sep, '/')
+
+
+def _rows(table: dict) -> list:
+    """Table rows as shown on a slide: the header plus at most TABLE_MAX_ROWS rows of TABLE_MAX_COLS columns."""
+    return [row[:config.TABLE_MAX_COLS] for row in table_rows(table)[:config.TABLE_MAX_ROWS + 1]]
+
+
+def _write(output_path: str, text: str) -> str:
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return output_path
+
+
+def render_markdown(deck: dict, title: str, output_path: str) -> str:
+    """Marp Markdown: one '---'-separated slide each, notes as HTML comments (Marp's presenter notes)."""
+    def notes(text):
+        return [f"<!--\n{text.replace('--', '- -')}\n-->"] if text else []
+
+    def cell(text):
+        return text.replace('|', '\\|')
+
+    parts = [f"---\nmarp: true\npaginate: true\n---\n\n<!-- _class: lead -->\n\n# {title}"]
+    for slide in deck['slides']:
+        lines = [f"## {slide['title']}", ""] + [f"- {bullet}" for bullet in slide['bullets']]
+        if slide['image']:
+            lines += ["", f"![bg right:40% contain]({_relative(slide['image'], output_path)})"]
+        parts.append("\n".join(lines + [""] + notes(slide['notes'])).rstrip())
+        for table in slide['tables']:
+            rows = _rows(table)
+            lines = [f"## {slide['title']} - Table {table['number']}", "",
+                     "| " + " | ".join(cell(c) for c in rows[0]) + " |",
+                     "| " + " | ".join("---:" if numeric else "---" for numeric in table['numeric'][:len(rows[0])]) + " |"]
+            lines += ["| " + " | ".join(cell(c) for c in row) + " |" for row in rows[1:]]
+            if table.get('caption'):
+                lines += ["", f"*{table['caption']}*"]
+            parts.append("\n".join(lines))
+    if deck['qa']:
+        parts.append("## Questions & Discussion\n\n" + "\n\n".join(
+            f"**{qa.split(chr(10))[0]}**  \n{qa.split(chr(10), 1)[-1]}" for qa in deck['qa']))
+    return _write(output_path, "\n\n---\n\n".join(parts) + "\n")
+
+
+def render_html(deck: dict, title: str, output_path: str) -> str:
+    """Single reveal.js page (loaded from REVEAL_JS_URL); speaker view notes in <aside class="notes">."""
+    e = html.escape
+    sections = [f"<section><h1>{e(title)}</h1></section>"]
+    for slide in deck['slides']:
+        body = "".join(f"<li>{e(bullet)}</li>" for bullet in slide['bullets'])
+        figure = (f'<img src="{e(_relative(slide["image"], output_path))}" alt="">' if slide['image'] else "")
+        notes = f'<aside class="notes">{e(slide["notes"])}</aside>' if slide['notes'] else ""
+        sections.append(f'<section><h2>{e(slide["title"])}</h2><div class="{"split" if figure else ""}">'
+                        f'<ul>{body}</ul>{figure}</div>{notes}</section>')
+        for table in slide['tables']:
+            rows = _rows(table)
+            head = "".join(f"<th>{e(c)}</th>" for c in rows[0])
+            body = "".join("<tr>" + "".join(f'<td class="{"num" if table["numeric"][i] else ""}">{e(c)}</td>'
+                                            for i, c in enumerate(row)) + "</tr>" for row in rows[1:])
+            sections.append(f'<section><h2>{e(slide["title"])} - Table {e(str(table["number"]))}</h2>'
+                            f'<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>'
+                            f'<p class="caption">{e(table.get("caption") or "")}</p></section>')
+    if deck['qa']:
+        items = "".join(f"<li>{e(qa).replace(chr(10), '<br>')}</li>" for qa in deck['qa'])
+        sections.append(f"<section><h2>Questions &amp; Discussion</h2><ul>{items}</ul></section>")
+    page = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{e(title)}</title>
+<link rel="stylesheet" href="{config.REVEAL_JS_URL}/dist/reveal.css">
+<link rel="stylesheet" href="{config.REVEAL_JS_URL}/dist/theme/white.css">
+<style>
+.reveal h2 {{ font-size: 1.2em; }}
+.reveal ul {{ font-size: 0.6em; }}
+.reveal .split {{ display: flex; gap: 1em; align-items: flex-start; }}
+.reveal .split ul {{ flex: 1; }}
+.reveal .split img {{ max-width: 45%; max-height: 70vh; }}
+.reveal table {{ font-size: 0.5em; }}
+.reveal td.num {{ text-align: right; }}
+.reveal .caption {{ font-size: 0.4em; font-style: italic; }}
+</style>
+</head>
+<body>
+<div class="reveal"><div class="slides">
+{chr(10).join(sections)}
+</div></div>
+<script src="{config.REVEAL_JS_URL}/dist/reveal.js"></script>
+<script src="{config.REVEAL_JS_URL}/plugin/notes/notes.js"></script>
+<script>Reveal.initialize({{hash: true, plugins: [RevealNotes]}});</script>
+</body>
+</html>
+"""
+    return _write(output_path, page)
+
+
+def _textbox(page, rect, text: str, size: float, bold: bool = False, **kwargs):
+    """insert_textbox in the font text_fit measures with; steps the size down until the text fits.
+
+    (insert_textbox writes nothing when the text overflows.)
+    """
+    path = font_path(bold)
+    if 'fontname' not in kwargs:
+        kwargs.update({'fontname': 'bold', 'fontfile': path} if path and bold else
+                      {'fontname': 'body', 'fontfile': path} if path else
+                      {'fontname': 'hebo' if bold else 'helv'})  # Built-in Helvetica: Latin text only
+    while page.insert_textbox(rect, text, fontsize=size, **kwargs) < 0 and size > 6:
+        size -= 1
+
+
+def render_pdf(deck: dict, title: str, output_path: str) -> str:
+    """PDF via PyMuPDF with the PPTX layout: title bar, bullets, figure on the right.
+
+    A PDF cannot link images, so each figure is embedded once and reused by xref.
+    """
+    import fitz
+    width, height = _PAGE
+    document = fitz.open()
+    xrefs = {}
+
+    def new_page(heading, size=None):
+        page = document.new_page(width=width, height=height)
+        page.draw_rect(fitz.Rect(0, 0, width, 58), color=None, fill=(0, 0, 0))
+        size = size or fit_title(heading, 648, 47, *config.TITLE_FONT_SIZES)
+        _textbox(page, fitz.Rect(36, 10, 684, 56), heading, size, bold=True, color=(1, 1, 1))
+        return page
+
+    page = document.new_page(width=width, height=height)
+    _textbox(page, fitz.Rect(54, 190, 666, 330), title, 36, bold=True, align=fitz.TEXT_ALIGN_CENTER)
+    for slide in deck['slides']:
+        page = new_page(slide['title'])
+        image = slide['image'] if slide['image'] and os.path.exists(slide['image']) else None
+        text_width = 324 if image else 612
+        size, _ = fit_bullets(tuple(slide['bullets']), text_width, 396, *config.BULLET_FONT_SIZES)
+        _textbox(page, fitz.Rect(72, 86, 72 + text_width, 482), "\n".join(f"• {b}" for b in slide['bullets']),
+                 size, lineheight=1.3)
+        if image:
+            try:
+                xrefs[image] = page.insert_image(fitz.Rect(374, 108, 684, 504), filename=image,
+                                                 xref=xrefs.get(image, 0))
+            except Exception as e:
+                print(f"Could not add image: {e}")
+        if slide['notes']:
+            page.add_text_annot(fitz.Point(700, 520), slide['notes'])
+        for table in slide['tables']:
+            page = new_page(f"{slide['title']} - Table {table['number']}")
+            rows = _rows(table)
+            widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+            lines = ["  ".join(c.rjust(w) if table['numeric'][i] else c.ljust(w)
+                               for i, (c, w) in enumerate(zip(row, widths))) for row in rows]
+            _textbox(page, fitz.Rect(54, 86, 666, 470), "\n".join(lines), 14, fontname='cour')
+            _textbox(page, fitz.Rect(54, 478, 666, 520), table.get('caption') or "", 11)
+    if deck['qa']:
+        page = new_page("Questions & Discussion")
+        _textbox(page, fitz.Rect(72, 86, 648, 504), "\n\n".join(deck['qa']), 16)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    document.subset_fonts()  # Embed only the glyphs used, not the whole TTF
+    document.save(output_path, garbage=1, deflate=True)
+    document.close()
+    return output_path
+
+
+RENDERERS = {'md': render_markdown, 'html': render_html, 'pdf': render_pdf}
+
+
+def render_previews(deck: dict, title: str, base_path: str, formats: list) -> dict:
+    """Write each requested format ('md', 'html', 'pdf') as base_path + '.' + format: {format: path}."""
+    return {fmt: RENDERERS[fmt](deck, title, f"{base_path}.{fmt}") for fmt in formats if fmt in RENDERERS}
+
+
+if __name__ == '__main__':
+    # Test
+    import sys
+    import tempfile
+    import time
+    from pptx_generator import plan_deck
+    blueprint = """SLIDES:
+1. **Attention Is All You Need**
+   - Introduces the Transformer, built only on self-attention
+   - Achieves 28.4 BLEU on WMT 2014 English-German (Table 2)
+2. **Results**
+   - Outperforms recurrent baselines at a fraction of the training cost
+
+**Presenter Notes:**
+Slide 1: Start from the limits of recurrence.
+What is self-attention?
++ Every token attends to every other token in one step.
+"""
+    tables = [{'number': '2', 'caption': 'BLEU on newstest2014', 'header': ['Model', 'BLEU'],
+               'columns': [['ByteNet', 'Transformer'], ['23.75', '28.4']], 'numeric': [False, True], 'n_rows': 2}]
+    images = [{'path': sys.argv[1]}] if len(sys.argv) > 1 else []
+    deck = plan_deck(blueprint, images, tables)
+    output_dir = tempfile.mkdtemp(prefix='previews-')
+    for fmt in RENDERERS:
+        start = time.perf_counter()
+        path = render_previews(deck, 'Attention Is All You Need', os.path.join(output_dir, 'preview'), [fmt])[fmt]
+        print(f"{fmt}: {path} in {(time.perf_counter() - start) * 1000:.1f}ms")
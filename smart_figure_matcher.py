@@ -68,10 +68,21 @@ def analyze_image_type(image_path):
     except:
         return ['unknown']
 
-def match_slide_to_figure(slide_title, slide_bullets, slide_num, recommendations, available_images, paper_keywords=None):
+def match_slide_to_figure(slide_title, slide_bullets, slide_num, recommendations, available_images, paper_keywords=None,
+                          caption_index=None):
     """Match a slide to the most relevant figure - ONLY if truly relevant."""
     slide_content = f"{slide_title} {' '.join(slide_bullets)}".lower()
     
+    # Figures cited by number resolve directly through the caption index
+    if caption_index is not None:
+        cited = re.findall(r'figure\s*(\d+)', slide_content)
+        for rec in recommendations.get(slide_num, []):
+            cited += re.findall(r'figure\s*(\d+)', rec['line'], re.IGNORECASE)
+        for fig_num in cited:
+            entry = caption_index.figure(fig_num)
+            if entry and entry.get('image') in available_images:
+                return entry['image'], 'cited'
+    
     # Extract paper-specific keywords (model names, techniques)
     if paper_keywords is None:
         paper_keywords = []
@@ -81,7 +92,7 @@ def match_slide_to_figure(slide_title, slide_bullets, slide_num, recommendations
         for rec in recommendations[slide_num]:
             # Look for figure numbers mentioned
             fig_match = re.search(r'figure\s*(\d+)', rec['line'], re.IGNORECASE)
-            if fig_match:
+            if fig_match and caption_index is None:
                 fig_num = fig_match.group(1)
                 # Find image with this figure number
                 for img_path in available_images:
@@ -153,10 +164,17 @@ def match_slide_to_figure(slide_title, slide_bullets, slide_num, recommendations
     
     return None, 'no_match'
 
-def smart_match_figures(slides, image_folder='extracted_figures', blueprint_text=''):
-    """Intelligently match figures to slides."""
+def smart_match_figures(slides, image_folder='extracted_figures', blueprint_text='', caption_index=None):
+    """Intelligently match figures to slides.
+    
+    caption_index (CaptionIndex with linked images) maps cited figure numbers
+    straight to their images.
+    """
     # Get all available images
     image_files = sorted(glob.glob(f'{image_folder}/*.png'))
+    if caption_index is not None:
+        image_files += [c['image'] for c in caption_index
+                        if c.get('image') and c['image'] not in image_files and os.path.exists(c['image'])]
     
     if not image_files:
         print(f"⚠️  No images found in {image_folder}/")
@@ -195,7 +213,7 @@ def smart_match_figures(slides, image_folder='extracted_figures', blueprint_text
         
         # Match
         matched_img, reason = match_slide_to_figure(
-            title, bullets, slide_num, recommendations, available, paper_keywords
+            title, bullets, slide_num, recommendations, available, paper_keywords, caption_index
         )
         
         if matched_img:
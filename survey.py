@@ -0,0 +1,218 @@
+"""Survey decks: one presentation synthesised from many related papers.
+
+Each paper is ingested and summarised concurrently (reusing stored outputs of
+earlier runs), then all papers go into one shared passage index. Every slide
+topic is drafted from its own top-ranked evidence plus short paper digests, so
+the LLM never sees the whole corpus at once. A final compilation task merges
+the topic drafts into the deck.
+
+Usage:
+    python survey.py paper1.pdf paper2.pdf 2301.07041 --title "Efficient Transformers"
+    python survey.py papers/*.pdf --slides 15 --style detailed --topics "Attention variants;Memory cost"
+"""
+import argparse
+import contextvars
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from crewai import Crew, Process
+from rich.console import Console
+import config
+import llm_cache
+import llm_replay
+import llm_transport
+from agents import structuring_agent, compilation_agent
+from checkpoint import ArtifactStore, stage_fingerprint
+from instrumentation import Tracer
+from passage_index import PassageIndex
+from pipeline import ResearchPaperPipeline, llm_identity
+from pptx_generator import generate_pptx_from_deck, plan_deck
+from slide_renderers import render_previews
+from tasks import create_survey_topic_task, create_survey_compilation_task
+from utils import save_output, ensure_output_directory
+
+console = Console()
+
+# Default slide topics and the retrieval queries behind them
+DEFAULT_TOPICS = {
+    'Problem and motivation': 'problem challenge motivation limitation existing approaches gap',
+    'Methods and architectures': 'method approach architecture model framework algorithm propose',
+    'Datasets and experimental setup': 'dataset benchmark experimental setup evaluation metric baseline training',
+    'Quantitative results': 'results accuracy performance improvement outperforms score achieves compared',
+    'Limitations and open problems': 'limitation future work open problem fails drawback cost',
+}
+
+
+def looks_like_arxiv(paper_input: str) -> bool:
+    """Same heuristic as main.py."""
+    return "arxiv" in paper_input.lower() or (
+        len(paper_input.split('.')) == 2 and paper_input.replace('.', '').isdigit()
+    )
+
+
+def _submit(pool, fn, *args):
+    """Submit fn with a copy of the caller's context, so LLM tokens reach the active tracer."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+class SurveyPipeline:
+    """Builds one survey deck from many papers."""
+
+    def __init__(self, paper_inputs: list, title: str = None, target_slides: int = None,
+                 style: str = "concise", topics: list = None, workers: int = None, output_dir: str = None):
+        self.paper_inputs = paper_inputs
+        self.title = title or "Survey of Related Work"
+        self.target_slides = target_slides
+        self.style = style
+        self.topics = {t: t for t in topics} if topics else DEFAULT_TOPICS
+        self.workers = workers or config.SURVEY_WORKERS
+        self.output_dir = output_dir or config.OUTPUT_DIR
+        self.papers = []
+        self.index = PassageIndex()
+        self.artifacts = ArtifactStore() if config.INCREMENTAL_ENABLED else None
+        self.tracer = Tracer('survey', trace_memory=config.TRACE_MEMORY)
+
+    def run(self) -> str:
+        console.print(f"\n[bold cyan]📚 Survey deck from {len(self.paper_inputs)} papers[/bold cyan]\n")
+        self.tracer.activate()
+        try:
+            with self.tracer.span('papers', papers=len(self.paper_inputs)):
+                self._prepare_papers()
+            with self.tracer.span('passage_index') as span:
+                for paper in self.papers:
+                    self.index.add_document(paper['id'], paper['title'], paper['sections'])
+                self.index.search('warm up')  # Builds the postings arrays
+                span.attrs.update(self.index.stats())
+            console.print(f"[green]✓[/green] Indexed {self.index.stats()['passages']} passages\n")
+
+            with self.tracer.span('topics', topics=len(self.topics)):
+                drafts = self._draft_topics()
+            with self.tracer.span('compilation'):
+                blueprint = self._compile(drafts)
+            with self.tracer.span('pptx'):
+                self.pptx_path = self._save(blueprint, drafts)
+        finally:
+            self.tracer.deactivate()
+            ensure_output_directory(self.output_dir)
+            self.tracer.write_report(os.path.join(self.output_dir, config.RUN_REPORT_OUTPUT))
+        llm_cache.report()
+        llm_transport.report()
+        llm_replay.report()
+        console.print(f"[bold green]✨ Survey deck generated: {self.pptx_path or self.output_dir}[/bold green]\n")
+        return blueprint
+
+    def _prepare_papers(self):
+        """Ingest and summarise every paper concurrently; failed papers are skipped."""
+        def prepare(number, paper_input):
+            pipe = ResearchPaperPipeline(paper_input, is_arxiv=looks_like_arxiv(paper_input),
+                                         show_progress=False, checkpoint=False)
+            pipe.prepare()
+            summary = pipe.summarize()
+            title = pipe.paper_title if pipe.paper_title != "Research Paper" else os.path.basename(pipe.paper_path)
+            return {
+                'id': f"P{number}",
+                'input': paper_input,
+                'title': title,
+                'sections': pipe.sections,
+                'summary': summary,
+                'summary_fingerprint': pipe._fingerprint('task:summarization'),
+            }
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [_submit(pool, prepare, i, p) for i, p in enumerate(self.paper_inputs, 1)]
+            for paper_input, future in zip(self.paper_inputs, futures):
+                try:
+                    paper = future.result()
+                except Exception as e:
+                    console.print(f"[yellow]⚠️  Skipping {paper_input}: {e}[/yellow]")
+                    continue
+                self.papers.append(paper)
+                console.print(f"[green]✓[/green] {paper['id']}: {paper['title']}")
+        if not self.papers:
+            raise RuntimeError("No paper could be ingested")
+        console.print()
+
+    def _digest(self) -> str:
+        """One short line per paper: the only whole-corpus context any task receives."""
+        return "\n        ".join(
+            f"[{p['id']}] {p['title']}: {' '.join(p['summary'].split())[:config.SURVEY_DIGEST_CHARS]}"
+            for p in self.papers
+        )
+
+    def _draft_topics(self) -> list:
+        """Retrieve evidence and draft every topic's slides concurrently."""
+        digest = self._digest()
+
+        def draft(topic, query):
+            hits = self.index.search(f"{topic} {query}", k=config.SURVEY_EVIDENCE_PER_TOPIC,
+                                     per_doc=config.SURVEY_EVIDENCE_PER_PAPER)
+            evidence = "\n        ".join(f"[{h['doc_id']}] ({h['section']}) {h['text']}" for h in hits)
+            slides = self._cached_task('survey:topic', {'topic': topic, 'digest': digest, 'evidence': evidence},
+                                       lambda: create_survey_topic_task(topic, digest, evidence, self.style),
+                                       structuring_agent)
+            return {'topic': topic, 'evidence': hits, 'slides': slides}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [_submit(pool, draft, topic, query) for topic, query in self.topics.items()]
+            return [future.result() for future in futures]
+
+    def _compile(self, drafts: list) -> str:
+        topic_drafts = "\n\n".join(f"=== {d['topic'].upper()} ===\n{d['slides']}" for d in drafts)
+        paper_list = "\n        ".join(f"[{p['id']}] {p['title']}" for p in self.papers)
+        return self._cached_task(
+            'survey:compilation',
+            {'title': self.title, 'drafts': topic_drafts, 'papers': paper_list, 'target_slides': self.target_slides},
+            lambda: create_survey_compilation_task(self.title, topic_drafts, paper_list,
+                                                   self.style, self.target_slides),
+            compilation_agent)
+
+    def _cached_task(self, stage: str, inputs: dict, make_task, agent) -> str:
+        """Run a single-task crew unless an earlier run stored output for the same inputs."""
+        fingerprint = stage_fingerprint(stage, [p['summary_fingerprint'] for p in self.papers],
+                                        dict(inputs, style=self.style, llm=llm_identity()))
+        stored = self.artifacts.get(fingerprint) if self.artifacts else None
+        if stored is not None:
+            return stored['raw']
+        task = make_task()
+        task.agent = agent.copy()
+        raw = Crew(agents=[task.agent], tasks=[task], process=Process.sequential, verbose=False).kickoff().raw
+        if self.artifacts:
+            self.artifacts.put(fingerprint, stage, {'raw': raw})
+        return raw
+
+    def _save(self, blueprint: str, drafts: list) -> str:
+        save_output(config.SURVEY_OUTPUT, blueprint, self.output_dir)
+        evidence = {
+            'title': self.title,
+            'papers': [{k: p[k] for k in ('id', 'input', 'title')} for p in self.papers],
+            'topics': [{'topic': d['topic'], 'evidence': d['evidence']} for d in drafts],
+        }
+        save_output(config.SURVEY_EVIDENCE_OUTPUT, json.dumps(evidence, indent=2), self.output_dir)
+        pptx_path = os.path.join(self.output_dir, 'survey.pptx')
+        deck = plan_deck(blueprint, [])
+        render_previews(deck, self.title, os.path.splitext(pptx_path)[0],
+                        [fmt for fmt in config.OUTPUT_FORMATS if fmt != 'pptx'])
+        if 'pptx' not in config.OUTPUT_FORMATS:
+            return None
+        generate_pptx_from_deck(deck, pptx_path, self.title)
+        return pptx_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate one survey deck from many papers")
+    parser.add_argument('papers', nargs='+', help="PDF/TXT paths or arXiv IDs/URLs")
+    parser.add_argument('--title', default=None, help="Survey title (first slide)")
+    parser.add_argument('--slides', type=int, default=None, help="Target number of slides")
+    parser.add_argument('--style', default='concise', choices=['concise', 'detailed', 'teaching'])
+    parser.add_argument('--topics', default=None, help="Semicolon-separated slide topics (default: built-in set)")
+    parser.add_argument('--workers', type=int, default=None, help="Papers processed concurrently")
+    parser.add_argument('--output-dir', default=None)
+    args = parser.parse_args()
+
+    topics = [t.strip() for t in args.topics.split(';') if t.strip()] if args.topics else None
+    SurveyPipeline(args.papers, args.title, args.slides, args.style, topics,
+                   args.workers, args.output_dir).run()
+
+
+if __name__ == '__main__':
+    main()
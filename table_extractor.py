@@ -0,0 +1,178 @@
+"""Extract tables as structured column data for native PowerPoint tables.
+
+Only pages that carry a table caption are searched. pdfplumber's table finder
+runs on those pages in parallel worker processes: ruled tables first, then
+the text-alignment strategy below the caption for booktabs-style tables that
+have no vertical lines. Results are cached per PDF, keyed by its content
+hash, the captions searched and the extraction settings, so reruns and
+survey decks never parse the same tables twice.
+
+A table is stored column-wise:
+    {'number': '2', 'caption': '...', 'page': 5, 'header': ['Method', 'Acc'],
+     'columns': [['A', 'B'], ['85.1', '86.0']], 'numeric': [False, True]}
+"""
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import config
+
+_NUMBER_RE = re.compile(r'^[-+±]?\(?\d[\d,]*(\.\d+)?\)?\s*(%|[kKMBG]|x|×)?$')
+_TEXT_SETTINGS = {'vertical_strategy': 'text', 'horizontal_strategy': 'text'}
+_RULE_GAP = 150  # Points between consecutive rules of the same table
+_CACHE_VERSION = 1  # Bump when extraction changes, so cached tables are re-extracted
+
+
+def is_numeric(cell: str) -> bool:
+    return bool(_NUMBER_RE.match(cell.replace('*', '').replace('†', '').strip()))
+
+
+def _clean_rows(rows: list) -> list:
+    """Drop empty rows/columns and anything after the table body (running text)."""
+    rows = [[' '.join((cell or '').split()) for cell in row] for row in rows]
+    rows = [row for row in rows if any(row)]
+    if not rows:
+        return []
+    keep = [i for i in range(max(len(r) for r in rows)) if any(i < len(r) and r[i] for r in rows)]
+    rows = [[row[i] if i < len(row) else '' for i in keep] for row in rows]
+    body = []
+    for row in rows:
+        if sum(1 for cell in row if cell) < 2:
+            if len(body) >= 2:
+                break  # A paragraph line: the table has ended
+            continue
+        body.append(row)
+    return body if len(body) >= 2 and len(body[0]) >= 2 else []
+
+
+def to_column_table(rows: list, number: str = None, caption: str = '', page: int = None) -> dict:
+    """Row-major cells -> compact column arrays (first row is the header)."""
+    width = max(len(r) for r in rows)
+    rows = [r + [''] * (width - len(r)) for r in rows]
+    header, body = rows[0], rows[1:]
+    columns = [[row[i] for row in body] for i in range(width)]
+    return {
+        'number': number,
+        'caption': caption,
+        'page': page,
+        'header': header,
+        'columns': columns,
+        'numeric': [bool(col) and sum(is_numeric(c) for c in col if c) > len([c for c in col if c]) / 2
+                    for col in columns],
+        'n_rows': len(body),
+    }
+
+
+def table_rows(table: dict) -> list:
+    """Row-major view of a column table (header first)."""
+    return [table['header']] + [list(row) for row in zip(*table['columns'])]
+
+
+def _extract_page_tables(pdf_path: str, page_number: int, captions: list) -> list:
+    """Worker: tables for the captions on one page (page_number is 1-based)."""
+    import pdfplumber
+    found = []
+    with pdfplumber.open(pdf_path, pages=[page_number]) as pdf:
+        page = pdf.pages[0]
+        ruled = page.find_tables()
+        words = page.extract_words()
+        for caption in captions:
+            # Locate the caption line: "Table" followed by its number
+            anchor = next((w for i, w in enumerate(words[:-1])
+                           if w['text'].lower() == 'table' and words[i + 1]['text'].rstrip(':.|') == caption['number']),
+                          None)
+            top = anchor['bottom'] if anchor else 0
+            below = [t for t in ruled if t.bbox[1] >= top - 2]
+            if below:
+                table = min(below, key=lambda t: t.bbox[1])
+                rows = _clean_rows(table.extract())
+            else:
+                # Search only the caption's column; a caption line crossing the middle means a full-width table
+                middle = page.width / 2
+                line_end = max((w['x1'] for w in words if anchor and abs(w['top'] - anchor['top']) < 2), default=0)
+                if not anchor or (anchor['x0'] < middle and line_end > middle + 20):
+                    left, right = 0, page.width
+                elif anchor['x0'] < middle:
+                    left, right = 0, middle
+                else:
+                    left, right = middle, page.width
+                bottom = min(page.height, top + config.TABLE_MAX_HEIGHT)
+                # booktabs tables end at a bottom rule; stop there so running text below can't shift the columns
+                rules = sorted(edge['top'] for edge in page.horizontal_edges
+                               if top < edge['top'] < bottom and edge['x0'] < right and edge['x1'] > left)
+                if rules:
+                    end = rules[0]
+                    for rule in rules[1:]:
+                        if rule - end > _RULE_GAP:
+                            break
+                        end = rule
+                    bottom = end + 1
+                region = page.crop((left, top + 1, right, bottom))
+                candidates = region.find_tables(_TEXT_SETTINGS)
+                rows = _clean_rows(candidates[0].extract()) if candidates else []
+            if rows:
+                found.append(to_column_table(rows, caption['number'], caption.get('caption', ''), page_number))
+    return found
+
+
+def _cache_path(pdf_path: str, captions: list) -> str:
+    from checkpoint import file_fingerprint, stage_fingerprint
+    key = stage_fingerprint('tables', [file_fingerprint(pdf_path)], {
+        'captions': sorted((str(c['number']), c['page'], c.get('caption', '')) for c in captions),
+        'max_height': config.TABLE_MAX_HEIGHT,
+        'version': _CACHE_VERSION,
+    })
+    return os.path.join(config.TABLE_CACHE_DIR, key + '.json')
+
+
+def extract_tables(pdf_path: str, captions: list, workers: int = None) -> list:
+    """Structured tables for every table caption that has a page anchor."""
+    table_captions = [c for c in captions if c.get('type') == 'table' and c.get('page')]
+    if not table_captions:
+        return []
+    cache_path = _cache_path(pdf_path, table_captions)
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    by_page = {}
+    for caption in table_captions:
+        by_page.setdefault(caption['page'], []).append(caption)
+    workers = min(workers or config.TABLE_WORKERS, len(by_page))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_extract_page_tables, [pdf_path] * len(by_page), list(by_page), list(by_page.values()))
+            tables = [t for page_tables in results for t in page_tables]
+    else:
+        tables = [t for page, caps in by_page.items() for t in _extract_page_tables(pdf_path, page, caps)]
+
+    from checkpoint import atomic_write_json
+    atomic_write_json(cache_path, tables)
+    return tables
+
+
+def strip_table_text(text: str, tables: list) -> str:
+    """Remove extracted table bodies from text sent to the LLM (tables get native slides)."""
+    for table in tables:
+        for row in table_rows(table)[1:]:
+            cells = [re.escape(c) for c in row if c]
+            if len(cells) >= 2:
+                text = re.sub(r'\s+'.join(cells), ' ', text)
+    return text
+
+
+if __name__ == '__main__':
+    # Test
+    import sys
+    import time
+    from caption_index import CaptionIndex
+    if len(sys.argv) < 2:
+        print("Usage: python table_extractor.py <paper.pdf>")
+        sys.exit(1)
+    start = time.perf_counter()
+    tables = extract_tables(sys.argv[1], CaptionIndex.from_pdf(sys.argv[1]).to_list())
+    print(f"Extracted {len(tables)} tables in {time.perf_counter() - start:.2f}s")
+    for table in tables[:3]:
+        print(f"\nTable {table['number']} (page {table['page']}): {table['caption']}")
+        for row in table_rows(table)[:5]:
+            print('  ' + ' | '.join(row))
@@ -60,7 +60,21 @@ def create_summarization_task(sections):
         expected_output="Detailed summaries with ONLY explicitly stated numbers, metrics, and concrete details - no inferences or assumptions"
     )
 
-def create_structuring_task(summaries):
+# Presentation style guidance used by the structuring and compilation tasks
+STYLE_GUIDANCE = {
+    'concise': "Keep slides tight: 3 short, high-impact bullets per slide, only the most important numbers.",
+    'detailed': "Be thorough: 4-5 bullets per slide covering methods, parameters and full quantitative results.",
+    'teaching': "Teach the material: define key terms before using them, build intuition step by step, and add an example slide for the core method.",
+}
+
+def presentation_guidance(style: str = "concise", target_slides: int = None) -> str:
+    """Style and slide-count instructions appended to deck-shaping tasks."""
+    guidance = f"\n\n        PRESENTATION STYLE ({style}): {STYLE_GUIDANCE.get(style, STYLE_GUIDANCE['concise'])}"
+    if target_slides:
+        guidance += f"\n        SLIDE COUNT: produce exactly {target_slides} slides, including the title slide."
+    return guidance
+
+def create_structuring_task(summaries, style: str = "concise", target_slides: int = None):
     return Task(
         description=f"""You are an expert presentation designer. Create a detailed, informative slide deck from the research paper.
 
@@ -108,7 +122,7 @@ def create_structuring_task(summaries):
         - [Another complete statement with specific data]
         - [Third statement with metrics or findings]
         
-        Remember: You're creating the ACTUAL PRESENTATION CONTENT, not a plan for what to include!""",
+        Remember: You're creating the ACTUAL PRESENTATION CONTENT, not a plan for what to include!""" + presentation_guidance(style, target_slides),
         agent=structuring_agent,
         expected_output="Complete slide deck with actual informative content - not instructions or references, but real explanatory bullet points with specific details"
     )
@@ -163,7 +177,26 @@ def create_verification_task(slides, original_text):
         expected_output="Verification report with evidence pointers and hallucination metrics"
     )
 
-def create_compilation_task(slides, visuals, verification):
+def table_guidance(tables: list) -> str:
+    """Tell the compiler which tables become native table slides, so it cites rather than copies them."""
+    if not tables:
+        return ""
+    listed = "\n".join(f"        - Table {t['number']}: {t['caption'][:100]} (columns: {', '.join(t['header'])})"
+                       for t in tables if t.get('number'))
+    return f"""
+
+        TABLES (shown as native table slides after any slide that cites them):
+{listed}
+        Cite a table as "Table N" in the slide that discusses it and state only its headline number; do not copy table rows into bullets."""
+
+NOTES_GUIDANCE = """
+
+        PRESENTER NOTES: after the last slide write the line "**Presenter Notes:**", then for every slide one paragraph
+        starting "Slide N:" with what the presenter should say (2-3 sentences, no bullets).
+        End with 3-5 likely audience questions, each on its own line, with its answer on the next line starting "+ "."""
+
+def create_compilation_task(slides, visuals, verification, style: str = "concise", target_slides: int = None,
+                            tables: list = None):
     return Task(
         description="""You are an expert presentation compiler. Create the final presentation with ACTUAL CONTENT.
 
@@ -218,7 +251,55 @@ def create_compilation_task(slides, visuals, verification):
         - 3-4 informative bullets per slide
         - Each bullet: complete statement with specifics
         
-        Return the complete presentation with actual content, not a plan!""",
+        Return the complete presentation with actual content, not a plan!""" + presentation_guidance(style, target_slides) + table_guidance(tables) + NOTES_GUIDANCE,
         agent=compilation_agent,
         expected_output="Complete presentation with paper title as first slide, followed by informative content slides with actual explanatory bullet points - no instructions or labels"
     )
+
+def create_survey_topic_task(topic: str, paper_digest: str, evidence: str, style: str = "concise"):
+    return Task(
+        description=f"""You are writing the "{topic}" part of a SURVEY presentation covering several research papers.
+
+        Papers in this survey (short digests):
+        {paper_digest}
+
+        Evidence retrieved for this topic (each passage is tagged with its paper ID):
+        {evidence}
+
+        Write 1-3 slides on "{topic}" that COMPARE and SYNTHESIZE across papers:
+        - Every bullet must be supported by the evidence above and cite its paper IDs, e.g. "[P2, P5]"
+        - Prefer statements that contrast or group papers over one-paper summaries
+        - Use exact numbers, model names and datasets from the evidence; never invent them
+        - If the evidence says nothing useful about this topic, output a single slide saying so
+
+        Output format:
+        Slide: [Topic slide title]
+        - [Informative comparative statement with specifics] [P1, P3]""" + presentation_guidance(style),
+        agent=structuring_agent,
+        expected_output=f"1-3 survey slides on {topic} with paper-cited, evidence-backed bullets"
+    )
+
+def create_survey_compilation_task(survey_title: str, topic_drafts: str, paper_list: str,
+                                   style: str = "concise", target_slides: int = None):
+    return Task(
+        description=f"""You are compiling the final SURVEY presentation "{survey_title}".
+
+        Papers covered:
+        {paper_list}
+
+        Draft slides per topic (already evidence-checked, keep their paper citations):
+        {topic_drafts}
+
+        Build the final deck:
+        Slide 1: {survey_title} - what the surveyed papers address and the main trends
+        Slide 2: Papers at a glance - one line per paper with its core contribution
+        Then the topic slides, merged and reordered into a logical story; remove repetition
+        Final slide: Key takeaways and open problems across the field
+
+        FORMATTING:
+        - Start every slide with "Slide N: Title"
+        - Clean bullet points starting with "-", keeping the [P#] citations
+        - NO instructions like "mention" or "explain" - write actual content""" + presentation_guidance(style, target_slides),
+        agent=compilation_agent,
+        expected_output="Complete survey presentation with title, paper overview, cited topic slides and takeaways"
+    )
@@ -0,0 +1,91 @@
+import gzip
+import io
+import os
+import tarfile
+import pytest
+from PIL import Image
+from arxiv_source import SourceUnavailableError, parse_source_archive
+
+PAPER = r"""\documentclass{article}
+\graphicspath{{figures/}}
+\title{A \textbf{Sample} Paper}
+\begin{document}
+\maketitle
+\begin{abstract}We reach 85.2\% accuracy (see Figure~\ref{fig:arch}).\end{abstract}
+\section{Introduction}
+Transformers \cite{vaswani} changed NLP. % a comment that must not survive
+\input{method}
+\end{document}
+"""
+
+METHOD = r"""\section{Method}
+\begin{figure}[t]\centering\includegraphics[width=\linewidth]{arch}
+\caption{Model architecture.}\label{fig:arch}\end{figure}
+Results are in Table~\ref{tab:res}.
+\begin{table}\caption{Results.}\label{tab:res}
+\begin{tabular}{lc}\toprule Model & Acc \\ \midrule Ours & 85.2 \\ \bottomrule\end{tabular}\end{table}
+"""
+
+
+def write_tar(path, files: dict):
+    with tarfile.open(path, 'w:gz') as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+def png_bytes(size=(640, 360)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'white').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def test_parses_sections_floats_and_references(tmp_path):
+    archive = write_tar(tmp_path / 'paper.tar.gz', {
+        'main.tex': PAPER.encode(), 'method.tex': METHOD.encode(), 'figures/arch.png': png_bytes()})
+    source = parse_source_archive(archive, image_dir=str(tmp_path / 'images'))
+
+    assert source['title'] == 'A Sample Paper'
+    assert source['sections']['abstract'] == 'We reach 85.2% accuracy (see Figure 1).'
+    assert source['sections']['introduction'] == 'Transformers changed NLP.'
+    assert 'Results are in Table 1.' in source['sections']['method']  # \input inlined, \ref resolved
+    [figure] = source['figures']
+    assert (figure['number'], figure['caption']) == ('1', 'Model architecture.')
+    assert len(figure['images']) == 1 and os.path.exists(figure['images'][0])
+    assert source['images'][0]['figure_number'] == '1' and source['images'][0]['size'] == (640, 360)
+    [table] = source['tables']
+    assert table['rows'] == [['Model', 'Acc'], ['Ours', '85.2']]
+
+
+def test_prefers_main_tex_over_other_documents(tmp_path):
+    other = PAPER.replace('Sample', 'Supplementary') + '%' * 5000  # Larger than main.tex
+    archive = write_tar(tmp_path / 'paper.tar.gz', {'main.tex': PAPER.encode(), 'supplement.tex': other.encode()})
+    assert parse_source_archive(archive, image_dir=str(tmp_path / 'images'))['title'] == 'A Sample Paper'
+
+
+def test_single_gzipped_tex(tmp_path):
+    archive = tmp_path / 'paper.tar.gz'
+    archive.write_bytes(gzip.compress(PAPER.replace(r'\input{method}', '').encode()))
+    source = parse_source_archive(str(archive), image_dir=str(tmp_path / 'images'))
+    assert source['title'] == 'A Sample Paper' and source['figures'] == []
+
+
+def test_pdf_only_submission(tmp_path):
+    archive = tmp_path / 'paper.tar.gz'
+    archive.write_bytes(b'%PDF-1.5\n...')
+    with pytest.raises(SourceUnavailableError):
+        parse_source_archive(str(archive), image_dir=str(tmp_path / 'images'))
+
+
+def test_archive_without_documentclass(tmp_path):
+    archive = write_tar(tmp_path / 'paper.tar.gz', {'notes.tex': b'\\section{Notes}'})
+    with pytest.raises(SourceUnavailableError):
+        parse_source_archive(archive, image_dir=str(tmp_path / 'images'))
+
+
+def test_members_outside_the_extract_dir_are_skipped(tmp_path):
+    archive = write_tar(tmp_path / 'paper.tar.gz', {'main.tex': PAPER.encode(), '../escaped.tex': b'x'})
+    parse_source_archive(archive, image_dir=str(tmp_path / 'images'), extract_dir=str(tmp_path / 'src' / 'paper'))
+    assert not (tmp_path / 'src' / 'escaped.tex').exists()
@@ -0,0 +1,34 @@
+import benchmark
+from benchmark import _percentile, compare, generate_slides, slides_to_blueprint
+from pptx_generator import parse_blueprint
+
+
+def test_compare_flags_slowdowns_beyond_tolerance():
+    results = {'small': {'fast': {'median_seconds': 0.11}, 'slow': {'median_seconds': 0.2},
+                         'new': {'median_seconds': 1.0}}}
+    baseline = {'small': {'fast': {'median_seconds': 0.1}, 'slow': {'median_seconds': 0.1}}}
+    assert compare(results, baseline, tolerance=0.25) == [('small', 'slow', 2.0)]
+    assert results['small']['fast']['vs_baseline'] == 1.1
+    assert 'vs_baseline' not in results['small']['new']  # No baseline for a new stage
+
+
+def test_percentile_is_nearest_rank():
+    values = [5, 1, 4, 2, 3]
+    assert _percentile(values, 50) == 3
+    assert _percentile(values, 99) == 5
+    assert _percentile([7.0], 95) == 7.0
+
+
+def test_synthetic_blueprint_round_trips():
+    slides = generate_slides(15, seed=15)
+    assert slides == generate_slides(15, seed=15)  # Deterministic corpus
+    parsed, _ = parse_blueprint(slides_to_blueprint(slides))
+    assert [(s['title'], s['bullets']) for s in parsed] == [(s['title'], s['bullets']) for s in slides]
+
+
+def test_run_benchmarks_times_every_stage(tmp_path):
+    corpus = benchmark.build_corpus(['small'], corpus_dir=str(tmp_path))
+    results = benchmark.run_benchmarks(corpus, repeat=1, workdir=str(tmp_path / 'work'))
+    stages = results['small']
+    assert {'extract_text_from_pdf', 'generate_pptx_from_blueprint', 'render_previews'} <= set(stages)
+    assert all(r['median_seconds'] > 0 for r in stages.values())
@@ -0,0 +1,84 @@
+from pptx_generator import parse_blueprint, parse_presenter_notes, plan_deck
+
+SURVEY_BLUEPRINT = """Slide 1: Efficient Transformers - A Survey
+- Surveyed papers cut the quadratic cost of attention [P1][P2]
+- Sparse and low-rank attention dominate recent work [P2]
+
+Slide 2: Papers at a glance
+- [P1] Longformer: sliding-window plus global attention
+- [P2] Linformer: low-rank projection of keys and values
+
+**Slide 3: Open Problems**
+- No method matches full attention on every long-range task [P1][P2]
+"""
+
+
+def test_parses_slide_n_headers():
+    slides, notes = parse_blueprint("Slide 1: Intro\n- point")
+    assert slides == [{'title': 'Intro', 'bullets': ['point'], 'visual': ''}]
+    assert notes == ''
+
+
+def test_parses_numbered_format():
+    slides, _ = parse_blueprint("SLIDES:\n1. **Method**\n   - Self-attention only\n2. **Results**\n   - 28.4 BLEU")
+    assert [s['title'] for s in slides] == ['Method', 'Results']
+    assert slides[1]['bullets'] == ['28.4 BLEU']
+
+
+def test_parses_section_format():
+    slides, _ = parse_blueprint("=== INTRODUCTION ===\n- Problem\n- Motivation\n=== EMPTY ===\n")
+    assert slides == [{'title': 'INTRODUCTION', 'bullets': ['Problem', 'Motivation'], 'visual': ''}]
+
+
+def test_splits_off_presenter_notes():
+    slides, notes = parse_blueprint("Slide 1: Intro\n- point\n\n**Presenter Notes:**\nSlide 1: Say hello.")
+    assert len(slides) == 1 and slides[0]['bullets'] == ['point']
+    assert notes.strip() == 'Slide 1: Say hello.'
+
+
+def test_survey_blueprint_plans_every_slide():
+    deck = plan_deck(SURVEY_BLUEPRINT, [])
+    assert [s['title'] for s in deck['slides']] == ['Efficient Transformers - A Survey', 'Papers at a glance',
+                                                   'Open Problems']
+    assert deck['slides'][2]['bullets'] == ['No method matches full attention on every long-range task [P1][P2]']
+
+
+SLIDES = [{'title': 'Intro'}, {'title': 'Method'}, {'title': 'Results'}]
+
+
+def test_notes_keep_numbered_lists_under_slide_headers():
+    notes = parse_presenter_notes("Slide 3: Results\nWalk through the table.\n1. Accuracy improves by 2 points\n"
+                                  "2. Latency halves\n\nSlide 1: Intro\nOpen with the problem.", SLIDES)
+    assert notes == ["Open with the problem.", "",
+                     "Walk through the table.\n1. Accuracy improves by 2 points\n2. Latency halves"]
+
+
+def test_notes_with_numbered_headers():
+    notes = parse_presenter_notes("1. **Intro**\nOpen with the problem.\n\n2. Cover the architecture.\n\n"
+                                  "3. Results\nTwo takeaways:\n1. Accuracy improves\n2. Latency halves", SLIDES)
+    assert notes == ["Open with the problem.", "Cover the architecture.",
+                     "Two takeaways:\n1. Accuracy improves\n2. Latency halves"]
+
+
+def test_notes_skip_audience_questions():
+    notes = parse_presenter_notes("Slide 2: Method\nExplain the encoder.\nWhy not use RNNs?\nThey don't parallelize.",
+                                  SLIDES)
+    assert notes == ["", "Explain the encoder.", ""]
+
+
+def test_plan_deck_continues_overflowing_slides(tmp_path):
+    from pptx import Presentation
+    import fitz
+    from pptx_generator import generate_pptx_from_deck
+    from slide_renderers import render_previews
+    bullets = "\n".join(f"- Finding {i}: the method holds up across every benchmark and ablation we ran"
+                        for i in range(30))
+    deck = plan_deck(f"Slide 1: Results\n{bullets}\n\nSlide 2: Summary\n- Short slide")
+    titles = [slide['title'] for slide in deck['slides']]
+    assert titles[0] == 'Results' and titles[-1] == 'Summary' and len(titles) > 2
+    assert set(titles[1:-1]) == {'Results (cont.)'}
+    assert sum(len(slide['bullets']) for slide in deck['slides'][:-1]) == 30
+    pptx_path = generate_pptx_from_deck(deck, str(tmp_path / 'deck.pptx'), 'Paper')
+    pdf_path = render_previews(deck, 'Paper', str(tmp_path / 'preview'), ['pdf'])['pdf']
+    with fitz.open(pdf_path) as pdf:
+        assert len(Presentation(pptx_path).slides) == pdf.page_count == len(titles) + 1  # Plus the title slide
@@ -0,0 +1,16 @@
+import pytest
+from checkpoint import RunCheckpoint, list_runs
+
+
+def test_open_resumes_a_saved_run(tmp_path):
+    checkpoint = RunCheckpoint(runs_dir=str(tmp_path), params={'paper_path': 'paper.pdf'})
+    checkpoint.save('ingestion', {'paper_text': 'Abstract ...'})
+    resumed = RunCheckpoint.open(checkpoint.run_id, runs_dir=str(tmp_path))
+    assert resumed.has('ingestion') and resumed.load('ingestion') == {'paper_text': 'Abstract ...'}
+
+
+def test_open_unknown_run_leaves_nothing_behind(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RunCheckpoint.open('20260101-000000-typo', runs_dir=str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+    assert list_runs(str(tmp_path)) == []
@@ -0,0 +1,56 @@
+import pytest
+import claim_scanner
+from claim_scanner import register_claim_type, scan_claim, scan_claims
+from hallucination_filter import verify_numbers_consistency
+
+
+def claims(bullet):
+    return [(c['type'], c['value']) for c in scan_claim(bullet)]
+
+
+def test_numeric_claim_types():
+    assert claims('Achieves 85.2% accuracy on ImageNet with ResNet-50') == [
+        ('percentage', '85.2%'), ('dataset_name', 'ImageNet'), ('model_name', 'ResNet-50')]
+    assert claims('EfficientNet-B0 has 5.3M parameters') == [('model_name', 'EfficientNet-B0'), ('count', '5.3M')]
+    assert claims('Trained for 100 epochs with learning rate 0.001 and batch size 256') == [
+        ('architecture', '100'), ('learning_rate', '0.001'), ('batch_size', '256')]
+    assert claims('Reaches 28.4 BLEU on WMT 2014 in 3.5 days on 8 GPUs') == [
+        ('unit', '28.4'), ('dataset_name', 'WMT 2014'), ('unit', '3.5'), ('unit', '8')]
+
+
+def test_parameter_counts_with_and_without_suffix():
+    assert claims('A tiny model with 340 parameters') == [('param_count', '340')]
+    inconsistent = [{'title': 'Model', 'bullets': ['Has 340 parameters', 'Only 400 parameters are trained']}]
+    [warning] = verify_numbers_consistency(inconsistent)
+    assert 'Inconsistent parameters' in warning and "'340'" in warning and "'400'" in warning
+    consistent = [{'title': 'Model', 'bullets': ['Has 5.3M parameters', 'All 5.3M params are trained']}]
+    assert verify_numbers_consistency(consistent) == []
+
+
+def test_keyword_claims_keep_the_number_scannable():
+    # "accuracy: 85.2%" is both an accuracy claim and a percentage
+    assert claims('Top-1 accuracy: 85.2%') == [('accuracy', '85.2'), ('percentage', '85.2%')]
+
+
+def test_spans_are_relative_to_each_bullet():
+    bullets = ['Uses BERT', 'No claims here', 'Scores 91% on SQuAD v2.0']
+    batch = scan_claims(bullets)
+    assert [len(c) for c in batch] == [1, 0, 2]
+    for bullet, found in zip(bullets, batch):
+        for claim in found:
+            assert bullet[claim['start']:claim['end']] == claim['text']
+
+
+def test_no_match_across_bullets():
+    # The batch separator stops "5" + "M parameters" joining across two bullets
+    assert scan_claims(['Has 5', 'M parameters']) == [[], []]
+
+
+def test_register_claim_type(monkeypatch):
+    monkeypatch.setattr(claim_scanner, 'CLAIM_TYPES', dict(claim_scanner.CLAIM_TYPES))
+    monkeypatch.setattr(claim_scanner, '_value_groups', {})
+    monkeypatch.setattr(claim_scanner, '_compiled', None)
+    register_claim_type('perplexity', r'perplexity (?:of )?(?=(?P<value>\d+(?:\.\d+)?))')
+    assert ('perplexity', '18.3') in claims('Reaches perplexity of 18.3 on WikiText-103')
+    with pytest.raises(ValueError):
+        register_claim_type('broken', r'\d+')
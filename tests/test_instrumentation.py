@@ -0,0 +1,23 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from instrumentation import Tracer, record_tokens
+
+
+def test_tokens_from_worker_threads_are_all_counted():
+    tracer = Tracer('survey').activate()
+    try:
+        with tracer.span('papers') as papers:
+            def work(_):
+                for _ in range(500):
+                    record_tokens(1, 2)
+
+            # Workers run in copies of the caller's context, as the survey pipeline submits them
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                futures = [pool.submit(contextvars.copy_context().run, work, i) for i in range(16)]
+                for future in futures:
+                    future.result()
+    finally:
+        tracer.deactivate()
+    assert (papers.prompt_tokens, papers.completion_tokens) == (8000, 16000)
+    report = tracer.report()
+    assert (report['prompt_tokens'], report['completion_tokens']) == (8000, 16000)
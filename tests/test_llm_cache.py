@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+import embeddings
+import llm_cache
+from llm_cache import LLMCache, wrap_llm
+
+MODEL = 'ollama_chat/mistral'
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for created_at/last_access."""
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+    """Stand-in sentence encoder: prompts mentioning 'beta' point one way, everything else another."""
+    def encode(texts):
+        return np.array([[0.0, 1.0] if 'beta' in text else [1.0, 0.0] for text in texts], dtype=np.float32)
+
+    monkeypatch.setattr(embeddings, 'encode', encode)
+
+
+def make_cache(tmp_path, **kwargs):
+    return LLMCache(str(tmp_path / 'cache.sqlite'), **dict({'ttl': 60, 'max_entries': 100, 'max_mb': 1,
+                                                             'semantic': False}, **kwargs))
+
+
+def prompt(text):
+    return [{'role': 'user', 'content': text}]
+
+
+def test_exact_hit_ignores_whitespace(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.put(MODEL, 0.3, prompt('Summarize  the\nabstract'), 'summary')
+    assert cache.get(MODEL, 0.3, prompt('Summarize the abstract')) == 'summary'
+    assert cache.get(MODEL, 0.5, prompt('Summarize the abstract')) is None  # Another temperature
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl=60)
+    cache.put(MODEL, 0.3, prompt('old'), 'old response')
+    clock[0] += 61
+    assert cache.get(MODEL, 0.3, prompt('old')) is None
+    cache.put(MODEL, 0.3, prompt('new'), 'new response')  # Writing evicts expired entries
+    assert cache.stats()['entries'] == 1
+
+
+def test_lru_eviction_by_entry_count(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2)
+    for name in ('a', 'b'):
+        cache.put(MODEL, 0.3, prompt(name), name)
+        clock[0] += 1
+    assert cache.get(MODEL, 0.3, prompt('a')) == 'a'  # Now b is least recently used
+    clock[0] += 1
+    cache.put(MODEL, 0.3, prompt('c'), 'c')
+    assert [cache.get(MODEL, 0.3, prompt(n)) for n in 'abc'] == ['a', None, 'c']
+
+
+def test_lru_eviction_by_size(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.max_bytes = 250
+    for name in ('a', 'b', 'c'):
+        cache.put(MODEL, 0.3, prompt(name), name * 100)
+        clock[0] += 1
+    assert cache.stats()['entries'] == 2
+    assert cache.get(MODEL, 0.3, prompt('a')) is None and cache.get(MODEL, 0.3, prompt('c')) == 'c' * 100
+
+
+def test_near_duplicate_lookup_has_a_length_guard(tmp_path, clock, encoder):
+    cache = make_cache(tmp_path, semantic=True, similarity=0.95)
+    cache.put(MODEL, 0.3, prompt('Summarize the alpha paper'), 'alpha summary')
+    assert cache.get(MODEL, 0.3, prompt('Summarise the alpha paper.')) == 'alpha summary'
+    assert cache.get(MODEL, 0.3, prompt('Summarize the beta paper')) is None  # Dissimilar
+    # Same embedding, but a much longer prompt is not a reusable near-duplicate
+    assert cache.get(MODEL, 0.3, prompt('Summarize the alpha paper ' + 'with more text ' * 20)) is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['near_hits'], stats['misses']) == (0, 1, 2)
+
+
+class FakeLLM:
+    model = MODEL
+    temperature = 0.3
+
+    def __init__(self):
+        self.calls = 0
+
+    def call(self, messages, tools=None, *args, **kwargs):
+        self.calls += 1
+        return f"response {self.calls}"
+
+
+def test_wrap_llm_caches_plain_calls_only(tmp_path, clock):
+    llm = wrap_llm(FakeLLM(), make_cache(tmp_path))
+    assert llm.call(prompt('hello')) == llm.call(prompt('hello')) == 'response 1'
+    # Tool-calling and structured-output requests always reach the model
+    assert llm.call(prompt('hello'), tools=[{'name': 'search'}]) == 'response 2'
+    assert llm.call(prompt('hello'), response_model=dict) == 'response 3'
+    assert llm.call(prompt('hello'), available_functions={'search': print}) == 'response 4'
+    assert llm.calls == 4
@@ -0,0 +1,129 @@
+import threading
+import time
+import pytest
+from llm_endpoints import Endpoint, EndpointPool, parse_endpoints
+from llm_transport import FakeOllamaServer, LLMTransport, TransportError
+
+
+def pool(*endpoints):
+    return EndpointPool(list(endpoints), health_interval=0)
+
+
+def test_parse_endpoints():
+    a, b = parse_endpoints("http://a:11434|weight=2|models=mistral+qwen2.5:14b, http://b:11434/")
+    assert (a.url, a.weight, a.models) == ('http://a:11434', 2.0, {'mistral', 'qwen2.5:14b'})
+    assert (b.url, b.weight, b.models) == ('http://b:11434', 1.0, set())
+    assert a.serves('mistral:latest') and not a.serves('llama3')
+    assert b.serves('llama3')
+
+
+def test_routes_by_weight():
+    heavy, light = Endpoint('http://heavy', weight=3), Endpoint('http://light')
+    endpoints = pool(heavy, light)
+    chosen = [endpoints.acquire('mistral') for _ in range(8)]
+    assert chosen.count(heavy) == 6 and chosen.count(light) == 2
+
+
+def test_routes_only_to_endpoints_serving_the_model():
+    a, b = Endpoint('http://a', models=['mistral']), Endpoint('http://b', models=['qwen2.5:14b'])
+    endpoints = pool(a, b)
+    assert {endpoints.acquire('qwen2.5:14b') for _ in range(3)} == {b}
+    assert endpoints.acquire('llama3') is None
+
+
+def test_fails_over_from_a_down_endpoint():
+    a, b = Endpoint('http://a'), Endpoint('http://b')
+    endpoints = pool(a, b)
+    first = endpoints.acquire('mistral')
+    endpoints.release(first, 'mistral', ok=False, down=True)
+    assert not first.healthy
+    other = b if first is a else a
+    assert all(endpoints.acquire('mistral') is other for _ in range(3))
+
+
+def test_probes_the_oldest_failure_when_all_are_down():
+    a, b = Endpoint('http://a'), Endpoint('http://b')
+    a.healthy = b.healthy = False
+    a.last_failure, b.last_failure = 20.0, 10.0
+    assert pool(a, b).acquire('mistral') is b
+
+
+def test_exclude_returns_none_when_exhausted():
+    a = Endpoint('http://a')
+    assert pool(a).acquire('mistral', exclude={a}) is None
+
+
+def test_limit_waits_for_a_release():
+    a, b = Endpoint('http://a'), Endpoint('http://b')
+    endpoints = pool(a, b)
+    first, second = endpoints.acquire('mistral', limit=1), endpoints.acquire('mistral', limit=1)
+    assert {first, second} == {a, b}
+
+    third = []
+    waiter = threading.Thread(target=lambda: third.append(endpoints.acquire('mistral', limit=1)))
+    waiter.start()
+    time.sleep(0.1)
+    assert not third  # Both hosts are at the limit
+    endpoints.release(first, 'mistral')
+    waiter.join(timeout=2)
+    assert third == [first]
+
+
+def test_limit_is_per_model():
+    a = Endpoint('http://a')
+    endpoints = pool(a)
+    assert endpoints.acquire('mistral', limit=1) is a
+    assert endpoints.acquire('qwen2.5:14b', limit=1) is a
+
+
+def test_failover_keeps_the_per_endpoint_limit():
+    fakes = [FakeOllamaServer(latency=0.05).start() for _ in range(3)]
+    try:
+        fakes[1].down = True
+        transport = LLMTransport(max_concurrency=2, backoff=0.01,
+                                 endpoints=pool(*[Endpoint(f.url) for f in fakes]))
+        threads = [threading.Thread(target=transport.chat, args=('mistral', [{'role': 'user', 'content': 'hi'}]))
+                   for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert fakes[0].requests + fakes[2].requests == 12
+        assert fakes[0].max_active <= 2 and fakes[2].max_active <= 2
+    finally:
+        for fake in fakes:
+            fake.stop()
+
+
+def test_read_timeout_keeps_the_endpoint_up():
+    fake = FakeOllamaServer(latency=0.5).start()
+    try:
+        endpoint = Endpoint(fake.url)
+        transport = LLMTransport(timeout=0.1, retries=0, endpoints=pool(endpoint))
+        with pytest.raises(TransportError):
+            transport.chat('mistral', [{'role': 'user', 'content': 'hi'}])
+        assert endpoint.healthy and endpoint.failures == 1
+    finally:
+        fake.stop()
+
+
+def test_refused_connection_marks_the_endpoint_down():
+    fake = FakeOllamaServer().start()
+    url = fake.url
+    fake.stop()
+    endpoint = Endpoint(url)
+    transport = LLMTransport(timeout=1, retries=0, endpoints=pool(endpoint))
+    with pytest.raises(TransportError):
+        transport.chat('mistral', [{'role': 'user', 'content': 'hi'}])
+    assert not endpoint.healthy
+
+
+def test_check_health_discovers_models():
+    fake = FakeOllamaServer(models=('mistral:latest', 'qwen2.5:14b')).start()
+    try:
+        endpoint = Endpoint(fake.url)
+        endpoint.healthy = False
+        pool(endpoint).check_health()
+        assert endpoint.healthy and endpoint.discovered_models == {'mistral', 'qwen2.5:14b'}
+    finally:
+        fake.stop()
@@ -0,0 +1,100 @@
+import json
+import threading
+import pytest
+import config
+import llm_replay
+from instrumentation import Tracer
+from llm_replay import ReplayMissError, ResponsePlayer, ResponseRecorder, agent_role, record_llm, replay_llm
+
+
+class FakeLLM:
+    model = 'ollama_chat/mistral'
+    temperature = 0.3
+
+    def __init__(self, answer=None):
+        self.answer = answer or (lambda messages: f"answer {len(messages)}")
+        self.calls = 0
+
+    def call(self, messages, tools=None, *args, **kwargs):
+        self.calls += 1
+        return self.answer(messages)
+
+
+def prompt(role, task):
+    return [{'role': 'system', 'content': f"You are {role}. Careful.\nYour personal goal is: help"},
+            {'role': 'user', 'content': task}]
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """A recording of two summarizer calls and one structurer call."""
+    path = str(tmp_path / 'responses.jsonl')
+    llm = record_llm(FakeLLM(lambda messages: messages[1]['content'].upper()), ResponseRecorder(path))
+    for role, task in [('Academic Summarizer', 'summarize intro'), ('Academic Summarizer', 'summarize method'),
+                       ('Slide Structure Architect', 'make slides')]:
+        llm.call(prompt(role, task))
+    return path
+
+
+def test_agent_role():
+    assert agent_role(prompt('Academic Summarizer', 'x')) == 'Academic Summarizer'
+    assert agent_role([{'role': 'user', 'content': 'hello'}]) == ''
+
+
+def test_record_then_replay_round_trip(recording):
+    with open(recording, encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f]
+    assert [e['response'] for e in entries] == ['SUMMARIZE INTRO', 'SUMMARIZE METHOD', 'MAKE SLIDES']
+    assert entries[0]['role'] == 'Academic Summarizer' and entries[0]['latency_seconds'] >= 0
+
+    live = FakeLLM()
+    llm = replay_llm(live, ResponsePlayer(recording, latency='zero'))
+    assert llm.call(prompt('Slide Structure Architect', 'make slides')) == 'MAKE SLIDES'
+    assert live.calls == 0  # The real model is never asked
+
+
+def test_unrecorded_prompts_follow_their_role_per_run(recording):
+    player = ResponsePlayer(recording, latency='zero', strict=False)
+    lookups = {}
+
+    def run(name):
+        tracer = Tracer(name).activate()
+        lookups[name] = [player.lookup(FakeLLM.model, FakeLLM.temperature, prompt(role, 'new prompt'))['response']
+                         for role in ('Slide Structure Architect', 'Academic Summarizer', 'Academic Summarizer')]
+        tracer.deactivate()
+
+    threads = [threading.Thread(target=run, args=(f"run{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(responses == ['MAKE SLIDES', 'SUMMARIZE INTRO', 'SUMMARIZE METHOD'] for responses in lookups.values())
+    assert player.sequence_hits == 12 and player.exact_hits == 0
+
+
+def test_strict_replay_misses(recording):
+    player = ResponsePlayer(recording, latency='zero', strict=True)
+    assert player.lookup(FakeLLM.model, FakeLLM.temperature, prompt('Academic Summarizer', 'summarize intro'))
+    with pytest.raises(ReplayMissError):
+        player.lookup(FakeLLM.model, FakeLLM.temperature, prompt('Academic Summarizer', 'summarize results'))
+
+
+def test_latency_specs(recording):
+    entry = {'latency_seconds': 2.0}
+    assert ResponsePlayer(recording, latency='recorded', scale=0.5).delay(entry) == 1.0
+    assert ResponsePlayer(recording, latency='zero').delay(entry) == 0.0
+    assert ResponsePlayer(recording, latency='const:1.5').delay(entry) == 1.5
+    uniform = ResponsePlayer(recording, latency='uniform:0.5:2.0', seed=1)
+    delays = [uniform.delay(entry) for _ in range(50)]
+    assert all(0.5 <= d <= 2.0 for d in delays) and len(set(delays)) > 1
+    again = ResponsePlayer(recording, latency='uniform:0.5:2.0', seed=1)
+    assert delays == [again.delay(entry) for _ in range(50)]  # Seeded, so runs are repeatable
+    assert all(d > 0 for d in (ResponsePlayer(recording, latency='lognormal:0.0:0.5').delay(entry) for _ in range(20)))
+
+
+def test_missing_recording_explains_how_to_record(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'LLM_REPLAY_MODE', 'replay')
+    monkeypatch.setattr(config, 'LLM_REPLAY_PATH', str(tmp_path / 'missing.jsonl'))
+    monkeypatch.setattr(llm_replay, '_player', None)
+    with pytest.raises(SystemExit, match='LLM_REPLAY_MODE=record'):
+        llm_replay.install(FakeLLM())
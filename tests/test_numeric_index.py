@@ -0,0 +1,61 @@
+import pytest
+from hallucination_filter import locate_claim
+from numeric_index import NumericIndex, parse_numbers
+
+SOURCE = """Our model reaches 85.2% top-1 accuracy on ImageNet with 1,200,000 training images.
+The base model has 65 million parameters and trains in 3.5 days on 8 GPUs.
+Dropout 0.1 is used. Table 2 lists F1 of 0.852 on SQuAD. We compare with ResNet-50."""
+
+
+@pytest.fixture(scope='module')
+def index():
+    return NumericIndex(SOURCE)
+
+
+def test_parse_numbers_canonicalises():
+    values = [(value, unit, decimals) for value, unit, decimals, _, _, _ in
+              parse_numbers("85.2% of 1,200,000 images, 1.2M tokens, 65 million params, 3 hours, 2x")]
+    assert values == [(85.2, '%', 1), (1200000.0, None, 0), (1200000.0, None, 1), (65000000.0, None, 0),
+                      (3.0, 'hours', 0), (2.0, 'x', 0)]
+
+
+@pytest.mark.parametrize('claim, bullet, expected', [
+    ('85.2%', 'Achieves 85.2% accuracy on ImageNet', (True, 0.9, '85.2%')),
+    ('85%', 'Achieves 85% accuracy on ImageNet', (True, 0.9, '85.2%')),  # Rounds at the claim's precision
+    ('85.7%', 'Achieves 85.7% accuracy on ImageNet', (False, 0.0, None)),
+    ('1.2M', 'Trained on 1.2M images', (True, 0.9, '1,200,000')),
+    ('65M', 'Has 65M parameters', (True, 0.9, '65 million')),
+    ('85.2%', 'F1 of 85.2% on SQuAD', (True, 0.9, '0.852')),  # Percentages match fractions
+    ('3.5 days', 'Training takes 3.5 days', (True, 0.9, '3.5 days')),
+    ('3.5 hours', 'Training takes 3.5 hours', (False, 0.0, None)),  # Units must agree
+    ('0.1', 'Uses 0.1 learning rate warmup', (True, 0.5, '0.1')),  # Found, but no keyword nearby
+])
+def test_verify(index, claim, bullet, expected):
+    verified, confidence, evidence = index.verify(claim, bullet)
+    snippet = SOURCE[evidence[0][0]:evidence[0][1]] if verified else None
+    assert (verified, confidence, snippet) == expected
+
+
+def test_small_number_is_not_a_substring_match(index):
+    assert index.verify('5%', 'Improves accuracy by 5%')[0] is False  # "65" and "3.5" contain "5" but are not 5
+
+
+def test_for_text_reuses_the_last_index():
+    assert NumericIndex.for_text(SOURCE) is NumericIndex.for_text(SOURCE)
+    assert NumericIndex.for_text(SOURCE + ' ') is not NumericIndex.for_text(SOURCE)
+
+
+def test_locate_claim_numbers_point_at_the_source(index):
+    verified, confidence, span = locate_claim('85.2%', SOURCE, numeric_index=index,
+                                              context='Achieves 85.2% accuracy on ImageNet')
+    assert verified and confidence == 0.9 and SOURCE[span[0]:span[1]] == '85.2%'
+
+
+def test_locate_claim_names_by_substring():
+    verified, confidence, span = locate_claim('ImageNet', SOURCE)
+    assert (verified, confidence) == (True, 1.0) and SOURCE[span[0]:span[1]] == 'ImageNet'
+    assert locate_claim('CIFAR', SOURCE) == (False, 0.0, None)
+
+
+def test_locate_claim_fuzzy_phrase_has_no_span():
+    assert locate_claim('training images imagenet accuracy', SOURCE) == (True, 0.6, None)
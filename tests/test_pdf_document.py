@@ -0,0 +1,46 @@
+import fitz
+import config
+import pdf_document
+from pdf_document import close_document, get_document
+
+
+def make_pdf(path, text):
+    document = fitz.open()
+    document.new_page().insert_text((72, 72), text)
+    document.save(str(path))
+    document.close()
+    return str(path)
+
+
+def test_same_handle_while_cached(tmp_path):
+    path = make_pdf(tmp_path / 'a.pdf', 'alpha')
+    with get_document(path) as first, get_document(path) as second:
+        assert first is second and first.users == 2
+        assert 'alpha' in first.page_text(0)
+    assert first.users == 0 and not first.closed
+    close_document(path)
+    assert first.closed
+
+
+def test_eviction_waits_for_holders(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'PDF_DOCUMENT_CACHE', 1)
+    monkeypatch.setattr(pdf_document, '_documents', type(pdf_document._documents)())
+    a, b = make_pdf(tmp_path / 'a.pdf', 'alpha'), make_pdf(tmp_path / 'b.pdf', 'beta')
+    with get_document(a) as held:
+        with get_document(b):
+            pass  # Evicts a from the cache while it is held
+        assert held.retired and not held.closed
+        assert 'alpha' in held.page_text(0)
+    assert held.closed
+
+
+def test_close_document_waits_for_holders(tmp_path):
+    path = make_pdf(tmp_path / 'a.pdf', 'alpha')
+    with get_document(path) as held:
+        close_document(path)
+        assert not held.closed
+        with get_document(path) as fresh:
+            assert fresh is not held  # A retired handle is not handed out again
+    assert held.closed
+    close_document(path)
+    assert fresh.closed
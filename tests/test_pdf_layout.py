@@ -0,0 +1,41 @@
+import fitz
+from pdf_document import get_document
+from pdf_layout import layout_pages
+
+WIDTH, HEIGHT = 612, 792
+
+
+def make_paper(path, pages=4):
+    """Two-column pages: a full-width title, interleaved column lines, running header and page number."""
+    document = fitz.open()
+    for p in range(pages):
+        page = document.new_page(width=WIDTH, height=HEIGHT)
+        page.insert_text((200, 30), "Preprint under review at ICLR", fontsize=9)
+        page.insert_text((300, 770), str(p + 1), fontsize=9)
+        page.insert_text((150, 90), f"Full width heading on page {p + 1}", fontsize=14)
+        # Drawn row by row, so plain extraction interleaves the columns
+        for i in range(12):
+            y = 130 + i * 14
+            page.insert_text((60, y), f"left{p}x{i} column sentence words", fontsize=10)
+            page.insert_text((330, y), f"right{p}x{i} column sentence words", fontsize=10)
+    document.save(str(path))
+    document.close()
+    return str(path)
+
+
+def test_reads_left_column_before_right(tmp_path):
+    with get_document(make_paper(tmp_path / 'paper.pdf')) as document:
+        pages = layout_pages(document)
+    assert len(pages) == 4
+    lines = pages[0].split('\n')
+    assert lines[0] == 'Full width heading on page 1'
+    order = [line.split()[0] for line in lines[1:]]
+    assert order == [f"left0x{i}" for i in range(12)] + [f"right0x{i}" for i in range(12)]
+
+
+def test_drops_running_headers_and_page_numbers(tmp_path):
+    with get_document(make_paper(tmp_path / 'paper.pdf')) as document:
+        pages = layout_pages(document)
+    for number, text in enumerate(pages, 1):
+        assert 'Preprint under review' not in text
+        assert str(number) not in text.split('\n')
@@ -0,0 +1,51 @@
+import sqlite3
+from service import JobQueue
+
+
+def test_claim_counts_attempts(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite'))
+    job_id = queue.submit({'paper_path': 'paper.pdf'})
+    assert queue.claim(timeout=0)['attempts'] == 1
+    assert queue.get(job_id)['attempts'] == 1
+
+
+def test_interrupted_jobs_fail_after_max_attempts(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.sqlite'))
+    job_id = queue.submit({'paper_path': 'crashes.pdf'})
+    for restart in range(2):
+        assert queue.claim(timeout=0)['id'] == job_id
+        assert queue.requeue_interrupted(max_attempts=3) == (1, 0)  # Process died; restarted
+    queue.claim(timeout=0)
+    assert queue.requeue_interrupted(max_attempts=3) == (0, 1)
+    job = queue.get(job_id)
+    assert job['status'] == 'failed' and job['attempts'] == 3
+    assert queue.claim(timeout=0) is None
+
+
+def test_adds_attempts_to_an_existing_queue(tmp_path):
+    path = str(tmp_path / 'jobs.sqlite')
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, status TEXT NOT NULL, priority INTEGER NOT NULL DEFAULT 0, "
+                 "params TEXT NOT NULL, created_at REAL NOT NULL, started_at REAL, finished_at REAL, "
+                 "result TEXT, error TEXT)")
+    conn.execute("INSERT INTO jobs (id, status, params, created_at) VALUES ('old', 'running', '{}', 0)")
+    conn.commit()
+    conn.close()
+    queue = JobQueue(path)
+    assert queue.requeue_interrupted(max_attempts=3) == (1, 0)
+    assert queue.get('old')['attempts'] == 0
+
+
+def test_running_job_shows_partial_result(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.db'))
+    job_id = queue.submit({'paper_path': 'paper.pdf'})
+    queue.update_result(job_id, {'preview_paths': {'md': 'deck.md'}})
+    assert queue.get(job_id)['result'] is None  # Not running yet
+    queue.claim(timeout=0)
+    queue.update_result(job_id, {'preview_paths': {'md': 'deck.md', 'html': 'deck.html'}})
+    job = queue.get(job_id)
+    assert job['status'] == 'running' and job['result'] == {'preview_paths': {'md': 'deck.md', 'html': 'deck.html'}}
+    queue.complete(job_id, {'pptx_path': 'deck.pptx', 'preview_paths': {'md': 'deck.md', 'html': 'deck.html'}})
+    assert queue.get(job_id)['result']['pptx_path'] == 'deck.pptx'
+    queue.update_result(job_id, {'preview_paths': {}})  # Finished jobs are left alone
+    assert queue.get(job_id)['result']['preview_paths'] == {'md': 'deck.md', 'html': 'deck.html'}
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+import config
+import embeddings
+import slide_organizer
+from slide_organizer import SECTION_PROTOTYPES, classify_slides
+
+SECTIONS = list(SECTION_PROTOTYPES)
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+    """Deterministic stand-in for the sentence encoder: one axis per section.
+
+    A slide text is embedded on the axis of the section named in its
+    'axis:<section>' marker (at the given weight), else on an axis of its own.
+    """
+    calls = []
+
+    def encode(texts):
+        calls.append(list(texts))
+        vectors = np.zeros((len(texts), len(SECTIONS) + 1), dtype=np.float32)
+        for row, text in enumerate(texts):
+            if text in SECTION_PROTOTYPES.values():
+                vectors[row, list(SECTION_PROTOTYPES.values()).index(text)] = 1.0
+                continue
+            marker = next((w for w in text.split() if w.startswith('axis:')), None)
+            weight = 0.9 if marker else 0.0
+            if marker:
+                name, _, given = marker[5:].partition('@')
+                weight = float(given) if given else weight
+                vectors[row, SECTIONS.index(name)] = weight
+            vectors[row, -1] = np.sqrt(1 - weight ** 2)
+        return vectors
+
+    monkeypatch.setattr(embeddings, 'encode', encode)
+    monkeypatch.setattr(slide_organizer, '_prototypes', None)
+    monkeypatch.setattr(config, 'SLIDE_CLASSIFY_MIN_SIMILARITY', 0.5)
+    return calls
+
+
+def slide(title, *bullets):
+    return {'title': title, 'bullets': list(bullets)}
+
+
+def test_keyword_titles_skip_the_encoder(encoder):
+    results = classify_slides([slide('Introduction', 'x'), slide('Conclusion', 'y')], use_embeddings=True)
+    assert results == [('introduction', 1, 1.0), ('conclusion', 7, 1.0)]
+    assert encoder == []
+
+
+def test_unmatched_titles_use_the_nearest_prototype(encoder):
+    slides = [slide('Introduction', 'x'), slide('Why It Works', 'axis:methodology'), slide('Lessons', 'axis:discussion')]
+    results = classify_slides(slides, use_embeddings=True)
+    assert results[1] == ('methodology', 3, 0.9)
+    assert results[2] == ('discussion', 6, 0.9)
+    assert len(encoder[0]) == 2  # Only the unsettled slides, in one batch
+
+
+def test_ambiguous_titles_are_decided_by_embeddings(encoder):
+    # "Experimental Results" names two sections; the keyword rules alone pick the first
+    assert classify_slides([slide('Experimental Results', 'x')], use_embeddings=False)[0][:2] == ('experimental', 4)
+    results = classify_slides([slide('Experimental Results', 'axis:results')], use_embeddings=True)
+    assert results[0] == ('results', 5, 0.9)
+
+
+def test_low_similarity_keeps_the_keyword_result(encoder):
+    results = classify_slides([slide('Odds and Ends', 'axis:results@0.3', 'accuracy')], use_embeddings=True)
+    assert results == [('results', 5, 0.5)]  # Content keyword hint, not the weak prototype match
+
+
+def test_without_an_encoder_keywords_are_used(monkeypatch):
+    monkeypatch.setattr(embeddings, 'encode', lambda texts: None)
+    results = classify_slides([slide('Odds and Ends', 'we train for 10 epoch')], use_embeddings=True)
+    assert results == [('experimental', 4, 0.5)]
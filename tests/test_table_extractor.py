@@ -0,0 +1,80 @@
+import fitz
+import pytest
+import config
+from table_extractor import _clean_rows, extract_tables, is_numeric, strip_table_text, table_rows, to_column_table
+
+ROWS = [['Method', 'Top-1', 'Params'], ['ResNet-50', '76.1', '25.6M'], ['ViT-B/16', '77.9', '86M']]
+
+
+def make_ruled_table(path):
+    """One page: a caption, then a 3x3 table with ruled cells, then a paragraph."""
+    document = fitz.open()
+    page = document.new_page(width=612, height=792)
+    page.insert_text((72, 90), "Table 1: Accuracy on ImageNet", fontsize=10)
+    left, top, width, height = 72, 100, 120, 20
+    for r in range(len(ROWS) + 1):
+        page.draw_line((left, top + r * height), (left + 3 * width, top + r * height))
+    for c in range(4):
+        page.draw_line((left + c * width, top), (left + c * width, top + len(ROWS) * height))
+    for r, row in enumerate(ROWS):
+        for c, cell in enumerate(row):
+            page.insert_text((left + c * width + 5, top + r * height + 14), cell, fontsize=10)
+    page.insert_text((72, 200), "The vision transformer is more accurate but larger.", fontsize=10)
+    document.save(str(path))
+    document.close()
+    return str(path)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'TABLE_CACHE_DIR', str(tmp_path / 'cache'))
+    return tmp_path / 'cache'
+
+
+def test_extracts_ruled_table(tmp_path, cache_dir):
+    captions = [{'type': 'table', 'number': '1', 'page': 1, 'caption': 'Accuracy on ImageNet'},
+                {'type': 'figure', 'number': '1', 'page': 1}]
+    [table] = extract_tables(make_ruled_table(tmp_path / 'paper.pdf'), captions, workers=1)
+    assert table_rows(table) == ROWS
+    assert table['numeric'] == [False, True, True]
+    assert (table['number'], table['page'], table['n_rows']) == ('1', 1, 2)
+
+
+def test_cache_is_keyed_on_captions_and_settings(tmp_path, cache_dir, monkeypatch):
+    pdf = make_ruled_table(tmp_path / 'paper.pdf')
+    caption = {'type': 'table', 'number': '1', 'page': 1, 'caption': 'Accuracy on ImageNet'}
+    assert len(extract_tables(pdf, [caption], workers=1)) == 1
+    assert len(list(cache_dir.iterdir())) == 1
+    # Another caption set or another search height is a cache miss, not the stale tables
+    assert [t['number'] for t in extract_tables(pdf, [dict(caption, number='2')], workers=1)] == ['2']
+    monkeypatch.setattr(config, 'TABLE_MAX_HEIGHT', 100)
+    assert len(extract_tables(pdf, [caption], workers=1)) == 1
+    assert len(list(cache_dir.iterdir())) == 3
+
+
+def test_clean_rows_drops_empty_cells_and_trailing_text():
+    rows = [['Model', None, 'BLEU'], ['', '', ''], ['Big  Transformer', '', '28.4'], ['Base', '', '27.3'],
+            ['Running text after the table', '', ''], ['Stray', '', '1']]
+    assert _clean_rows(rows) == [['Model', 'BLEU'], ['Big Transformer', '28.4'], ['Base', '27.3']]
+    assert _clean_rows([['Only one column'], ['Still one']]) == []
+
+
+@pytest.mark.parametrize('cell, expected', [
+    ('85.2', True), ('85.2%', True), ('1,024', True), ('(3.5)', True), ('-0.4', True), ('±0.1', True),
+    ('25.6M', True), ('12x', True), ('77.9*', True), ('ResNet-50', False), ('n/a', False), ('', False),
+])
+def test_is_numeric(cell, expected):
+    assert is_numeric(cell) is expected
+
+
+def test_to_column_table_pads_ragged_rows():
+    table = to_column_table([['Model', 'Acc', 'Notes'], ['A', '85.1'], ['B', '86.0', 'ours']], '3', 'Results', 4)
+    assert table['columns'] == [['A', 'B'], ['85.1', '86.0'], ['', 'ours']]
+    assert table['numeric'] == [False, True, False]
+    assert table_rows(table)[1] == ['A', '85.1', '']
+
+
+def test_strip_table_text():
+    table = to_column_table(ROWS, '1')
+    text = "As Table 1 shows, ResNet-50 76.1 25.6M\nViT-B/16  77.9 86M and the rest of the paper."
+    assert strip_table_text(text, [table]) == "As Table 1 shows,  \n  and the rest of the paper."
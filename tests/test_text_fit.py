@@ -0,0 +1,41 @@
+from text_fit import fit_bullets, fit_title, word_width, wrap
+
+WIDTH, HEIGHT = 8.5 * 72, 5.5 * 72
+BULLET = "The encoder maps each token to a contextual vector using stacked self-attention layers"
+
+
+def test_font_size_decreases_as_bullets_grow():
+    sizes = [fit_bullets((BULLET,) * count, WIDTH, HEIGHT, 18, 12)[0] for count in (1, 4, 6, 8)]
+    assert sizes[0] == 18 and sizes[-1] < 18
+    assert sizes == sorted(sizes, reverse=True)
+
+
+def test_overflow_splits_into_pages_keeping_every_bullet_in_order():
+    bullets = tuple(f"{i}: {BULLET}" for i in range(30))
+    size, pages = fit_bullets(bullets, WIDTH, HEIGHT, 18, 12)
+    assert size == 12 and len(pages) > 1
+    assert tuple(bullet for page in pages for bullet in page) == bullets
+    # Each page but the last is full: its successor's first bullet didn't fit
+    for page, following in zip(pages, pages[1:]):
+        assert fit_bullets(page + following[:1], WIDTH, HEIGHT, 12, 12)[1] != (page + following[:1],)
+
+
+def test_wrap_is_greedy():
+    width_em = word_width('attention heads') + 0.01
+    assert wrap('attention heads attention heads attention', width_em) == (
+        'attention heads', 'attention heads', 'attention')
+    assert wrap('', 10) == ()
+
+
+def test_over_long_word_takes_several_lines():
+    word = 'Pneumonoultramicroscopicsilicovolcanoconiosis'
+    width_em = word_width(word) / 3.5
+    lines = wrap(f"{word} ends", width_em)
+    assert len(lines) == 5  # Four lines for the word, then the next word on its own
+    assert lines[-1] == 'ends'
+
+
+def test_fit_title_falls_back_to_min_size():
+    assert fit_title('Results', 9 * 72, 0.65 * 72, 22, 14) == 22
+    long_title = ' '.join(['Attention'] * 40)
+    assert fit_title(long_title, 9 * 72, 0.65 * 72, 22, 14) == 14
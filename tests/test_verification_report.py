@@ -0,0 +1,59 @@
+import json
+from verification_report import build_report, page_starts, slide_notes, write_report
+
+PAGES = ["Our model reaches 85.2% top-1 accuracy on ImageNet with 1,200,000 training images.",
+         "The base model has 65 million parameters and trains in 3.5 days on 8 GPUs. "
+         "Attention replaces recurrence entirely, which makes training highly parallel."]
+SOURCE = ' '.join(PAGES)
+SLIDES = [
+    {'title': 'Results', 'bullets': ['Achieves 85.2% accuracy on ImageNet', 'Achieves 91% accuracy on COCO']},
+    {'title': 'Method', 'bullets': ['Attention replaces recurrence, so training is parallel',
+                                    'Inspired by biological neurons']},
+]
+
+
+def test_page_starts_in_order():
+    assert page_starts(SOURCE, PAGES) == [0, len(PAGES[0]) + 1]
+    # A header repeated on every page can't send a later page back to the first
+    header = "Preprint. "
+    pages = [header + "alpha beta", header + "gamma delta"]
+    assert page_starts(' '.join(pages), pages) == [0, len(pages[0]) + 1]
+
+
+def test_report_statuses_and_summary():
+    report = build_report(SLIDES, SOURCE, page_starts(SOURCE, PAGES))
+    assert report['summary'] == {'slides': 2, 'bullets': 4, 'verified': 1, 'unverified': 1, 'supported': 1,
+                                 'unsupported': 1, 'hallucination_rate': 0.5}
+    results, method = report['slides']
+    assert [b['status'] for b in results['bullets']] == ['verified', 'unverified']
+    assert [b['status'] for b in method['bullets']] == ['supported', 'unsupported']
+
+
+def test_evidence_spans_point_into_the_source():
+    report = build_report(SLIDES, SOURCE, page_starts(SOURCE, PAGES))
+    verified = report['slides'][0]['bullets'][0]
+    [claim] = [c for c in verified['claims'] if c['type'] == 'percentage']
+    assert claim['verified'] and SOURCE[claim['span'][0]:claim['span'][1]] == '85.2%'
+    evidence = verified['evidence'][0]
+    assert evidence['page'] == 1 and '85.2% top-1 accuracy' in evidence['snippet']
+    supported = report['slides'][1]['bullets'][0]['evidence'][0]
+    assert supported['page'] == 2 and supported['snippet'].startswith('Attention replaces recurrence')
+    assert report['slides'][0]['bullets'][1]['evidence'] == []
+
+
+def test_without_pages_evidence_has_offsets_only():
+    report = build_report(SLIDES, SOURCE)
+    evidence = report['slides'][0]['bullets'][0]['evidence'][0]
+    assert evidence['page'] is None and 0 <= evidence['start'] < evidence['end'] <= len(SOURCE)
+    assert 'chars ' in slide_notes(report['slides'][0])
+
+
+def test_slide_notes_and_written_report(tmp_path):
+    report = build_report(SLIDES, SOURCE, page_starts(SOURCE, PAGES))
+    notes = slide_notes(report['slides'][0]).split('\n')
+    assert notes[0] == 'Source check:'
+    assert notes[1].startswith('✓ Achieves 85.2% accuracy on ImageNet - p. 1 (0.90)')
+    assert notes[2] == '⚠ Achieves 91% accuracy on COCO - not found in the paper, check before presenting'
+    path = write_report(report, str(tmp_path / 'verification_report.json'))
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == report
@@ -0,0 +1,123 @@
+"""Fit slide text into its box using font metrics.
+
+Strings are measured with Pillow's FreeType fonts: the deck's font when it is
+installed (Calibri, or the metric-compatible Carlito), else DejaVu Sans, which
+runs wider and so errs on the safe side. Word widths are measured once at a
+reference size and scaled, and wraps and fits are memoised per (text, box,
+font), so a 200-slide deck is fitted in milliseconds. A box gets the largest
+font size whose wrapped lines fit, down to a minimum; bullets that still
+don't fit are split across continuation slides.
+"""
+import math
+from functools import lru_cache
+import config
+
+LINE_SPACING = 1.2  # Bullet paragraph line spacing (multiple of the font size)
+SPACE_BEFORE = 10  # Points before each bullet
+SPACE_AFTER = 6  # Points after each bullet
+_INSET_X = 14.4  # Text frame left + right insets (points)
+_INSET_Y = 7.2  # Text frame top + bottom insets (points)
+_REFERENCE_SIZE = 100  # Fonts are loaded once at this size; widths scale linearly
+_EM_ESTIMATE = 0.55  # Average character width (em) when no font can be loaded
+
+
+@lru_cache(maxsize=None)
+def _font(bold: bool):
+    from PIL import ImageFont
+    for name in (config.TEXT_FIT_BOLD_FONTS if bold else config.TEXT_FIT_FONTS):
+        try:
+            return ImageFont.truetype(name, _REFERENCE_SIZE)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(_REFERENCE_SIZE)
+    except Exception:  # Pillow built without FreeType
+        return None
+
+
+def font_path(bold: bool = False) -> str:
+    """File of the font text is measured with (None for Pillow's built-in font)."""
+    path = getattr(_font(bold), 'path', None)
+    return path if isinstance(path, str) else None
+
+
+@lru_cache(maxsize=65536)
+def word_width(word: str, bold: bool = False) -> float:
+    """Width of a word in em (multiply by the font size for points)."""
+    font = _font(bold)
+    if font is None:
+        return len(word) * _EM_ESTIMATE
+    return font.getlength(word) / _REFERENCE_SIZE
+
+
+@lru_cache(maxsize=65536)
+def wrap(text: str, width_em: float, bold: bool = False) -> tuple:
+    """Greedy word wrap into lines at most width_em wide, as PowerPoint does."""
+    space = word_width(' ', bold)
+    lines, line, used = [], [], 0.0
+    for word in text.split():
+        width = word_width(word, bold)
+        if line and used + space + width > width_em:
+            lines.append(' '.join(line))
+            line, used = [], 0.0
+        if not line and width > width_em:
+            # A word longer than the line is broken across lines
+            lines.extend([word] * (math.ceil(width / width_em) - 1))
+        used = used + space + width if line else min(width, width_em)
+        line.append(word)
+    if line:
+        lines.append(' '.join(line))
+    return tuple(lines)
+
+
+def _bullets_height(bullets: tuple, width: float, size: int) -> float:
+    """Points taken by bullet paragraphs at a font size in a box width points wide."""
+    width_em = (width - _INSET_X) / size
+    lines = sum(len(wrap(bullet, width_em)) for bullet in bullets)
+    return lines * size * LINE_SPACING + len(bullets) * (SPACE_BEFORE + SPACE_AFTER)
+
+
+@lru_cache(maxsize=4096)
+def fit_title(title: str, width: float, height: float, max_size: int, min_size: int) -> int:
+    """Largest bold size (points) at which title fits a width x height point box."""
+    for size in range(max_size, min_size - 1, -1):
+        if len(wrap(title, (width - _INSET_X) / size, True)) * size * LINE_SPACING <= height - _INSET_Y:
+            return size
+    return min_size
+
+
+@lru_cache(maxsize=4096)
+def fit_bullets(bullets: tuple, width: float, height: float, max_size: int, min_size: int) -> tuple:
+    """(font size, pages) for bullets in a width x height point box.
+
+    pages is one tuple of bullets per slide: a single page when the bullets
+    fit at min_size or above, else continuation pages packed at min_size.
+    """
+    room = height - _INSET_Y
+    for size in range(max_size, min_size - 1, -1):
+        if _bullets_height(bullets, width, size) <= room:
+            return size, (bullets,)
+    pages, page = [], ()
+    for bullet in bullets:
+        if page and _bullets_height(page + (bullet,), width, min_size) > room:
+            pages.append(page)
+            page = ()
+        page += (bullet,)  # A bullet too long for any page gets one to itself
+    pages.append(page)
+    return min_size, tuple(pages)
+
+
+if __name__ == '__main__':
+    # Test
+    import time
+    bullets = tuple(f"Bullet {i} explains the method in enough words to wrap over two or three lines of a slide"
+                    for i in range(7))
+    print(f"Font: {getattr(_font(False), 'getname', lambda: ('estimate',))()}")
+    for width_in in (4.5, 8.5):
+        size, pages = fit_bullets(bullets, width_in * 72, 5.5 * 72, 18, 12)
+        print(f"{width_in}in box: {size}pt, {len(pages)} slide(s) of {[len(p) for p in pages]} bullets")
+    print(f"Title: {fit_title('A Very Long Title About Attention Mechanisms In Neural Machine Translation', 9 * 72, 0.65 * 72, 22, 14)}pt")
+    start = time.perf_counter()
+    for i in range(200):
+        fit_bullets(tuple(f"{b} (slide {i})" for b in bullets[:5]), 4.5 * 72, 5.5 * 72, 18, 12)
+    print(f"200 slides fitted in {(time.perf_counter() - start) * 1000:.1f}ms")
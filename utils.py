@@ -5,21 +5,42 @@ import pdfplumber
 from typing import Dict, List
 import config
 import os
+from pdf_document import get_document
+from pdf_layout import layout_pages
+from ocr import textless_pages, ocr_pages
 
 def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from PDF using pdfplumber for better formatting."""
-    text = ""
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() + "\n\n"
-    except Exception as e:
-        print(f"pdfplumber failed: {e}. Trying PyPDF2...")
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                text += page.extract_text() + "\n\n"
-    return text
+    """Extract text from the shared PDF handle (pdfplumber/PyPDF2 as fallbacks).
+
+    Pages without a text layer (scans) are OCR'd when OCR_ENABLED is set.
+    """
+    return "".join(page + "\n\n" for page in extract_pages_from_pdf(pdf_path))
+
+def extract_pages_from_pdf(pdf_path: str) -> List[str]:
+    """Per-page text, exactly as extract_text_from_pdf joins it."""
+    with get_document(pdf_path) as document:
+        pages = None
+        if config.PDF_TEXT_BACKEND == 'pymupdf':
+            try:
+                if config.PDF_TEXT_LAYOUT == 'columns':
+                    pages = layout_pages(document)
+                else:
+                    pages = [document.page_text(n) for n in range(document.page_count)]
+            except Exception as e:
+                print(f"PyMuPDF text extraction failed: {e}. Trying pdfplumber...")
+        if pages is None:
+            try:
+                with document.open_stream() as stream, pdfplumber.open(stream) as pdf:
+                    pages = [page.extract_text() or "" for page in pdf.pages]
+            except Exception as e:
+                print(f"pdfplumber failed: {e}. Trying PyPDF2...")
+                with document.open_stream() as stream:
+                    reader = PyPDF2.PdfReader(stream)
+                    pages = [page.extract_text() or "" for page in reader.pages]
+        if config.OCR_ENABLED:
+            for page_num, text in ocr_pages(pdf_path, textless_pages(document, pages)).items():
+                pages[page_num] = text
+    return pages
 
 def clean_text(text: str) -> str:
     """Clean extracted text by fixing common issues."""
@@ -78,43 +99,31 @@ def identify_sections(text: str) -> Dict[str, str]:
     
     return sections
 
-def extract_figures_and_tables(text: str) -> List[Dict[str, str]]:
-    """Extract figure and table references with captions."""
-    figures = []
-    
-    # Pattern for figures
-    fig_pattern = r'(Figure|Fig\.?)\s+(\d+)[:\.]?\s*([^\n]+)'
-    for match in re.finditer(fig_pattern, text, re.IGNORECASE):
-        figures.append({
-            'type': 'figure',
-            'number': match.group(2),
-            'caption': match.group(3).strip()
-        })
-    
-    # Pattern for tables
-    table_pattern = r'(Table)\s+(\d+)[:\.]?\s*([^\n]+)'
-    for match in re.finditer(table_pattern, text, re.IGNORECASE):
-        figures.append({
-            'type': 'table',
-            'number': match.group(2),
-            'caption': match.group(3).strip()
-        })
+def extract_figures_and_tables(text: str, pdf_path: str = None) -> List[Dict[str, str]]:
+    """Extract figure and table captions, one entry per real caption.
     
-    return figures
+    With pdf_path the captions are read from per-page text blocks and also carry
+    page, bbox and character offset.
+    """
+    from caption_index import CaptionIndex
+    index = CaptionIndex.from_pdf(pdf_path) if pdf_path else CaptionIndex.from_text(text)
+    return index.to_list()
 
 def count_words_in_bullet(bullet: str) -> int:
     """Count words in a bullet point."""
     return len(bullet.split())
 
-def ensure_output_directory():
+def ensure_output_directory(output_dir: str = None):
     """Create output directory if it doesn't exist."""
-    if not os.path.exists(config.OUTPUT_DIR):
-        os.makedirs(config.OUTPUT_DIR)
+    output_dir = output_dir or config.OUTPUT_DIR
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
 
-def save_output(filename: str, content: str):
+def save_output(filename: str, content: str, output_dir: str = None):
     """Save content to output file."""
-    ensure_output_directory()
-    filepath = os.path.join(config.OUTPUT_DIR, filename)
+    output_dir = output_dir or config.OUTPUT_DIR
+    ensure_output_directory(output_dir)
+    filepath = os.path.join(output_dir, filename)
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
     print(f"Saved: {filepath}")